@@ -0,0 +1,122 @@
+from jose import jwt, JWTError
+from starlette.concurrency import run_in_threadpool
+from typing import Optional
+import logging
+import time
+from config import settings
+from cache import TTLCache
+from database import get_supabase, get_async_supabase_admin, get_supabase_http
+from profiles import invalidate_profile_summary
+
+logger = logging.getLogger(__name__)
+
+# Profile rows keyed by user id; invalidate on any profile/role change
+profile_cache = TTLCache(maxsize=settings.profile_cache_max_size, ttl=settings.profile_cache_ttl_seconds, name="profiles")
+
+# Project signing keys for asymmetric JWT algorithms
+_jwks_cache = TTLCache(maxsize=1, ttl=settings.supabase_jwks_ttl_seconds, name="jwks")
+_jwks_refreshed_at = 0.0
+JWKS_MIN_REFRESH_INTERVAL = 60.0
+
+class TokenVerificationError(Exception):
+    """Raised when an access token cannot be verified"""
+
+async def _get_jwks(refresh: bool = False) -> dict:
+    """Fetch the project's JWKS, cached for supabase_jwks_ttl_seconds"""
+    global _jwks_refreshed_at
+    jwks = _jwks_cache.get("jwks")
+    # Forced refreshes are rate limited so forged key ids cannot hammer Supabase
+    if refresh and time.monotonic() - _jwks_refreshed_at >= JWKS_MIN_REFRESH_INTERVAL:
+        jwks = None
+    if jwks is None:
+        _jwks_refreshed_at = time.monotonic()
+        response = await get_supabase_http().get("/auth/v1/.well-known/jwks.json")
+        response.raise_for_status()
+        jwks = response.json()
+        _jwks_cache.set("jwks", jwks)
+    return jwks
+
+async def _verify_remotely(token: str) -> dict:
+    """Fallback when no JWT secret is configured: ask Supabase Auth"""
+    user = await run_in_threadpool(get_supabase().auth.get_user, token)
+    if not user or not user.user:
+        raise TokenVerificationError("Invalid authentication credentials")
+    return {"sub": user.user.id, "email": user.user.email}
+
+async def verify_access_token(token: str) -> dict:
+    """Verify a Supabase access token locally and return its claims"""
+    algorithm = settings.jwt_algorithm
+    
+    if algorithm.startswith("HS"):
+        if not settings.supabase_jwt_secret:
+            return await _verify_remotely(token)
+        key = settings.supabase_jwt_secret
+    else:
+        try:
+            key = await _get_jwks()
+            kid = jwt.get_unverified_header(token).get("kid")
+        except JWTError as e:
+            raise TokenVerificationError(str(e))
+        # Refetch once if the token was signed with a key we have not seen (rotation)
+        if kid and not any(k.get("kid") == kid for k in key.get("keys", [])):
+            key = await _get_jwks(refresh=True)
+    
+    try:
+        claims = jwt.decode(
+            token,
+            key,
+            algorithms=[algorithm],
+            audience=settings.supabase_jwt_audience
+        )
+    except JWTError as e:
+        raise TokenVerificationError(str(e))
+    
+    if not claims.get("sub"):
+        raise TokenVerificationError("Token has no subject")
+    
+    return claims
+
+class AuthRequestError(Exception):
+    """Raised when Supabase Auth rejects a sign-in or sign-up"""
+    
+    def __init__(self, message: str, status_code: int):
+        super().__init__(message)
+        self.status_code = status_code
+
+async def _auth_request(path: str, payload: dict) -> dict:
+    """POST to Supabase Auth over the shared pool; unlike the supabase client, no session is kept"""
+    response = await get_supabase_http().post(path, json=payload)
+    if response.status_code >= 400:
+        try:
+            body = response.json()
+        except ValueError:
+            body = {}
+        message = body.get("error_description") or body.get("msg") or body.get("message") or response.text
+        raise AuthRequestError(message, response.status_code)
+    return response.json()
+
+async def sign_in_with_password(email: str, password: str) -> dict:
+    """Password grant: the session (access_token, user, ...) for these credentials"""
+    return await _auth_request("/auth/v1/token?grant_type=password", {"email": email, "password": password})
+
+async def sign_up(email: str, password: str, metadata: dict) -> dict:
+    """Create an auth user: the user, or a session holding it when email confirmation is off"""
+    return await _auth_request("/auth/v1/signup", {"email": email, "password": password, "data": metadata})
+
+async def get_profile(user_id: str) -> Optional[dict]:
+    """Get a profile row, served from the in-process cache when fresh"""
+    profile = profile_cache.get(user_id)
+    if profile is None:
+        response = await get_async_supabase_admin().table("profiles").select("*").eq("id", user_id).execute()
+        if not response.data:
+            return None
+        profile = response.data[0]
+        profile_cache.set(user_id, profile)
+    
+    # Callers decorate the row, so never hand out the cached dict itself
+    return dict(profile)
+
+def invalidate_profile(user_id: str):
+    """Drop a cached profile after it changes"""
+    profile_cache.invalidate(user_id)
+    invalidate_profile_summary(user_id)
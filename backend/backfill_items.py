@@ -0,0 +1,59 @@
+"""
+Copy existing lost_items/found_items rows into public.items in small batches.
+
+Requires migrations/001_unified_items.sql. Safe to re-run and to run while the
+API is serving traffic: rows are upserted by id, and new writes are already
+mirrored by trigger. Rows that public.items rejects are skipped and listed in
+public.item_mirror_failures. Usage:
+
+    python backfill_items.py --batch-size 500 --pause 0.2
+"""
+import argparse
+import asyncio
+import logging
+from database import get_async_supabase_admin, supabase_client
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+async def backfill(item_type: str, batch_size: int, pause: float, after=None):
+    """Walk one legacy table in id order, one batch per round trip; returns (copied, failed)"""
+    supabase = get_async_supabase_admin()
+    total = 0
+    failed = 0
+    while True:
+        response = await supabase.rpc("backfill_legacy_items", {
+            "p_type": item_type,
+            "p_after": after,
+            "p_batch_size": batch_size
+        }).execute()
+        result = response.data[0] if response.data else {"copied": 0, "failed": 0, "last_id": after}
+        total += result["copied"]
+        failed += result["failed"]
+        after = result["last_id"]
+        logger.info(f"{item_type}: copied {result['copied']} rows, skipped {result['failed']} (total {total}, last id {after})")
+        
+        if result["copied"] + result["failed"] < batch_size:
+            return total, failed
+        await asyncio.sleep(pause)
+
+async def main(args):
+    try:
+        for item_type in args.types:
+            total, failed = await backfill(item_type, args.batch_size, args.pause, args.after)
+            logger.info(f"{item_type}: backfill complete, {total} rows")
+            if failed:
+                logger.warning(f"{item_type}: {failed} rows could not be copied; see public.item_mirror_failures")
+    finally:
+        await supabase_client.aclose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill public.items from the legacy item tables")
+    parser.add_argument("--types", nargs="+", choices=["lost", "found"], default=["lost", "found"])
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--pause", type=float, default=0.2, help="Seconds to sleep between batches")
+    parser.add_argument("--after", default=None, help="Resume after this item id (use with a single --types value)")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,73 @@
+"""
+Concurrent throughput benchmark for GET /api/items.
+
+Run the API first (uvicorn server:app --port 8000), then:
+
+    python benchmarks/items_throughput.py --base-url http://localhost:8000 --requests 500 --concurrency 50
+
+Run it once against the previous revision and once against the current one
+to compare the blocking and non-blocking data-access layers.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+async def run(base_url: str, total: int, concurrency: int, params: dict):
+    latencies = []
+    errors = 0
+    queue: asyncio.Queue = asyncio.Queue()
+    for _ in range(total):
+        queue.put_nowait(None)
+    
+    async def worker(client: httpx.AsyncClient):
+        nonlocal errors
+        while True:
+            try:
+                queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            started = time.perf_counter()
+            try:
+                response = await client.get("/api/items", params=params)
+                if response.status_code != 200:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+    
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    
+    latencies.sort()
+    
+    def percentile(p: float) -> float:
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+    
+    print(f"requests:    {total} (errors: {errors})")
+    print(f"concurrency: {concurrency}")
+    print(f"elapsed:     {elapsed:.2f}s")
+    print(f"throughput:  {total / elapsed:.1f} req/s")
+    print(f"latency:     mean {statistics.mean(latencies) * 1000:.1f}ms  "
+          f"p50 {percentile(0.50):.1f}ms  p95 {percentile(0.95):.1f}ms  p99 {percentile(0.99):.1f}ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent GET /api/items throughput")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--type", choices=["lost", "found"], default=None)
+    parser.add_argument("--search", default=None)
+    parser.add_argument("--sort", choices=["recent", "relevance"], default=None)
+    args = parser.parse_args()
+    
+    params = {k: v for k, v in {"type": args.type, "search": args.search, "sort": args.sort}.items() if v}
+    asyncio.run(run(args.base_url, args.requests, args.concurrency, params))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+"""
+End-to-end load benchmark: server.py against a local Supabase stand-in.
+
+Starts benchmarks/supabase_stand_in.py (seeded, with injected latency) and
+the API pointed at it, then drives each scenario at the chosen concurrency
+and reports latency percentiles, throughput and backend round trips
+(stand-in requests) per API request:
+
+    python benchmarks/load_suite.py --requests 300 --concurrency 20 --latency-ms 5
+    python benchmarks/load_suite.py --scenarios browse,detail --api-workers 4 --json results.json
+
+Scenarios: browse, search, detail, matches, conversations, send_message, upload,
+login, register, admin_stats, admin_analytics. Pass --api-url/--stand-in-url to reuse
+processes that are already running (the API must use the stand-in).
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import random
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+import httpx
+from jose import jwt
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+API_LOG = Path(tempfile.gettempdir()) / "load_suite_api.log"
+SEARCH_TERMS = ["black wallet", "phone", "leather bag", "keys", "silver watch", "blue umbrella"]
+
+def make_token(secret: str, user: dict) -> str:
+    now = int(time.time())
+    return jwt.encode(
+        {"sub": user["id"], "email": user["email"], "role": "authenticated", "aud": "authenticated",
+         "iat": now, "exp": now + 24 * 3600},
+        secret,
+        algorithm="HS256"
+    )
+
+def make_photo(width: int, height: int) -> bytes:
+    from PIL import Image
+    image = Image.frombytes("RGB", (width, height), os.urandom(width * height * 3))
+    output = io.BytesIO()
+    image.save(output, format="JPEG", quality=90)
+    return output.getvalue()
+
+class Fixtures:
+    """Seeded ids and ready-made auth headers"""
+    
+    def __init__(self, data: dict):
+        self.item_ids = data["item_ids"]
+        self.conversations = data["conversations"]
+        users = {user["id"]: user for user in data["users"]}
+        self.headers = {
+            user_id: {"Authorization": f"Bearer {make_token(data['jwt_secret'], user)}"}
+            for user_id, user in users.items()
+        }
+        self.admin_headers = next(self.headers[u["id"]] for u in data["users"] if u["admin"])
+        self.user_ids = [u["id"] for u in data["users"] if not u["admin"]]
+        self.emails = [u["email"] for u in data["users"]]
+        self.photo = None
+
+# Scenarios: (client, fixtures, rng) -> response
+async def browse(client, fx, rng):
+    params = {"page": rng.randint(1, 3)}
+    if rng.random() < 0.5:
+        params["type"] = rng.choice(["lost", "found"])
+    return await client.get("/api/items", params=params)
+
+async def search(client, fx, rng):
+    return await client.get("/api/items", params={"search": rng.choice(SEARCH_TERMS), "sort": "relevance"})
+
+async def detail(client, fx, rng):
+    return await client.get(f"/api/items/{rng.choice(fx.item_ids)}")
+
+async def matches(client, fx, rng):
+    while True:
+        response = await client.get(f"/api/items/{rng.choice(fx.item_ids)}/matches")
+        # Workers answer 503 until their match index is loaded; the warmup absorbs this
+        if response.status_code != 503:
+            return response
+        await asyncio.sleep(float(response.headers.get("retry-after", "1")))
+
+async def conversations(client, fx, rng):
+    conversation = rng.choice(fx.conversations)
+    return await client.get("/api/conversations", headers=fx.headers[rng.choice(conversation["participants"])])
+
+async def send_message(client, fx, rng):
+    conversation = rng.choice(fx.conversations)
+    return await client.post(
+        f"/api/conversations/{conversation['claim_request_id']}/messages",
+        json={"claim_request_id": conversation["claim_request_id"], "message": "Is this still available?"},
+        headers=fx.headers[rng.choice(conversation["participants"])]
+    )
+
+async def upload(client, fx, rng):
+    if fx.photo is None:
+        fx.photo = make_photo(1600, 1200)
+    return await client.post(
+        "/api/upload",
+        files={"file": ("photo.jpg", fx.photo, "image/jpeg")},
+        headers=fx.headers[rng.choice(fx.user_ids)]
+    )
+
+async def login(client, fx, rng):
+    return await client.post("/api/auth/login", json={"email": rng.choice(fx.emails), "password": "load-test-password"})
+
+async def register(client, fx, rng):
+    return await client.post("/api/auth/register", json={
+        "email": f"load-{uuid.uuid4().hex[:12]}@umt.edu",
+        "password": "load-test-password",
+        "full_name": "Load Test"
+    })
+
+async def admin_stats(client, fx, rng):
+    return await client.get("/api/admin/stats", headers=fx.admin_headers)
+
+async def admin_analytics(client, fx, rng):
+    return await client.get("/api/admin/analytics", params={"timeframe": rng.choice(["7d", "30d", "90d"])}, headers=fx.admin_headers)
+
+SCENARIOS = {
+    "browse": browse,
+    "search": search,
+    "detail": detail,
+    "matches": matches,
+    "conversations": conversations,
+    "send_message": send_message,
+    "upload": upload,
+    "login": login,
+    "register": register,
+    "admin_stats": admin_stats,
+    "admin_analytics": admin_analytics
+}
+
+def percentile(sorted_values: list, p: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p))] * 1000
+
+async def run_scenario(name, client, stand_in, fx, total, concurrency, seed):
+    scenario = SCENARIOS[name]
+    rng = random.Random(seed)
+    latencies, statuses = [], {}
+    remaining = total
+    
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            try:
+                response = await scenario(client, fx, rng)
+                code = response.status_code
+            except httpx.HTTPError as e:
+                code = type(e).__name__
+            latencies.append(time.perf_counter() - started)
+            statuses[code] = statuses.get(code, 0) + 1
+    
+    await stand_in.post("/__reset")
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    backend = (await stand_in.get("/__stats")).json()
+    
+    latencies.sort()
+    return {
+        "scenario": name,
+        "requests": total,
+        "concurrency": concurrency,
+        "errors": sum(count for code, count in statuses.items() if not (isinstance(code, int) and code < 400)),
+        "statuses": {str(code): count for code, count in statuses.items()},
+        "throughput": total / elapsed,
+        "mean_ms": statistics.mean(latencies) * 1000,
+        "p50_ms": percentile(latencies, 0.50),
+        "p95_ms": percentile(latencies, 0.95),
+        "p99_ms": percentile(latencies, 0.99),
+        "round_trips": backend["total"] / total,
+        "backend_routes": backend["by_route"]
+    }
+
+def wait_for(url: str, process, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise SystemExit(f"process for {url} exited with {process.returncode}")
+        try:
+            if httpx.get(url, timeout=2).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.25)
+    raise SystemExit(f"{url} not ready after {timeout:.0f}s")
+
+def start_processes(args, processes: list):
+    """Start the stand-in and the API unless URLs of running ones were given"""
+    stand_in_url = args.stand_in_url
+    if not stand_in_url:
+        stand_in_url = f"http://127.0.0.1:{args.stand_in_port}"
+        processes.append(subprocess.Popen([
+            sys.executable, str(Path(__file__).with_name("supabase_stand_in.py")),
+            "--port", str(args.stand_in_port),
+            "--users", str(args.users), "--items", str(args.items), "--claims", str(args.claims),
+            "--latency-ms", str(args.latency_ms), "--jitter-ms", str(args.jitter_ms)
+        ]))
+        wait_for(f"{stand_in_url}/__stats", processes[-1])
+    fixtures = httpx.get(f"{stand_in_url}/__fixtures", timeout=30).json()
+    
+    api_url = args.api_url
+    if not api_url:
+        api_url = f"http://127.0.0.1:{args.api_port}"
+        env = {
+            **os.environ,
+            "SUPABASE_URL": stand_in_url,
+            "SUPABASE_ANON_KEY": fixtures["anon_key"],
+            "SUPABASE_SERVICE_ROLE_KEY": fixtures["service_role_key"],
+            "SUPABASE_JWT_SECRET": fixtures["jwt_secret"],
+            "ITEMS_SOURCE": "unified",
+            "DATABASE_URL": "",
+            # Endpoints that go over their @query_budget answer 500 and show up as errors
+            "QUERY_BUDGET_MODE": "enforce",
+            "IMAGE_POOL_KIND": args.image_pool
+        }
+        processes.append(subprocess.Popen([
+            sys.executable, "-m", "uvicorn", "server:app",
+            "--port", str(args.api_port), "--workers", str(args.api_workers), "--log-level", "warning"
+        ], cwd=BACKEND_DIR, env=env, stdout=API_LOG.open("w"), stderr=subprocess.STDOUT))
+        print(f"API log: {API_LOG}")
+        wait_for(f"{api_url}/api/ready", processes[-1])
+    return stand_in_url, api_url, fixtures
+
+def print_report(results: list):
+    print(f"{'scenario':<16}{'reqs':>6}{'err':>5}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'trips/req':>11}")
+    for r in results:
+        print(f"{r['scenario']:<16}{r['requests']:>6}{r['errors']:>5}{r['throughput']:>9.1f}"
+              f"{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}{r['p99_ms']:>9.1f}{r['round_trips']:>11.2f}")
+
+async def run(args, stand_in_url, api_url, fixture_data):
+    fx = Fixtures(fixture_data)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    results = []
+    async with httpx.AsyncClient(base_url=api_url, limits=limits, timeout=120) as client, \
+            httpx.AsyncClient(base_url=stand_in_url, timeout=30) as stand_in:
+        for index, name in enumerate(args.scenarios):
+            if args.warmup:
+                await run_scenario(name, client, stand_in, fx, args.warmup, min(args.concurrency, args.warmup), args.seed + index)
+            results.append(await run_scenario(name, client, stand_in, fx, args.requests, args.concurrency, args.seed + index))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the API end to end against a local Supabase stand-in")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), type=lambda value: value.split(","))
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=20, help="Untimed requests before each scenario (0 to skip)")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="Injected delay per stand-in request")
+    parser.add_argument("--jitter-ms", type=float, default=1.0)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--claims", type=int, default=1000)
+    parser.add_argument("--api-workers", type=int, default=1)
+    parser.add_argument("--image-pool", default="process", choices=["process", "thread"])
+    parser.add_argument("--api-port", type=int, default=8010)
+    parser.add_argument("--stand-in-port", type=int, default=54321)
+    parser.add_argument("--api-url", help="Use an already running API instead of starting one")
+    parser.add_argument("--stand-in-url", help="Use an already running stand-in instead of starting one")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args()
+    
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    
+    # Make `timeout`/kill run the finally below so child processes are not orphaned
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(1))
+    processes = []
+    try:
+        stand_in_url, api_url, fixture_data = start_processes(args, processes)
+        print(f"stand-in latency {args.latency_ms}ms ±{args.jitter_ms}ms, {args.api_workers} API worker(s), "
+              f"{args.requests} requests per scenario at concurrency {args.concurrency}\n")
+        results = asyncio.run(run(args, stand_in_url, api_url, fixture_data))
+    finally:
+        for process in reversed(processes):
+            process.terminate()
+            process.wait(timeout=30)
+    
+    print_report(results)
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+-- Item search benchmark: ILIKE scan vs. indexed full-text search on 500k rows.
+--
+-- Runs on any local Postgres 13+ (no Supabase schema needed); everything lives
+-- in a scratch "bench" schema that mirrors public.items' searchable columns and
+-- the indexes from migrations/002_item_search.sql:
+--
+--     createdb lostfound_bench
+--     psql -d lostfound_bench -f benchmarks/search_500k.sql
+--
+-- Compare the "Execution Time" lines of each EXPLAIN ANALYZE block.
+
+\set ON_ERROR_STOP on
+\timing on
+
+DROP SCHEMA IF EXISTS bench CASCADE;
+CREATE SCHEMA bench;
+
+CREATE TABLE bench.items (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    type TEXT NOT NULL,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL,
+    category TEXT NOT NULL,
+    location TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'active',
+    is_active BOOLEAN NOT NULL DEFAULT true,
+    created_at TIMESTAMPTZ NOT NULL
+);
+
+-- 1. Seed 500k items from small vocabularies so queries have realistic selectivity
+INSERT INTO bench.items (type, title, description, category, location, status, created_at)
+SELECT
+    CASE WHEN n % 2 = 0 THEN 'lost' ELSE 'found' END,
+    initcap(color) || ' ' || noun,
+    format('%s %s %s near the %s, last seen around %s. Has a %s sticker and a %s strap.',
+           initcap(adjective), color, noun, place, (n % 12) + 1 || ' pm', color2, adjective),
+    category,
+    initcap(place),
+    CASE WHEN n % 10 = 0 THEN 'resolved' ELSE 'active' END,
+    NOW() - (n || ' minutes')::INTERVAL
+FROM (
+    SELECT
+        n,
+        (ARRAY['black','white','red','blue','green','silver','gold','brown','grey','pink'])[1 + (n * 7) % 10] AS color,
+        (ARRAY['black','white','red','blue','green','silver','gold','brown','grey','pink'])[1 + (n * 3) % 10] AS color2,
+        (ARRAY['wallet','phone','laptop','backpack','umbrella','watch','keys','jacket','charger','notebook',
+               'headphones','bottle','calculator','ring','glasses','card holder','hoodie','textbook'])[1 + (n * 13) % 18] AS noun,
+        (ARRAY['small','large','leather','plastic','scratched','new','old','waterproof'])[1 + (n * 5) % 8] AS adjective,
+        (ARRAY['library','cafeteria','computer lab','lecture hall','parking','gym','auditorium','admin block','hostel','ground'])[1 + (n * 11) % 10] AS place,
+        (ARRAY['electronics','bags','jewelry','clothing','personal','books','sports','other'])[1 + n % 8] AS category
+    FROM generate_series(1, 500000) AS n
+) seed;
+
+CREATE INDEX idx_bench_items_listing
+    ON bench.items(created_at DESC, id DESC)
+    WHERE status = 'active' AND is_active = true;
+
+-- Baseline: no search index exists yet
+ANALYZE bench.items;
+
+\echo '--- before: title/description ILIKE (what GET /api/items?search=wallet used to run)'
+EXPLAIN (ANALYZE, BUFFERS)
+SELECT * FROM bench.items
+WHERE status = 'active' AND is_active = true
+  AND (title ILIKE '%wallet%' OR description ILIKE '%wallet%')
+ORDER BY created_at DESC, id DESC
+LIMIT 13;
+
+-- 2. Same generated column and GIN index as migrations/002_item_search.sql
+ALTER TABLE bench.items
+    ADD COLUMN search_vector TSVECTOR GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', COALESCE(title, '')), 'A') ||
+        setweight(to_tsvector('english', COALESCE(description, '')), 'B')
+    ) STORED;
+CREATE INDEX idx_bench_items_search_vector ON bench.items USING GIN (search_vector);
+ANALYZE bench.items;
+
+\echo '--- after: prefix tsquery filter, newest first (sort=recent)'
+EXPLAIN (ANALYZE, BUFFERS)
+SELECT * FROM bench.items
+WHERE status = 'active' AND is_active = true
+  AND search_vector @@ to_tsquery('english', 'wallet:*')
+ORDER BY created_at DESC, id DESC
+LIMIT 13;
+
+\echo '--- after: ranked two-term query (sort=relevance), body of public.search_items()'
+EXPLAIN (ANALYZE, BUFFERS)
+WITH matches AS (
+    SELECT i.*, ts_rank_cd(i.search_vector, q.query, 32) AS search_rank
+    FROM bench.items i,
+         to_tsquery('english', 'leather:* & wall:*') AS q(query)
+    WHERE i.search_vector @@ q.query
+      AND i.status = 'active'
+      AND i.is_active = true
+)
+SELECT m.id, m.title, m.search_rank, count(*) OVER ()
+FROM matches m
+ORDER BY m.search_rank DESC, m.created_at DESC, m.id DESC
+LIMIT 13;
+
+\echo '--- after: selective multi-term query'
+EXPLAIN (ANALYZE, BUFFERS)
+SELECT * FROM bench.items
+WHERE status = 'active' AND is_active = true
+  AND search_vector @@ to_tsquery('english', 'gold:* & ring:* & hostel:*')
+ORDER BY created_at DESC, id DESC
+LIMIT 13;
+
+-- DROP SCHEMA bench CASCADE;  -- when done
@@ -0,0 +1,638 @@
+"""
+Local stand-in for the Supabase REST (PostgREST), Auth and Storage APIs.
+
+Serves an in-memory, seeded copy of the tables the API reads, so
+server.py can be load tested without a Supabase project and without
+network noise. Every request can be delayed to model a real round trip
+(--latency-ms / --jitter-ms), and every request is counted so a benchmark
+can report backend round trips per API call.
+
+Only the PostgREST features server.py uses are implemented: column and
+embedded selects, eq/neq/gt/gte/lt/lte/like/ilike/in/is/fts filters,
+or=/and= groups, order/limit/offset, Prefer count, and the RPCs the
+migrations define. Triggers that matter for the API (conversation
+summaries) are emulated in Python.
+
+    python benchmarks/supabase_stand_in.py --port 54321 --items 5000 --latency-ms 5
+
+Used by benchmarks/load_suite.py, which starts it automatically.
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
+from jose import jwt
+
+JWT_SECRET = "stand-in-jwt-secret-with-at-least-32-characters"
+JWT_AUDIENCE = "authenticated"
+
+CATEGORIES = ["electronics", "bags", "jewelry", "clothing", "personal", "books", "sports", "other"]
+LOCATIONS = ["Library", "Cafeteria", "Computer Lab", "Lecture Hall", "Parking", "Gym", "Auditorium", "Hostel"]
+NOUNS = ["wallet", "phone", "laptop", "backpack", "umbrella", "keys", "watch", "charger",
+         "notebook", "headphones", "bottle", "jacket", "calculator", "glasses", "card"]
+ADJECTIVES = ["black", "blue", "red", "leather", "small", "silver", "broken", "new", "old", "green"]
+CLAIM_STATUSES = ["pending", "approved", "rejected", "completed"]
+
+def make_token(user_id: str, email: str, role: str = "authenticated", ttl: int = 24 * 3600) -> str:
+    """HS256 access token the API verifies locally with SUPABASE_JWT_SECRET"""
+    now = int(time.time())
+    return jwt.encode(
+        {"sub": user_id, "email": email, "role": role, "aud": JWT_AUDIENCE, "iat": now, "exp": now + ttl},
+        JWT_SECRET,
+        algorithm="HS256"
+    )
+
+def service_key(role: str) -> str:
+    """anon / service_role API keys; supabase-py insists on JWT-shaped keys"""
+    return jwt.encode({"role": role, "iss": "stand-in"}, JWT_SECRET, algorithm="HS256")
+
+def iso(moment: datetime) -> str:
+    return moment.astimezone(timezone.utc).isoformat()
+
+# Seed data
+def seed(users: int, items: int, claims: int, messages_per_claim: int, rng: random.Random) -> Dict[str, List[dict]]:
+    now = datetime.now(timezone.utc)
+    tables: Dict[str, List[dict]] = {name: [] for name in (
+        "profiles", "items", "claim_requests", "chat_messages", "conversation_summaries",
+        "daily_stats", "categories", "locations", "admin_actions", "admin_jobs", "notifications"
+    )}
+    
+    for index in range(users):
+        created = now - timedelta(days=rng.uniform(0, 365))
+        tables["profiles"].append({
+            "id": str(uuid.uuid4()),
+            "email": f"user{index}@umt.edu",
+            "first_name": f"User{index}",
+            "last_name": "Bench",
+            "full_name": f"User{index} Bench",
+            "user_type": "ADMIN" if index == 0 else "STUDENT",
+            "is_admin": index == 0,
+            "account_status": "ACTIVE",
+            "avatar_url": None,
+            "created_at": iso(created),
+            "updated_at": iso(created)
+        })
+    
+    profiles = tables["profiles"]
+    for _ in range(items):
+        created = now - timedelta(days=rng.uniform(0, 120), seconds=rng.uniform(0, 86400))
+        item_type = rng.choice(["lost", "found"])
+        noun, adjective = rng.choice(NOUNS), rng.choice(ADJECTIVES)
+        item_id = str(uuid.uuid4())
+        tables["items"].append({
+            "id": item_id,
+            "user_id": rng.choice(profiles)["id"],
+            "type": item_type,
+            "title": f"{adjective.title()} {noun}",
+            "description": f"{item_type.title()} a {adjective} {noun} near the {rng.choice(LOCATIONS).lower()} around noon.",
+            "category": rng.choice(CATEGORIES),
+            "location": rng.choice(LOCATIONS),
+            "date_lost": created.date().isoformat() if item_type == "lost" else None,
+            "date_found": created.date().isoformat() if item_type == "found" else None,
+            "time_lost": None,
+            "time_found": None,
+            "images": [f"https://stand-in.local/storage/v1/object/public/item-images/seed/{item_id}/original.jpg"],
+            "reward": rng.choice([0, 0, 0, 500, 1000]),
+            "urgency": rng.choice(["low", "medium", "high"]),
+            "status": rng.choices(["active", "claimed", "resolved", "archived"], weights=[80, 8, 8, 4])[0],
+            "is_active": True,
+            "contact_preference": "email",
+            "flagged": rng.random() < 0.02,
+            "flag_reason": None,
+            "moderated_by": None,
+            "moderated_at": None,
+            "moderation_notes": None,
+            "moderation_status": None,
+            "created_at": iso(created),
+            "updated_at": iso(created)
+        })
+    
+    for _ in range(min(claims, len(tables["items"]))):
+        item = rng.choice(tables["items"])
+        claimer = rng.choice([p for p in rng.sample(profiles, 3) if p["id"] != item["user_id"]] or profiles[:1])
+        created = datetime.fromisoformat(item["created_at"]) + timedelta(hours=rng.uniform(1, 48))
+        claim = {
+            "id": str(uuid.uuid4()),
+            "item_id": item["id"],
+            "claimer_id": claimer["id"],
+            "message": "I think this is mine.",
+            "status": rng.choice(CLAIM_STATUSES),
+            "created_at": iso(created),
+            "updated_at": iso(created)
+        }
+        tables["claim_requests"].append(claim)
+        
+        last, claim_messages = None, []
+        for index in range(messages_per_claim):
+            sent = created + timedelta(minutes=10 * (index + 1))
+            last = {
+                "id": str(uuid.uuid4()),
+                "claim_request_id": claim["id"],
+                "sender_id": claimer["id"] if index % 2 == 0 else item["user_id"],
+                "message": f"Message {index} about the {item['title'].lower()}",
+                "is_read": index < messages_per_claim - 2,
+                "created_at": iso(sent)
+            }
+            claim_messages.append(last)
+        tables["chat_messages"].extend(claim_messages)
+        
+        tables["conversation_summaries"].append(summary_row(claim, item, claim_messages, last))
+    
+    for offset in range(365):
+        day = (now - timedelta(days=offset)).date()
+        tables["daily_stats"].append({
+            "day": day.isoformat(),
+            "new_users": rng.randint(0, 5),
+            "lost_items": rng.randint(0, 20),
+            "found_items": rng.randint(0, 20),
+            "claims_pending": rng.randint(0, 5),
+            "claims_approved": rng.randint(0, 5),
+            "claims_rejected": rng.randint(0, 2),
+            "claims_completed": rng.randint(0, 3),
+            "flagged_items": rng.randint(0, 2),
+            "updated_at": iso(now)
+        })
+    
+    tables["categories"] = [{"id": str(uuid.uuid4()), "name": name.title()} for name in CATEGORIES]
+    tables["locations"] = [{"id": str(uuid.uuid4()), "name": name} for name in LOCATIONS]
+    return tables
+
+def summary_row(claim: dict, item: dict, messages: List[dict], last: Optional[dict]) -> dict:
+    """Same shape refresh_conversation_summary() builds (migrations/005)"""
+    def unread(reader: str) -> int:
+        return sum(
+            1 for m in messages
+            if m["claim_request_id"] == claim["id"] and not m["is_read"] and m["sender_id"] != reader
+        )
+    
+    return {
+        "claim_request_id": claim["id"],
+        "claimer_id": claim["claimer_id"],
+        "owner_id": item["user_id"],
+        "item_id": item["id"],
+        "item_title": item["title"],
+        "item_type": item["type"],
+        "item_image": (item.get("images") or [None])[0],
+        "claim_status": claim["status"],
+        "last_message_id": last["id"] if last else None,
+        "last_message_sender_id": last["sender_id"] if last else None,
+        "last_message_preview": last["message"][:200] if last else None,
+        "last_message_at": last["created_at"] if last else None,
+        "last_activity_at": max(claim["created_at"], last["created_at"]) if last else claim["created_at"],
+        "claimer_unread_count": unread(claim["claimer_id"]),
+        "owner_unread_count": unread(item["user_id"])
+    }
+
+# PostgREST emulation
+ISO_PREFIX = re.compile(r"^\d{4}-\d{2}-\d{2}")
+
+def split_top_level(text: str) -> List[str]:
+    """Split on commas outside parentheses and double quotes"""
+    parts, depth, quoted, current = [], 0, False, []
+    for char in text:
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        if char == "," and depth == 0 and not quoted:
+            parts.append("".join(current).strip())
+            current = []
+        else:
+            current.append(char)
+    if current:
+        parts.append("".join(current).strip())
+    return [part for part in parts if part]
+
+def unquote(value: str) -> str:
+    return value[1:-1] if len(value) >= 2 and value[0] == value[-1] == '"' else value
+
+def comparable(row_value, text: str):
+    """Coerce a filter literal to the row value's type"""
+    if isinstance(row_value, bool):
+        return row_value, text.lower() == "true"
+    if isinstance(row_value, (int, float)):
+        try:
+            return float(row_value), float(text)
+        except ValueError:
+            return str(row_value), text
+    if isinstance(row_value, str) and ISO_PREFIX.match(row_value) and ISO_PREFIX.match(text):
+        try:
+            return datetime.fromisoformat(row_value.replace("Z", "+00:00")), datetime.fromisoformat(text.replace("Z", "+00:00"))
+        except ValueError:
+            pass
+    return row_value, text
+
+def like_regex(pattern: str, flags=0):
+    return re.compile("^" + ".*".join(re.escape(part) for part in pattern.replace("*", "%").split("%")) + "$", flags | re.S)
+
+def text_matches(row: dict, tsquery: str) -> int:
+    """Stand-in for search_vector @@ to_tsquery(): prefix terms over title and description; returns hits"""
+    words = re.findall(r"\w+", f"{row.get('title', '')} {row.get('description', '')}".lower())
+    terms = [term.rstrip(":*") for term in re.split(r"\s*&\s*", tsquery.lower()) if term.strip()]
+    hits = 0
+    for term in terms:
+        matched = sum(1 for word in words if word.startswith(term))
+        if not matched:
+            return 0
+        hits += matched
+    return hits
+
+def condition(column: str, expression: str) -> Callable[[dict], bool]:
+    """Predicate for one `column=op.value` filter"""
+    negate = expression.startswith("not.")
+    if negate:
+        expression = expression[4:]
+    op, _, raw = expression.partition(".")
+    value = unquote(raw)
+    
+    def check(row: dict) -> bool:
+        row_value = row.get(column)
+        if op == "is":
+            return row_value is None if value == "null" else row_value is (value == "true")
+        if op == "in":
+            options = {unquote(option) for option in split_top_level(value.strip("()"))}
+            return str(row_value) in options
+        if op.startswith(("fts", "plfts", "wfts", "phfts")):
+            return text_matches(row, value) > 0
+        if row_value is None:
+            return False
+        if op in ("like", "ilike"):
+            return bool(like_regex(value, re.I if op == "ilike" else 0).match(str(row_value)))
+        if op == "cs":
+            return set(json.loads(value.replace("{", "[").replace("}", "]"))) <= set(row_value or [])
+        left, right = comparable(row_value, value)
+        return {
+            "eq": lambda: left == right,
+            "neq": lambda: left != right,
+            "gt": lambda: left > right,
+            "gte": lambda: left >= right,
+            "lt": lambda: left < right,
+            "lte": lambda: left <= right
+        }[op]()
+    
+    return (lambda row: not check(row)) if negate else check
+
+def group(kind: str, body: str) -> Callable[[dict], bool]:
+    """Predicate for or=(...) / and=(...) with nesting"""
+    predicates = []
+    for term in split_top_level(body.strip()[1:-1]):
+        if term.startswith(("and(", "or(", "not.and(", "not.or(")):
+            negate = term.startswith("not.")
+            inner_kind, _, inner = term[4 if negate else 0:].partition("(")
+            predicate = group(inner_kind, "(" + inner)
+            predicates.append((lambda p: lambda row: not p(row))(predicate) if negate else predicate)
+        else:
+            column, _, expression = term.partition(".")
+            predicates.append(condition(column, expression))
+    combine = any if kind == "or" else all
+    return lambda row: combine(predicate(row) for predicate in predicates)
+
+def singular_fk(table: str) -> str:
+    stem = table[:-3] + "y" if table.endswith("ies") else table.rstrip("s")
+    return f"{stem}_id"
+
+class StandIn:
+    def __init__(self, tables: Dict[str, List[dict]], latency_ms: float, jitter_ms: float):
+        self.tables = tables
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.requests: Counter = Counter()
+        self.by_id = {name: {row["id"]: row for row in rows if "id" in row} for name, rows in tables.items()}
+        self.storage_bytes = 0
+    
+    # Select/embedding
+    def embed(self, table: str, rows: List[dict], select: str) -> List[dict]:
+        columns, embeds = [], []
+        for part in split_top_level(" ".join(select.split())):
+            if "(" not in part:
+                columns.append(part)
+                continue
+            head, _, inner = part.partition("(")
+            alias, _, target = head.rpartition(":")
+            target, _, hint = target.partition("!")
+            fk = hint[len(table) + 1:-len("_fkey")] if hint.startswith(f"{table}_") and hint.endswith("_fkey") else singular_fk(target)
+            embeds.append((alias or target, target, fk, [c.strip() for c in inner.rstrip(")").split(",") if c.strip()]))
+        
+        shaped = []
+        for row in rows:
+            out = dict(row) if "*" in columns or not columns else {c: row.get(c) for c in columns}
+            for alias, target, fk, target_columns in embeds:
+                related = self.by_id.get(target, {}).get(row.get(fk))
+                out[alias] = None if related is None else (
+                    dict(related) if "*" in target_columns else {c: related.get(c) for c in target_columns}
+                )
+            shaped.append(out)
+        return shaped
+    
+    def matching(self, table: str, params) -> List[dict]:
+        predicates = []
+        for key, value in params.multi_items():
+            if key in ("select", "order", "limit", "offset", "on_conflict", "columns"):
+                continue
+            if key in ("or", "and"):
+                predicates.append(group(key, value))
+            else:
+                predicates.append(condition(key, value))
+        return [row for row in self.tables.setdefault(table, []) if all(p(row) for p in predicates)]
+    
+    @staticmethod
+    def ordered(rows: List[dict], order: Optional[str]) -> List[dict]:
+        if not order:
+            return rows
+        for term in reversed(split_top_level(order)):
+            column, *modifiers = term.split(".")
+            descending = "desc" in modifiers
+            present = [row for row in rows if row.get(column) is not None]
+            missing = [row for row in rows if row.get(column) is None]
+            present.sort(key=lambda row: comparable(row[column], str(row[column]))[0], reverse=descending)
+            rows = present + missing
+        return rows
+    
+    # Emulated triggers
+    def after_insert(self, table: str, row: dict):
+        if table == "chat_messages":
+            summary = next((s for s in self.tables["conversation_summaries"] if s["claim_request_id"] == row["claim_request_id"]), None)
+            if summary:
+                summary.update({
+                    "last_message_id": row["id"],
+                    "last_message_sender_id": row["sender_id"],
+                    "last_message_preview": row["message"][:200],
+                    "last_message_at": row["created_at"],
+                    "last_activity_at": row["created_at"]
+                })
+                if row["sender_id"] != summary["claimer_id"]:
+                    summary["claimer_unread_count"] += 1
+                if row["sender_id"] != summary["owner_id"]:
+                    summary["owner_unread_count"] += 1
+    
+    def insert(self, table: str, body, upsert: bool) -> List[dict]:
+        now = iso(datetime.now(timezone.utc))
+        created = []
+        for values in body if isinstance(body, list) else [body]:
+            row = {"created_at": now, "updated_at": now, **values}
+            row.setdefault("id", str(uuid.uuid4()))
+            if table == "chat_messages":
+                row.setdefault("is_read", False)
+            if table == "admin_jobs":
+                row.setdefault("status", "queued")
+                for counter in ("processed", "succeeded", "failed"):
+                    row.setdefault(counter, 0)
+            existing = self.by_id.setdefault(table, {}).get(row["id"])
+            if existing is not None and upsert:
+                existing.update(values)
+                created.append(existing)
+                continue
+            self.tables.setdefault(table, []).append(row)
+            self.by_id[table][row["id"]] = row
+            self.after_insert(table, row)
+            created.append(row)
+        return created
+    
+    # RPCs (migrations/*.sql)
+    def rpc(self, name: str, args: dict):
+        if name == "admin_status_counts":
+            counts = Counter()
+            counts[("profiles", None)] = len(self.tables["profiles"])
+            for claim in self.tables["claim_requests"]:
+                counts[("claim_requests", claim["status"])] += 1
+            for item in self.tables["items"]:
+                counts[("items", item["status"])] += 1
+                if item.get("flagged"):
+                    counts[("items_flagged", None)] += 1
+            return [{"source": source, "status": status, "total": total} for (source, status), total in counts.items()]
+        
+        if name == "provision_profile":
+            profile = self.by_id["profiles"].get(args["p_user_id"])
+            if profile is None:
+                return self.insert("profiles", {
+                    "id": args["p_user_id"],
+                    "email": args["p_email"],
+                    "first_name": args["p_first_name"],
+                    "last_name": args["p_last_name"],
+                    "user_type": "ADMIN" if args.get("p_is_admin") else "STUDENT"
+                }, upsert=False)
+            profile["first_name"] = profile.get("first_name") or args["p_first_name"]
+            profile["last_name"] = profile.get("last_name") or args["p_last_name"]
+            if args.get("p_is_admin"):
+                profile["user_type"] = "ADMIN"
+            return [profile]
+        
+        if name == "ensure_profile":
+            profile = self.by_id["profiles"].get(args["p_user_id"])
+            if profile is None:
+                return self.rpc("provision_profile", args)
+            return [profile]
+        
+        if name == "search_items":
+            matches = []
+            for item in self.tables["items"]:
+                if item["status"] != "active" or not item.get("is_active", True):
+                    continue
+                if args.get("p_type") and item["type"] != args["p_type"]:
+                    continue
+                if args.get("p_category") and item["category"] != args["p_category"]:
+                    continue
+                if args.get("p_location") and args["p_location"].lower() not in item["location"].lower():
+                    continue
+                if args.get("p_urgency") and item["urgency"] != args["p_urgency"]:
+                    continue
+                if args.get("p_has_reward") and not item["reward"]:
+                    continue
+                rank = text_matches(item, args["p_query"])
+                if rank:
+                    matches.append((rank, item))
+            matches.sort(key=lambda match: (match[0], match[1]["created_at"], match[1]["id"]), reverse=True)
+            window = matches[args.get("p_offset", 0):args.get("p_offset", 0) + args.get("p_limit", 12)]
+            return [{
+                "item": self.embed("items", [item], "*, profiles!items_user_id_fkey(first_name, last_name, email)")[0],
+                "rank": float(rank),
+                "total_count": len(matches)
+            } for rank, item in window]
+        
+        # Side-effect-only functions (notifications, refresh_*) are accepted and ignored
+        return None
+
+def create_app(stand_in: StandIn) -> FastAPI:
+    app = FastAPI(title="Supabase stand-in")
+    
+    @app.middleware("http")
+    async def count_and_delay(request: Request, call_next):
+        path = request.url.path
+        if not path.startswith("/__"):
+            kind = path.split("/")[1] if path.count("/") > 1 else path
+            target = path.split("/")[3] if path.startswith("/rest/v1/") and path.count("/") >= 3 else ""
+            stand_in.requests[f"{kind}:{request.method}:{target}".rstrip(":")] += 1
+            delay = stand_in.latency_ms + random.uniform(-stand_in.jitter_ms, stand_in.jitter_ms)
+            if delay > 0:
+                await asyncio.sleep(delay / 1000)
+        return await call_next(request)
+    
+    # Control endpoints used by load_suite.py
+    @app.get("/__stats")
+    async def stats():
+        return {"total": sum(stand_in.requests.values()), "by_route": dict(stand_in.requests)}
+    
+    @app.post("/__reset")
+    async def reset():
+        stand_in.requests.clear()
+        return {"ok": True}
+    
+    @app.get("/__fixtures")
+    async def fixtures():
+        profiles = stand_in.tables["profiles"]
+        return {
+            "jwt_secret": JWT_SECRET,
+            "anon_key": service_key("anon"),
+            "service_role_key": service_key("service_role"),
+            "users": [{"id": p["id"], "email": p["email"], "admin": p["user_type"] == "ADMIN"} for p in profiles],
+            "item_ids": [item["id"] for item in stand_in.tables["items"] if item["status"] == "active"],
+            "conversations": [
+                {"claim_request_id": s["claim_request_id"], "participants": [s["claimer_id"], s["owner_id"]]}
+                for s in stand_in.tables["conversation_summaries"]
+            ]
+        }
+    
+    # PostgREST
+    @app.post("/rest/v1/rpc/{name}")
+    async def rpc(name: str, request: Request):
+        body = await request.body()
+        return JSONResponse(stand_in.rpc(name, json.loads(body) if body else {}))
+    
+    @app.api_route("/rest/v1/{table}", methods=["GET", "HEAD", "POST", "PATCH", "DELETE"])
+    async def rest(table: str, request: Request):
+        params = request.query_params
+        prefer = request.headers.get("prefer", "")
+        
+        if request.method == "POST":
+            rows = stand_in.insert(table, json.loads(await request.body()), "merge-duplicates" in prefer)
+            return JSONResponse(stand_in.embed(table, rows, params.get("select", "*")), status_code=201)
+        
+        rows = stand_in.matching(table, params)
+        if request.method == "PATCH":
+            # update_updated_at_column() trigger
+            changes = {**json.loads(await request.body()), "updated_at": iso(datetime.now(timezone.utc))}
+            for row in rows:
+                row.update(changes)
+            return JSONResponse(stand_in.embed(table, rows, params.get("select", "*")))
+        if request.method == "DELETE":
+            for row in rows:
+                stand_in.tables[table].remove(row)
+                stand_in.by_id.get(table, {}).pop(row.get("id"), None)
+            return JSONResponse(rows)
+        
+        total = len(rows)
+        rows = stand_in.ordered(rows, params.get("order"))
+        offset = int(params.get("offset", 0))
+        limit = params.get("limit")
+        rows = rows[offset:offset + int(limit)] if limit else rows[offset:]
+        
+        headers = {}
+        if "count=" in prefer:
+            end = offset + len(rows) - 1
+            headers["Content-Range"] = f"{offset}-{end}/{total}" if rows else f"*/{total}"
+        if request.method == "HEAD":
+            return Response(headers=headers)
+        return JSONResponse(stand_in.embed(table, rows, params.get("select", "*")), headers=headers)
+    
+    # Auth (GoTrue)
+    def auth_user(profile: dict) -> dict:
+        return {
+            "id": profile["id"],
+            "aud": JWT_AUDIENCE,
+            "role": "authenticated",
+            "email": profile["email"],
+            "app_metadata": {"provider": "email"},
+            "user_metadata": {"full_name": profile.get("full_name")},
+            "created_at": profile["created_at"],
+            "email_confirmed_at": profile["created_at"]
+        }
+    
+    def session(profile: dict) -> dict:
+        return {
+            "access_token": make_token(profile["id"], profile["email"]),
+            "token_type": "bearer",
+            "expires_in": 24 * 3600,
+            "expires_at": int(time.time()) + 24 * 3600,
+            "refresh_token": uuid.uuid4().hex,
+            "user": auth_user(profile)
+        }
+    
+    @app.post("/auth/v1/token")
+    async def token(request: Request):
+        credentials = await request.json()
+        profile = next((p for p in stand_in.tables["profiles"] if p["email"] == credentials.get("email")), None)
+        if profile is None:
+            return JSONResponse({"error": "invalid_grant", "error_description": "Invalid login credentials"}, status_code=400)
+        return session(profile)
+    
+    @app.post("/auth/v1/signup")
+    async def signup(request: Request):
+        body = await request.json()
+        full_name = (body.get("data") or {}).get("full_name") or "New User"
+        first_name, _, last_name = full_name.partition(" ")
+        profile = stand_in.insert("profiles", {
+            "email": body["email"],
+            "first_name": first_name,
+            "last_name": last_name,
+            "full_name": full_name,
+            "user_type": "STUDENT",
+            "is_admin": False
+        }, upsert=False)[0]
+        return session(profile)
+    
+    @app.get("/auth/v1/user")
+    async def user(request: Request):
+        token = request.headers.get("authorization", "")[7:]
+        claims = jwt.decode(token, JWT_SECRET, algorithms=["HS256"], audience=JWT_AUDIENCE)
+        return auth_user(stand_in.by_id["profiles"][claims["sub"]])
+    
+    @app.get("/auth/v1/.well-known/jwks.json")
+    async def jwks():
+        return {"keys": []}
+    
+    # Storage
+    @app.post("/storage/v1/bucket")
+    async def create_bucket(request: Request):
+        body = await request.json()
+        return JSONResponse({"error": "Duplicate", "message": f"Bucket {body.get('name')} already exists"}, status_code=409)
+    
+    @app.post("/storage/v1/object/{bucket}/{path:path}")
+    async def upload(bucket: str, path: str, request: Request):
+        stand_in.storage_bytes += len(await request.body())
+        return {"Key": f"{bucket}/{path}", "Id": str(uuid.uuid4())}
+    
+    return app
+
+def main():
+    parser = argparse.ArgumentParser(description="In-memory Supabase REST/Auth/Storage stand-in for benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=54321)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--claims", type=int, default=1000)
+    parser.add_argument("--messages-per-claim", type=int, default=6)
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="Delay added to every request (models the network + database)")
+    parser.add_argument("--jitter-ms", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    
+    tables = seed(args.users, args.items, args.claims, args.messages_per_claim, random.Random(args.seed))
+    stand_in = StandIn(tables, args.latency_ms, args.jitter_ms)
+    print(f"seeded {len(tables['profiles'])} users, {len(tables['items'])} items, "
+          f"{len(tables['claim_requests'])} claims, {len(tables['chat_messages'])} messages")
+    uvicorn.run(create_app(stand_in), host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
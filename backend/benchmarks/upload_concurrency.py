@@ -0,0 +1,94 @@
+"""
+Concurrent upload benchmark for POST /api/upload.
+
+While uploads run, a probe requests /api/health every 50ms. Its latency shows
+how long the event loop is blocked, i.e. what every other API caller feels.
+Run the API first, then:
+
+    python benchmarks/upload_concurrency.py --token <access token> --uploads 40 --concurrency 8
+
+Compare a run on the previous revision (processing on the event loop) with
+IMAGE_POOL_KIND=process and IMAGE_POOL_KIND=thread on the current one.
+"""
+import argparse
+import asyncio
+import io
+import os
+import statistics
+import time
+
+import httpx
+from PIL import Image
+
+def make_photo(width: int, height: int) -> bytes:
+    """Noisy JPEG that compresses about as badly as a real phone photo"""
+    image = Image.frombytes("RGB", (width, height), os.urandom(width * height * 3))
+    output = io.BytesIO()
+    image.save(output, format="JPEG", quality=90)
+    return output.getvalue()
+
+def summarize(label: str, latencies: list):
+    if not latencies:
+        print(f"{label}: no samples")
+        return
+    latencies = sorted(latencies)
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    print(f"{label}: n={len(latencies)}  mean {statistics.mean(latencies) * 1000:.1f}ms  "
+          f"p95 {p95 * 1000:.1f}ms  max {latencies[-1] * 1000:.1f}ms")
+
+async def run(args):
+    photo = make_photo(args.width, args.height)
+    print(f"payload: {len(photo) / 1024 / 1024:.1f} MB JPEG, {args.width}x{args.height}")
+    
+    upload_latencies, probe_latencies = [], []
+    statuses = {}
+    remaining = args.uploads
+    done = asyncio.Event()
+    headers = {"Authorization": f"Bearer {args.token}"}
+    
+    async def uploader(client: httpx.AsyncClient):
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            response = await client.post(
+                "/api/upload",
+                files={"file": ("photo.jpg", photo, "image/jpeg")},
+                headers=headers
+            )
+            upload_latencies.append(time.perf_counter() - started)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+    
+    async def probe(client: httpx.AsyncClient):
+        while not done.is_set():
+            started = time.perf_counter()
+            await client.get("/api/health")
+            probe_latencies.append(time.perf_counter() - started)
+            await asyncio.sleep(0.05)
+    
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=120) as client:
+        probe_task = asyncio.create_task(probe(client))
+        started = time.perf_counter()
+        await asyncio.gather(*(uploader(client) for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await probe_task
+    
+    print(f"uploads:     {args.uploads} at concurrency {args.concurrency} in {elapsed:.2f}s "
+          f"({args.uploads / elapsed:.2f}/s)")
+    print(f"statuses:    {dict(sorted(statuses.items()))}")
+    summarize("upload     ", upload_latencies)
+    summarize("health probe", probe_latencies)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent image uploads and event-loop responsiveness")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--token", required=True, help="Access token of a test user")
+    parser.add_argument("--uploads", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--width", type=int, default=2400)
+    parser.add_argument("--height", type=int, default=1800)
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
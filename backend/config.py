@@ -8,6 +8,42 @@ class Settings(BaseSettings):
     supabase_anon_key: str = os.getenv("SUPABASE_ANON_KEY", "")
     supabase_service_role_key: str = os.getenv("SUPABASE_SERVICE_ROLE_KEY", "")
     
+    # Supabase HTTP connection pool (shared by all async clients in a process)
+    supabase_pool_max_connections: int = int(os.getenv("SUPABASE_POOL_MAX_CONNECTIONS", "100"))
+    supabase_pool_max_keepalive: int = int(os.getenv("SUPABASE_POOL_MAX_KEEPALIVE", "20"))
+    supabase_pool_keepalive_expiry: float = float(os.getenv("SUPABASE_POOL_KEEPALIVE_EXPIRY", "30"))
+    supabase_request_timeout: float = float(os.getenv("SUPABASE_REQUEST_TIMEOUT", "10"))
+    
+    # Item storage: "legacy" (lost_items/found_items) or "unified" (public.items,
+    # after migrations/001_unified_items.sql and backfill_items.py)
+    items_source: str = os.getenv("ITEMS_SOURCE", "legacy")
+    # Item search: "fts" (search_vector columns, migrations/002_item_search.sql),
+    # "ilike" (title/description ILIKE, no migration) or "auto" (fts with unified items)
+    item_search: str = os.getenv("ITEM_SEARCH", "auto")
+    
+    # Categories/locations id<->name cache
+    reference_cache_ttl_seconds: int = int(os.getenv("REFERENCE_CACHE_TTL_SECONDS", "300"))
+    
+    # Upload image processing pool: "process" or "thread"; uploads beyond
+    # image_pool_max_pending (running + queued) get 503 with Retry-After
+    image_pool_kind: str = os.getenv("IMAGE_POOL_KIND", "process")
+    image_pool_workers: int = int(os.getenv("IMAGE_POOL_WORKERS", str(min(os.cpu_count() or 2, 4))))
+    image_pool_max_pending: int = int(os.getenv("IMAGE_POOL_MAX_PENDING", "16"))
+    image_pool_retry_after_seconds: int = int(os.getenv("IMAGE_POOL_RETRY_AFTER_SECONDS", "2"))
+    
+    # Rendered placeholder images kept per process (LRU)
+    placeholder_cache_size: int = int(os.getenv("PLACEHOLDER_CACHE_SIZE", "128"))
+    
+    # When set (e.g. "/_uploads/"), /api/uploads answers with X-Accel-Redirect so
+    # nginx serves local uploads itself via sendfile
+    uploads_accel_redirect_prefix: str = os.getenv("UPLOADS_ACCEL_REDIRECT_PREFIX", "")
+    
+    # Real-time conversation pushes. DATABASE_URL (direct Postgres connection
+    # string) bridges workers via LISTEN/NOTIFY; without it pushes stay in-process
+    database_url: str = os.getenv("DATABASE_URL", "")
+    realtime_queue_size: int = int(os.getenv("REALTIME_QUEUE_SIZE", "100"))
+    realtime_keepalive_seconds: int = int(os.getenv("REALTIME_KEEPALIVE_SECONDS", "15"))
+    
     # Application Settings
     environment: str = os.getenv("ENVIRONMENT", "development")
     secret_key: str = os.getenv("SECRET_KEY", "your-secret-key-change-this")
@@ -16,6 +52,41 @@ class Settings(BaseSettings):
     # JWT Settings
     jwt_algorithm: str = "HS256"
     jwt_expire_minutes: int = 60 * 24 * 7  # 7 days
+    supabase_jwt_secret: str = os.getenv("SUPABASE_JWT_SECRET", "")
+    supabase_jwt_audience: str = os.getenv("SUPABASE_JWT_AUDIENCE", "authenticated")
+    supabase_jwks_ttl_seconds: int = int(os.getenv("SUPABASE_JWKS_TTL_SECONDS", "3600"))
+    
+    # Profile cache used by the auth dependency; with DATABASE_URL set, changes made
+    # through any worker evict it everywhere (migrations/012_profile_notify.sql)
+    profile_cache_ttl_seconds: int = int(os.getenv("PROFILE_CACHE_TTL_SECONDS", "60"))
+    profile_cache_max_size: int = int(os.getenv("PROFILE_CACHE_MAX_SIZE", "10000"))
+    # Display names/emails of other users (profiles.ProfileLoader)
+    profile_summary_ttl_seconds: int = int(os.getenv("PROFILE_SUMMARY_TTL_SECONDS", "30"))
+    
+    # Admin dashboard counts snapshot
+    admin_stats_ttl_seconds: int = int(os.getenv("ADMIN_STATS_TTL_SECONDS", "30"))
+    
+    # In-process cache of public GET /api/items and /api/items/{id} responses
+    response_cache_size: int = int(os.getenv("RESPONSE_CACHE_SIZE", "512"))
+    response_cache_list_ttl_seconds: int = int(os.getenv("RESPONSE_CACHE_LIST_TTL_SECONDS", "10"))
+    response_cache_item_ttl_seconds: int = int(os.getenv("RESPONSE_CACHE_ITEM_TTL_SECONDS", "30"))
+    
+    # Bulk moderation: ids per UPDATE, and batch size that switches to a background job
+    bulk_action_chunk_size: int = int(os.getenv("BULK_ACTION_CHUNK_SIZE", "200"))
+    bulk_action_background_threshold: int = int(os.getenv("BULK_ACTION_BACKGROUND_THRESHOLD", "500"))
+    # Seconds a stopping worker waits for background jobs before interrupting them; keep below GRACEFUL_TIMEOUT
+    job_drain_timeout_seconds: float = float(os.getenv("JOB_DRAIN_TIMEOUT_SECONDS", "45"))
+    
+    # Backend calls per request: Server-Timing header and @query_budget checks (off, warn or enforce)
+    server_timing_enabled: bool = os.getenv("SERVER_TIMING_ENABLED", "true").lower() == "true"
+    query_budget_mode: str = os.getenv("QUERY_BUDGET_MODE", "warn")
+    
+    # Lost/found matching index (matching.py): catch up with other workers' writes
+    # every sync interval, rebuild from scratch (drops hard-deleted items) less often
+    match_index_enabled: bool = os.getenv("MATCH_INDEX_ENABLED", "true").lower() == "true"
+    match_sync_interval_seconds: float = float(os.getenv("MATCH_SYNC_INTERVAL_SECONDS", "15"))
+    match_rebuild_interval_seconds: float = float(os.getenv("MATCH_REBUILD_INTERVAL_SECONDS", "1800"))
+    match_page_size: int = int(os.getenv("MATCH_PAGE_SIZE", "1000"))
     
     class Config:
         env_file = ".env"
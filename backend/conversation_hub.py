@@ -0,0 +1,144 @@
+from collections import defaultdict
+from typing import Awaitable, Callable, Dict, Optional, Set
+import asyncio
+import json
+import logging
+import asyncpg
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Channel written by the chat_messages insert trigger (migrations/004_chat_notify.sql)
+CHAT_NOTIFY_CHANNEL = "chat_messages"
+# Channel written by the profiles update/delete trigger (migrations/012_profile_notify.sql)
+PROFILE_NOTIFY_CHANNEL = "profile_changes"
+
+class ConversationHub:
+    """In-process pub/sub: one bounded queue per connected client, grouped by conversation"""
+    
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        self.bridge: Optional["PostgresNotifyBridge"] = None
+    
+    def subscribe(self, claim_request_id: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers[claim_request_id].add(queue)
+        return queue
+    
+    def unsubscribe(self, claim_request_id: str, queue: asyncio.Queue):
+        subscribers = self._subscribers.get(claim_request_id)
+        if subscribers is None:
+            return
+        subscribers.discard(queue)
+        if not subscribers:
+            del self._subscribers[claim_request_id]
+    
+    def has_subscribers(self, claim_request_id: str) -> bool:
+        return bool(self._subscribers.get(claim_request_id))
+    
+    def publish_local(self, claim_request_id: str, event: dict):
+        """Deliver to this worker's subscribers; a client that stopped reading loses old events"""
+        for queue in list(self._subscribers.get(claim_request_id, ())):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(event)
+    
+    def publish(self, claim_request_id: str, event: dict):
+        """Called after a message is stored; with the bridge running the database trigger fans out instead"""
+        if self.bridge is None or not self.bridge.connected:
+            self.publish_local(claim_request_id, event)
+    
+    def connection_count(self) -> int:
+        return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+class PostgresNotifyBridge:
+    """LISTENs on the chat channel (and any extra channels) so every worker sees changes made by any worker"""
+    
+    def __init__(self, dsn: str, hub: ConversationHub, enrich: Callable[[dict], Awaitable[dict]],
+                 listeners: Optional[Dict[str, Callable[[str], None]]] = None):
+        self.dsn = dsn
+        self.hub = hub
+        self.enrich = enrich
+        self.listeners = listeners or {}
+        self.connected = False
+        self._connection = None
+        self._task: Optional[asyncio.Task] = None
+    
+    async def start(self):
+        self._task = asyncio.create_task(self._run())
+    
+    async def _run(self):
+        delay = 1.0
+        while True:
+            try:
+                self._connection = await asyncpg.connect(self.dsn)
+                await self._connection.add_listener(CHAT_NOTIFY_CHANNEL, self._on_notify)
+                for channel in self.listeners:
+                    await self._connection.add_listener(channel, self._on_listener_notify)
+                self.connected = True
+                delay = 1.0
+                logger.info(f"Listening for {', '.join([CHAT_NOTIFY_CHANNEL, *self.listeners])} notifications")
+                
+                # asyncpg delivers notifications from its own reader; just watch the connection
+                while not self._connection.is_closed():
+                    await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"LISTEN connection lost: {e}; retrying in {delay:.0f}s")
+            finally:
+                self.connected = False
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30.0)
+    
+    def _on_notify(self, connection, pid, channel, payload):
+        try:
+            row = json.loads(payload)
+        except ValueError:
+            logger.error(f"Bad {channel} payload: {payload[:200]}")
+            return
+        # Every worker gets every notification; only those with a client in the conversation enrich it
+        if not self.hub.has_subscribers(row.get("claim_request_id")):
+            return
+        asyncio.create_task(self._deliver(row))
+    
+    def _on_listener_notify(self, connection, pid, channel, payload):
+        try:
+            self.listeners[channel](payload)
+        except Exception as e:
+            logger.error(f"{channel} listener failed: {e}")
+    
+    async def _deliver(self, row: dict):
+        try:
+            event = await self.enrich(row)
+        except Exception as e:
+            logger.error(f"Could not enrich chat notification: {e}")
+            event = row
+        self.hub.publish_local(row["claim_request_id"], event)
+    
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._connection is not None and not self._connection.is_closed():
+            await self._connection.close()
+
+# Global instance
+conversation_hub = ConversationHub(queue_size=settings.realtime_queue_size)
+
+async def start_bridge(enrich: Callable[[dict], Awaitable[dict]], listeners: Optional[Dict[str, Callable[[str], None]]] = None):
+    """Bridge workers through Postgres when DATABASE_URL is configured; listeners get the payload of their channel"""
+    if not settings.database_url:
+        logger.info("DATABASE_URL not set; conversation pushes and cache invalidations stay within this worker")
+        return
+    conversation_hub.bridge = PostgresNotifyBridge(settings.database_url, conversation_hub, enrich, listeners)
+    await conversation_hub.bridge.start()
+
+async def stop_bridge():
+    if conversation_hub.bridge is not None:
+        await conversation_hub.bridge.stop()
+        conversation_hub.bridge = None
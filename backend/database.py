@@ -1,14 +1,34 @@
 from supabase import create_client, Client
+from postgrest import AsyncPostgrestClient
 from typing import Optional
+import httpx
 import logging
 from config import settings
+from query_budget import CountingTransport
 
 logger = logging.getLogger(__name__)
 
+class PooledPostgrestClient(AsyncPostgrestClient):
+    """Async PostgREST client whose HTTP session rides on the shared process-wide transport"""
+    transport: Optional[httpx.AsyncBaseTransport] = None
+    
+    def create_session(self, base_url, headers, timeout, *args, **kwargs) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=timeout,
+            transport=self.transport,
+            follow_redirects=True
+        )
+
 class SupabaseClient:
     def __init__(self):
         self.client: Optional[Client] = None
         self.service_client: Optional[Client] = None
+        self.transport: Optional[CountingTransport] = None
+        self.async_client: Optional[PooledPostgrestClient] = None
+        self.async_service_client: Optional[PooledPostgrestClient] = None
+        self.http_client: Optional[httpx.AsyncClient] = None
     
     def get_client(self) -> Client:
         """Get Supabase client with anon key (for frontend operations)"""
@@ -37,6 +57,83 @@ class SupabaseClient:
             logger.info("Supabase service client initialized")
         
         return self.service_client
+    
+    def get_transport(self) -> CountingTransport:
+        """Get the keep-alive connection pool shared by every async client in this process"""
+        if not self.transport:
+            self.transport = CountingTransport(httpx.AsyncHTTPTransport(
+                limits=httpx.Limits(
+                    max_connections=settings.supabase_pool_max_connections,
+                    max_keepalive_connections=settings.supabase_pool_max_keepalive,
+                    keepalive_expiry=settings.supabase_pool_keepalive_expiry
+                ),
+                retries=1
+            ))
+            logger.info("Supabase connection pool initialized")
+        
+        return self.transport
+    
+    def _create_async_client(self, key: str) -> PooledPostgrestClient:
+        PooledPostgrestClient.transport = self.get_transport()
+        return PooledPostgrestClient(
+            f"{settings.supabase_url.rstrip('/')}/rest/v1",
+            headers={
+                "apikey": key,
+                "Authorization": f"Bearer {key}"
+            },
+            timeout=settings.supabase_request_timeout
+        )
+    
+    def get_async_client(self) -> PooledPostgrestClient:
+        """Get non-blocking PostgREST client with anon key"""
+        if not self.async_client:
+            if not settings.supabase_url or not settings.supabase_anon_key:
+                raise ValueError("Supabase URL and ANON KEY must be set in environment variables")
+            
+            self.async_client = self._create_async_client(settings.supabase_anon_key)
+            logger.info("Async Supabase client initialized")
+        
+        return self.async_client
+    
+    def get_async_service_client(self) -> PooledPostgrestClient:
+        """Get non-blocking PostgREST client with service role key"""
+        if not self.async_service_client:
+            if not settings.supabase_url or not settings.supabase_service_role_key:
+                raise ValueError("Supabase URL and SERVICE ROLE KEY must be set in environment variables")
+            
+            self.async_service_client = self._create_async_client(settings.supabase_service_role_key)
+            logger.info("Async Supabase service client initialized")
+        
+        return self.async_service_client
+    
+    def get_http_client(self) -> httpx.AsyncClient:
+        """Get raw HTTP client for Supabase auth/storage endpoints, sharing the same pool"""
+        if not self.http_client:
+            if not settings.supabase_url or not settings.supabase_anon_key:
+                raise ValueError("Supabase URL and ANON KEY must be set in environment variables")
+            
+            self.http_client = httpx.AsyncClient(
+                base_url=settings.supabase_url.rstrip('/'),
+                headers={"apikey": settings.supabase_anon_key},
+                timeout=settings.supabase_request_timeout,
+                transport=self.get_transport()
+            )
+        
+        return self.http_client
+    
+    async def aclose(self):
+        """Close async clients and drain the shared connection pool"""
+        for client in (self.async_client, self.async_service_client):
+            if client:
+                await client.aclose()
+        if self.http_client:
+            await self.http_client.aclose()
+        if self.transport:
+            await self.transport.aclose()
+        self.async_client = None
+        self.async_service_client = None
+        self.http_client = None
+        self.transport = None
 
 # Global instance
 supabase_client = SupabaseClient()
@@ -47,4 +144,21 @@ def get_supabase() -> Client:
 
 def get_supabase_admin() -> Client:
     """Dependency to get Supabase service client for admin operations"""
-    return supabase_client.get_service_client() 
\ No newline at end of file
+    return supabase_client.get_service_client()
+
+def get_async_supabase() -> PooledPostgrestClient:
+    """Dependency to get non-blocking Supabase table client"""
+    return supabase_client.get_async_client()
+
+def get_async_supabase_admin() -> PooledPostgrestClient:
+    """Dependency to get non-blocking Supabase table client for admin operations"""
+    return supabase_client.get_async_service_client()
+
+def get_supabase_http() -> httpx.AsyncClient:
+    """Dependency to get pooled HTTP client for Supabase auth/storage APIs"""
+    return supabase_client.get_http_client()
+
+def or_filter(query, filters: str):
+    """Add a PostgREST or=(...) filter; the postgrest-py pinned by supabase 2.0.3 has no .or_()"""
+    query.params = query.params.add("or", f"({filters})")
+    return query
\ No newline at end of file
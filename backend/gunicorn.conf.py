@@ -0,0 +1,91 @@
+"""
+Gunicorn settings for the production image (see entrypoint.sh).
+
+Gunicorn supervises N uvicorn workers: it restarts crashed ones, replaces
+them gracefully on SIGHUP and recycles them after MAX_REQUESTS requests or
+when their RSS passes MAX_WORKER_RSS_MB.
+"""
+import glob
+import logging
+import os
+import signal
+import threading
+import time
+
+def available_cpus() -> int:
+    """Cores this container may use: CPU affinity, further limited by a cgroup v2 quota"""
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, int(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+cpus = available_cpus()
+
+bind = os.getenv("BIND", "0.0.0.0:8001")
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = int(os.getenv("WEB_CONCURRENCY", str(cpus)))
+
+# Each worker runs its own image processing pool; share the cores between them
+os.environ.setdefault("IMAGE_POOL_WORKERS", str(max(1, cpus // workers)))
+
+# Workers write Prometheus samples here; /metrics in any worker aggregates them.
+# Must be in the environment before a worker imports prometheus_client
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/prometheus_multiproc")
+multiproc_dir = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+
+# Recycling: jitter keeps workers from restarting all at once
+max_requests = int(os.getenv("MAX_REQUESTS", "10000"))
+max_requests_jitter = int(os.getenv("MAX_REQUESTS_JITTER", str(max_requests // 10)))
+max_worker_rss_mb = int(os.getenv("MAX_WORKER_RSS_MB", "512"))
+rss_check_interval = float(os.getenv("RSS_CHECK_INTERVAL_SECONDS", "15"))
+
+# Time a stopping worker gets to finish in-flight requests and drain background
+# jobs (JOB_DRAIN_TIMEOUT_SECONDS); recycled workers stop the same way
+graceful_timeout = int(os.getenv("GRACEFUL_TIMEOUT", "60"))
+timeout = int(os.getenv("WORKER_TIMEOUT", "60"))
+# Longer than nginx's upstream keepalive_timeout, so nginx closes idle connections first
+keepalive = int(os.getenv("KEEPALIVE", "75"))
+
+accesslog = None
+errorlog = "-"
+loglevel = os.getenv("LOG_LEVEL", "info")
+
+def current_rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        resident_pages = int(f.read().split()[1])
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+def watch_rss(worker):
+    """Ask this worker to stop gracefully once it grows past the RSS ceiling; the arbiter replaces it"""
+    while True:
+        time.sleep(rss_check_interval)
+        try:
+            rss = current_rss_mb()
+        except OSError:
+            return
+        if rss > max_worker_rss_mb:
+            worker.log.info(f"Worker {worker.pid} RSS {rss:.0f} MB > {max_worker_rss_mb} MB, recycling")
+            os.kill(worker.pid, signal.SIGTERM)
+            return
+
+def post_worker_init(worker):
+    if max_worker_rss_mb > 0:
+        threading.Thread(target=watch_rss, args=(worker,), name="rss-watch", daemon=True).start()
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
+
+def on_starting(server):
+    # Samples left by a previous run would be summed into the new ones
+    os.makedirs(multiproc_dir, exist_ok=True)
+    for stale in glob.glob(os.path.join(multiproc_dir, "*.db")):
+        os.remove(stale)
+    logging.getLogger("gunicorn.error").info(
+        f"{workers} workers on {cpus} available cores, recycled after ~{max_requests} requests or {max_worker_rss_mb} MB"
+    )
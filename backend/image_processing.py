@@ -0,0 +1,157 @@
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+import asyncio
+import io
+import logging
+import multiprocessing
+import time
+from PIL import Image
+from config import settings
+from metrics import IMAGE_POOL_PENDING, IMAGE_POOL_REJECTED, IMAGE_PROCESSING_SECONDS
+
+logger = logging.getLogger(__name__)
+
+MAX_IMAGE_SIZE = (1920, 1920)
+
+# Fixed-width copies stored next to each upload's original:
+# {user_id}/{upload_id}/original.<ext>, {user_id}/{upload_id}/320.webp, ...
+IMAGE_VARIANT_WIDTHS = {"small": 320, "medium": 800}
+IMAGE_VARIANT_FORMATS = {
+    # name: (Pillow format, file extension, content type, save options)
+    "webp": ("WEBP", "webp", "image/webp", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", "jpg", "image/jpeg", {"quality": 80, "optimize": True, "progressive": True})
+}
+ORIGINAL_IMAGE_STEM = "original"
+
+def variant_filename(variant: str) -> str:
+    """File name of a variant key such as "small_webp" ("320.webp")"""
+    size, image_format = variant.rsplit("_", 1)
+    return f"{IMAGE_VARIANT_WIDTHS[size]}.{IMAGE_VARIANT_FORMATS[image_format][1]}"
+
+def variant_content_type(variant: str) -> str:
+    return IMAGE_VARIANT_FORMATS[variant.rsplit("_", 1)[1]][2]
+
+def image_variant_urls(image_url: Optional[str]) -> Optional[Dict[str, str]]:
+    """Variant URLs for an uploaded original, or None for images without variants"""
+    if not image_url:
+        return None
+    folder, _, name = image_url.rpartition("/")
+    if not folder or name.rsplit(".", 1)[0] != ORIGINAL_IMAGE_STEM:
+        return None
+    return {
+        f"{size}_{image_format}": f"{folder}/{variant_filename(f'{size}_{image_format}')}"
+        for size in IMAGE_VARIANT_WIDTHS
+        for image_format in IMAGE_VARIANT_FORMATS
+    }
+
+class InvalidImageError(Exception):
+    """Raised when uploaded bytes cannot be decoded as an image"""
+
+class ImagePoolSaturated(Exception):
+    """Raised when the processing queue is full; callers answer 503"""
+
+def render_variants(image: Image.Image) -> Dict[str, bytes]:
+    """Encode every width/format variant of an RGB image (never upscales)"""
+    if image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+    
+    variants = {}
+    for size, width in IMAGE_VARIANT_WIDTHS.items():
+        resized = image
+        if image.width > width:
+            resized = image.resize((width, max(1, round(image.height * width / image.width))), Image.Resampling.LANCZOS)
+        for image_format, (pil_format, _, _, options) in IMAGE_VARIANT_FORMATS.items():
+            output = io.BytesIO()
+            resized.save(output, format=pil_format, **options)
+            variants[f"{size}_{image_format}"] = output.getvalue()
+    return variants
+
+def process_image(content: bytes, content_type: str) -> Tuple[bytes, Dict[str, bytes]]:
+    """Decode, flatten to RGB, downscale and re-encode an upload, plus its variants (runs in a pool worker)"""
+    try:
+        image = Image.open(io.BytesIO(content))
+        
+        # Convert to RGB if necessary (for JPEG compatibility)
+        if image.mode in ('RGBA', 'LA', 'P'):
+            background = Image.new('RGB', image.size, (255, 255, 255))
+            if image.mode == 'P':
+                image = image.convert('RGBA')
+            background.paste(image, mask=image.split()[-1] if image.mode == 'RGBA' else None)
+            image = background
+        
+        # Resize if too large (max 1920x1920)
+        if image.size[0] > MAX_IMAGE_SIZE[0] or image.size[1] > MAX_IMAGE_SIZE[1]:
+            image.thumbnail(MAX_IMAGE_SIZE, Image.Resampling.LANCZOS)
+        
+        # Save optimized image
+        output = io.BytesIO()
+        image_format = 'JPEG' if content_type in ['image/jpeg', 'image/jpg'] else 'PNG'
+        image.save(output, format=image_format, quality=85, optimize=True)
+        return output.getvalue(), render_variants(image)
+    except Exception as e:
+        # Exceptions cross the process boundary by pickling; keep them simple
+        raise InvalidImageError(str(e))
+
+class ImageProcessingPool:
+    """Bounded executor for CPU-heavy image work, kept off the event loop"""
+    
+    def __init__(self, kind: str, workers: int, max_pending: int):
+        self.kind = kind
+        self.workers = workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self.rejected = 0
+        self._executor: Optional[Executor] = None
+    
+    def _get_executor(self) -> Executor:
+        # Created lazily so importing the app never starts worker processes
+        if self._executor is None:
+            if self.kind == "thread":
+                # Pillow releases the GIL in decode/resize/encode
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="image")
+            else:
+                # spawn: never fork an event loop that holds locks and sockets
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+        return self._executor
+    
+    async def run(self, fn, *args):
+        """Run fn(*args) in the pool, or raise ImagePoolSaturated if too much work is queued"""
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            IMAGE_POOL_REJECTED.inc()
+            raise ImagePoolSaturated()
+        
+        self.pending += 1
+        IMAGE_POOL_PENDING.inc()
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self.pending -= 1
+            IMAGE_POOL_PENDING.dec()
+            IMAGE_PROCESSING_SECONDS.labels(self.kind).observe(time.perf_counter() - started)
+    
+    def stats(self) -> dict:
+        return {
+            "kind": self.kind,
+            "workers": self.workers,
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            "rejected": self.rejected
+        }
+    
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+# Global instance
+image_pool = ImageProcessingPool(
+    kind=settings.image_pool_kind,
+    workers=settings.image_pool_workers,
+    max_pending=settings.image_pool_max_pending
+)
@@ -0,0 +1,193 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+import heapq
+import math
+import re
+
+# Repeated words in a title say more than the same words in a description
+FIELD_WEIGHTS = {"title": 3.0, "category": 2.0, "location": 1.5, "description": 1.0}
+OPPOSITE_TYPE = {"lost": "found", "found": "lost"}
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Terms in more than this share of a type's items (category tokens, "black", ...)
+# are only scored for candidates that already share a rarer term
+COMMON_TERM_RATIO = 0.05
+COMMON_TERM_MIN_DF = 50
+# How many of the common terms seed the candidates when a query has no rare one
+FALLBACK_SEED_TERMS = 2
+
+STOPWORDS = frozenset("""
+a an and are as at be been but by for from has have i in is it its my near of on or our
+the this that to was were with lost found item please contact if any
+""".split())
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercase word tokens without stopwords, with a plural "s" stripped"""
+    tokens = []
+    for token in TOKEN_RE.findall((text or "").lower()):
+        if len(token) < 2 or token in STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+def document_terms(row: dict) -> Dict[str, float]:
+    """Field-weighted term frequencies; category and location words get their own namespaces"""
+    terms: Dict[str, float] = defaultdict(float)
+    for token in tokenize(row.get("title")):
+        terms[token] += FIELD_WEIGHTS["title"]
+    for token in tokenize(row.get("description")):
+        terms[token] += FIELD_WEIGHTS["description"]
+    if row.get("category"):
+        terms[f"cat:{row['category'].lower()}"] += FIELD_WEIGHTS["category"]
+    for token in tokenize(row.get("location")):
+        terms[f"loc:{token}"] += FIELD_WEIGHTS["location"]
+    return dict(terms)
+
+class MatchDocument:
+    """An indexed item: its weighted terms plus the fields a match card shows"""
+    __slots__ = ("id", "type", "user_id", "title", "category", "location", "image", "created_at", "terms", "length")
+    
+    def __init__(self, row: dict):
+        self.id = row["id"]
+        self.type = row["type"]
+        self.user_id = row.get("user_id")
+        self.title = row.get("title") or ""
+        self.category = row.get("category") or "other"
+        self.location = row.get("location") or "Unknown"
+        images = row.get("images") or []
+        self.image = images[0] if images else None
+        self.created_at = row.get("created_at")
+        self.terms = document_terms(row)
+        self.length = sum(self.terms.values())
+
+class MatchIndex:
+    """
+    In-process inverted index over active items, one per item type, scored
+    with BM25. Updates are incremental (add/remove one item); a query for a
+    lost item only touches the postings of the found index and vice versa.
+    """
+    
+    def __init__(self):
+        self.documents: Dict[str, MatchDocument] = {}
+        # type -> term -> {item id: weighted tf}
+        self.postings: Dict[str, Dict[str, Dict[str, float]]] = {"lost": {}, "found": {}}
+        self.total_length: Dict[str, float] = {"lost": 0.0, "found": 0.0}
+        self.counts: Dict[str, int] = {"lost": 0, "found": 0}
+    
+    def __len__(self) -> int:
+        return len(self.documents)
+    
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self.documents
+    
+    def get(self, item_id: str) -> Optional[MatchDocument]:
+        return self.documents.get(item_id)
+    
+    def add(self, row: dict):
+        """Index (or re-index) an item row in the unified shape"""
+        if row.get("type") not in OPPOSITE_TYPE:
+            return
+        self.remove(row["id"])
+        document = MatchDocument(row)
+        postings = self.postings[document.type]
+        for term, weight in document.terms.items():
+            postings.setdefault(term, {})[document.id] = weight
+        self.documents[document.id] = document
+        self.total_length[document.type] += document.length
+        self.counts[document.type] += 1
+    
+    def remove(self, item_id: str):
+        document = self.documents.pop(item_id, None)
+        if document is None:
+            return
+        postings = self.postings[document.type]
+        for term in document.terms:
+            term_postings = postings.get(term)
+            if term_postings is not None:
+                term_postings.pop(item_id, None)
+                if not term_postings:
+                    del postings[term]
+        self.total_length[document.type] -= document.length
+        self.counts[document.type] -= 1
+    
+    def apply(self, row: dict):
+        """Keep active items indexed and drop everything else"""
+        if row.get("status") == "active" and row.get("is_active", True):
+            self.add(row)
+        else:
+            self.remove(row["id"])
+    
+    def matches(self, document: MatchDocument, limit: int = 10) -> List[Tuple[MatchDocument, float, List[str]]]:
+        """Top opposite-type items for document: (candidate, score, shared terms), best first"""
+        candidate_type = OPPOSITE_TYPE[document.type]
+        postings = self.postings[candidate_type]
+        total = self.counts[candidate_type]
+        if not total or not document.terms:
+            return []
+        average_length = self.total_length[candidate_type] / total
+        common_df = max(COMMON_TERM_MIN_DF, int(total * COMMON_TERM_RATIO))
+        
+        rare, common = [], []
+        for term, query_weight in document.terms.items():
+            term_postings = postings.get(term)
+            if not term_postings:
+                continue
+            df = len(term_postings)
+            idf = math.log(1 + (total - df + 0.5) / (df + 0.5))
+            entry = (term, idf * (1 + math.log(query_weight)), term_postings)
+            (common if df > common_df else rare).append(entry)
+        
+        # Only common terms shared: the most distinctive ones pick the candidates
+        if not rare:
+            common.sort(key=lambda entry: entry[1], reverse=True)
+            rare, common = common[:FALLBACK_SEED_TERMS], common[FALLBACK_SEED_TERMS:]
+        
+        documents = self.documents
+        def bm25(weight: float, candidate_id: str) -> float:
+            length = documents[candidate_id].length
+            return weight * (K1 + 1) / (weight + K1 * (1 - B + B * length / average_length))
+        
+        scores: Dict[str, float] = defaultdict(float)
+        shared: Dict[str, List[str]] = defaultdict(list)
+        # Candidates come from the rare terms; common terms only add to their scores
+        for term, query_factor, term_postings in rare:
+            for candidate_id, weight in term_postings.items():
+                scores[candidate_id] += query_factor * bm25(weight, candidate_id)
+                shared[candidate_id].append(term)
+        for term, query_factor, term_postings in common:
+            for candidate_id in scores:
+                weight = term_postings.get(candidate_id)
+                if weight:
+                    scores[candidate_id] += query_factor * bm25(weight, candidate_id)
+                    shared[candidate_id].append(term)
+        
+        # People do not match their own reports
+        ranked = heapq.nlargest(
+            limit,
+            ((candidate_id, score) for candidate_id, score in scores.items()
+             if self.documents[candidate_id].user_id != document.user_id),
+            key=lambda entry: entry[1]
+        )
+        return [(self.documents[candidate_id], score, shared[candidate_id]) for candidate_id, score in ranked]
+    
+    def stats(self) -> dict:
+        return {
+            "items": len(self.documents),
+            "lost": self.counts["lost"],
+            "found": self.counts["found"],
+            "terms": {item_type: len(postings) for item_type, postings in self.postings.items()}
+        }
+    
+    @classmethod
+    def build(cls, rows: Iterable[dict]) -> "MatchIndex":
+        index = cls()
+        for row in rows:
+            index.apply(row)
+        return index
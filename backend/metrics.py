@@ -0,0 +1,111 @@
+"""
+Prometheus metrics for GET /metrics.
+
+With several workers (gunicorn, uvicorn --workers) set PROMETHEUS_MULTIPROC_DIR
+to an empty directory before the workers start; each process then writes its
+samples there and /metrics aggregates all of them (gunicorn.conf.py does this).
+"""
+from typing import Tuple
+import os
+import time
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+from prometheus_client import multiprocess
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "API request latency by route template",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "Requests currently being handled",
+    ["method"],
+    multiprocess_mode="livesum"
+)
+SUPABASE_LATENCY = Histogram(
+    "supabase_request_duration_seconds",
+    "Supabase calls by table (or RPC/auth/storage) and operation",
+    ["table", "operation"],
+    buckets=LATENCY_BUCKETS
+)
+IMAGE_PROCESSING_SECONDS = Histogram(
+    "image_processing_seconds",
+    "Validating and resizing an upload in the image pool, queueing included",
+    ["pool"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0)
+)
+IMAGE_POOL_PENDING = Gauge(
+    "image_pool_pending",
+    "Image jobs queued or running",
+    multiprocess_mode="livesum"
+)
+IMAGE_POOL_REJECTED = Counter("image_pool_rejected_total", "Uploads turned away because the image pool was full")
+UPLOAD_BYTES = Histogram(
+    "upload_size_bytes",
+    "Size of uploaded files as received",
+    buckets=(64 * 1024, 256 * 1024, 512 * 1024, 1024 ** 2, 2 * 1024 ** 2, 5 * 1024 ** 2, 10 * 1024 ** 2)
+)
+CACHE_LOOKUPS = Counter(
+    "cache_lookups_total",
+    "In-process cache lookups; hit ratio = hit / (hit + miss)",
+    ["cache", "result"]
+)
+
+REST_OPERATIONS = {"GET": "select", "HEAD": "count", "POST": "insert", "PATCH": "update", "PUT": "upsert", "DELETE": "delete"}
+
+def supabase_labels(method: str, path: str) -> Tuple[str, str]:
+    """(table, operation) for a request to the Supabase REST/auth/storage APIs"""
+    if path.startswith("/rest/v1/rpc/"):
+        return path[len("/rest/v1/rpc/"):], "rpc"
+    if path.startswith("/rest/v1/"):
+        return path[len("/rest/v1/"):].split("/", 1)[0], REST_OPERATIONS.get(method, method.lower())
+    if path.startswith("/auth/v1/"):
+        return "auth", path[len("/auth/v1/"):].split("/", 1)[0]
+    if path.startswith("/storage/v1/"):
+        return "storage", f"{path[len('/storage/v1/'):].split('/', 1)[0]}_{method.lower()}"
+    return "other", method.lower()
+
+def observe_supabase_call(method: str, path: str, seconds: float):
+    SUPABASE_LATENCY.labels(*supabase_labels(method, path)).observe(seconds)
+
+def render() -> Tuple[bytes, str]:
+    """Exposition text for this process, or for every worker in multiprocess mode"""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+class MetricsMiddleware:
+    """Per-route latency histogram and in-flight gauge; the route is the matched path template"""
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        method = scope["method"]
+        status_code = 500
+        started = time.perf_counter()
+        
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        in_flight = REQUESTS_IN_FLIGHT.labels(method)
+        in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_flight.dec()
+            # Unmatched paths share one label so scanners cannot blow up the series count
+            route = getattr(scope.get("route"), "path", "unmatched")
+            REQUEST_LATENCY.labels(method, route, str(status_code)).observe(time.perf_counter() - started)
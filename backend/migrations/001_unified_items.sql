@@ -0,0 +1,240 @@
+-- Lost & Found Portal - Migration 001: consolidate lost_items/found_items into public.items
+-- Run this in the Supabase SQL Editor on databases that still have the split tables.
+--
+-- Rollout:
+--   1. Run this script. From now on every write to lost_items/found_items is
+--      mirrored into public.items by trigger (dual-write).
+--   2. Run `python backfill_items.py` from backend/ to copy existing rows in batches.
+--   3. Set ITEMS_SOURCE=unified and restart the API. Every endpoint now reads and
+--      writes public.items only, with one indexed query per lookup or listing.
+
+-- 1. Statuses used by the moderation endpoints
+ALTER TYPE item_status ADD VALUE IF NOT EXISTS 'rejected';
+
+-- 2. Indexes backing the single-table listing (status filter + keyset order)
+CREATE INDEX IF NOT EXISTS idx_items_listing
+    ON public.items(created_at DESC, id DESC)
+    WHERE status = 'active' AND is_active = true;
+CREATE INDEX IF NOT EXISTS idx_items_type_listing
+    ON public.items(type, created_at DESC, id DESC)
+    WHERE status = 'active' AND is_active = true;
+
+-- 3. Map one legacy row (as jsonb) onto public.items
+CREATE OR REPLACE FUNCTION public.legacy_item_status(p_status TEXT)
+RETURNS item_status AS $$
+BEGIN
+    RETURN CASE upper(COALESCE(p_status, 'ACTIVE'))
+        WHEN 'ACTIVE' THEN 'active'
+        WHEN 'AVAILABLE' THEN 'active'
+        WHEN 'CLAIMED' THEN 'claimed'
+        WHEN 'RESOLVED' THEN 'resolved'
+        WHEN 'ARCHIVED' THEN 'archived'
+        WHEN 'REJECTED' THEN 'rejected'
+        ELSE 'removed'
+    END::item_status;
+END;
+$$ LANGUAGE plpgsql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION public.upsert_item_from_legacy(p_row JSONB, p_type item_type)
+RETURNS VOID AS $$
+DECLARE
+    v_category TEXT;
+    v_location TEXT;
+    v_date_key TEXT := CASE WHEN p_type = 'lost' THEN 'date_lost' ELSE 'date_found' END;
+    v_time_key TEXT := CASE WHEN p_type = 'lost' THEN 'time_lost' ELSE 'time_found' END;
+    v_time TIME;
+BEGIN
+    SELECT lower(name) INTO v_category FROM public.categories WHERE id::text = p_row->>'category_id';
+    IF v_category IS NULL OR NOT v_category = ANY(enum_range(NULL::item_category)::TEXT[]) THEN
+        v_category := 'other';
+    END IF;
+
+    SELECT name INTO v_location FROM public.locations WHERE id::text = p_row->>'location_id';
+
+    IF p_row->>v_time_key ~ '^\d{1,2}:\d{2}' THEN
+        v_time := (p_row->>v_time_key)::TIME;
+    END IF;
+
+    INSERT INTO public.items (
+        id, user_id, type, title, description, category, location,
+        date_lost, time_lost, date_found, time_found,
+        images, reward, urgency, status, contact_preference,
+        flagged, flag_reason, moderated_by, moderated_at, moderation_notes,
+        moderation_status, created_at, updated_at
+    )
+    VALUES (
+        (p_row->>'id')::UUID,
+        (p_row->>'user_id')::UUID,
+        p_type,
+        p_row->>'title',
+        p_row->>'description',
+        v_category::item_category,
+        COALESCE(v_location, p_row->>'current_location', 'Unknown'),
+        CASE WHEN p_type = 'lost' THEN (p_row->>v_date_key)::DATE END,
+        CASE WHEN p_type = 'lost' THEN v_time END,
+        CASE WHEN p_type = 'found' THEN (p_row->>v_date_key)::DATE END,
+        CASE WHEN p_type = 'found' THEN v_time END,
+        CASE WHEN jsonb_typeof(p_row->'images') = 'array'
+             THEN ARRAY(SELECT jsonb_array_elements_text(p_row->'images'))
+             ELSE ARRAY[]::TEXT[] END,
+        COALESCE((p_row->>'reward_amount')::DECIMAL, 0),
+        CASE WHEN lower(p_row->>'urgency') IN ('low', 'medium', 'high')
+             THEN lower(p_row->>'urgency') ELSE 'medium' END::urgency_level,
+        public.legacy_item_status(p_row->>'status'),
+        CASE WHEN lower(p_row->>'contact_method') IN ('email', 'phone', 'both')
+             THEN lower(p_row->>'contact_method') ELSE 'email' END,
+        COALESCE((p_row->>'flagged')::BOOLEAN, false),
+        p_row->>'flag_reason',
+        (p_row->>'moderated_by')::UUID,
+        (p_row->>'moderated_at')::TIMESTAMPTZ,
+        p_row->>'moderation_notes',
+        CASE lower(COALESCE(p_row->>'moderation_status', ''))
+            WHEN 'approve' THEN 'approved'
+            WHEN 'approved' THEN 'approved'
+            WHEN 'reject' THEN 'rejected'
+            WHEN 'rejected' THEN 'rejected'
+            WHEN 'flag' THEN 'flagged'
+            WHEN 'flagged' THEN 'flagged'
+            ELSE 'pending'
+        END,
+        COALESCE((p_row->>'created_at')::TIMESTAMPTZ, NOW()),
+        COALESCE((p_row->>'updated_at')::TIMESTAMPTZ, NOW())
+    )
+    ON CONFLICT (id) DO UPDATE SET
+        title = EXCLUDED.title,
+        description = EXCLUDED.description,
+        category = EXCLUDED.category,
+        location = EXCLUDED.location,
+        date_lost = EXCLUDED.date_lost,
+        time_lost = EXCLUDED.time_lost,
+        date_found = EXCLUDED.date_found,
+        time_found = EXCLUDED.time_found,
+        images = EXCLUDED.images,
+        reward = EXCLUDED.reward,
+        urgency = EXCLUDED.urgency,
+        status = EXCLUDED.status,
+        contact_preference = EXCLUDED.contact_preference,
+        flagged = EXCLUDED.flagged,
+        flag_reason = EXCLUDED.flag_reason,
+        moderated_by = EXCLUDED.moderated_by,
+        moderated_at = EXCLUDED.moderated_at,
+        moderation_notes = EXCLUDED.moderation_notes,
+        moderation_status = EXCLUDED.moderation_status,
+        updated_at = EXCLUDED.updated_at;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+REVOKE ALL ON FUNCTION public.upsert_item_from_legacy(JSONB, item_type) FROM PUBLIC, anon, authenticated;
+
+-- 4. Dual-write: mirror every legacy write into public.items
+-- Rows that items rejects (CHECK constraints, missing profile, ...) are logged
+-- here instead of failing the legacy write or stopping the backfill
+CREATE TABLE IF NOT EXISTS public.item_mirror_failures (
+    item_id UUID PRIMARY KEY,
+    type item_type NOT NULL,
+    operation TEXT NOT NULL,
+    error TEXT NOT NULL,
+    row_data JSONB,
+    failed_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+ALTER TABLE public.item_mirror_failures ENABLE ROW LEVEL SECURITY;
+
+CREATE OR REPLACE FUNCTION public.record_mirror_failure(p_type item_type, p_operation TEXT, p_row JSONB, p_error TEXT)
+RETURNS VOID AS $$
+BEGIN
+    RAISE WARNING 'Could not mirror % item % into public.items: %', p_type, p_row->>'id', p_error;
+    INSERT INTO public.item_mirror_failures (item_id, type, operation, error, row_data)
+    VALUES ((p_row->>'id')::UUID, p_type, p_operation, p_error, p_row)
+    ON CONFLICT (item_id) DO UPDATE SET
+        operation = EXCLUDED.operation,
+        error = EXCLUDED.error,
+        row_data = EXCLUDED.row_data,
+        failed_at = NOW();
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+REVOKE ALL ON FUNCTION public.record_mirror_failure(item_type, TEXT, JSONB, TEXT) FROM PUBLIC, anon, authenticated;
+
+CREATE OR REPLACE FUNCTION public.mirror_legacy_item()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_row JSONB;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        v_row := to_jsonb(OLD);
+    ELSE
+        v_row := to_jsonb(NEW);
+    END IF;
+
+    -- The legacy tables stay the source of truth: a mirror error never aborts their write
+    BEGIN
+        IF TG_OP = 'DELETE' THEN
+            DELETE FROM public.items WHERE id = OLD.id;
+        ELSE
+            PERFORM public.upsert_item_from_legacy(v_row, TG_ARGV[0]::item_type);
+        END IF;
+    EXCEPTION WHEN others THEN
+        PERFORM public.record_mirror_failure(TG_ARGV[0]::item_type, TG_OP, v_row, SQLERRM);
+    END;
+
+    IF TG_OP = 'DELETE' THEN
+        RETURN OLD;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- Fresh installs created from supabase_schema.sql have no legacy tables; skip there
+DO $$
+BEGIN
+    IF to_regclass('public.lost_items') IS NOT NULL THEN
+        DROP TRIGGER IF EXISTS mirror_lost_items ON public.lost_items;
+        CREATE TRIGGER mirror_lost_items
+            AFTER INSERT OR UPDATE OR DELETE ON public.lost_items
+            FOR EACH ROW EXECUTE FUNCTION public.mirror_legacy_item('lost');
+    END IF;
+
+    IF to_regclass('public.found_items') IS NOT NULL THEN
+        DROP TRIGGER IF EXISTS mirror_found_items ON public.found_items;
+        CREATE TRIGGER mirror_found_items
+            AFTER INSERT OR UPDATE OR DELETE ON public.found_items
+            FOR EACH ROW EXECUTE FUNCTION public.mirror_legacy_item('found');
+    END IF;
+END $$;
+
+-- 5. Online backfill: copy one keyset batch per call, resumable from p_after.
+-- Rows that cannot be copied are skipped, counted in failed and logged to
+-- item_mirror_failures; fix them in the legacy table and the trigger mirrors them.
+DROP FUNCTION IF EXISTS public.backfill_legacy_items(item_type, UUID, INTEGER);
+CREATE OR REPLACE FUNCTION public.backfill_legacy_items(
+    p_type item_type,
+    p_after UUID DEFAULT NULL,
+    p_batch_size INTEGER DEFAULT 500
+)
+RETURNS TABLE (copied INTEGER, failed INTEGER, last_id UUID) AS $$
+DECLARE
+    v_row JSONB;
+    v_copied INTEGER := 0;
+    v_failed INTEGER := 0;
+    v_last UUID := p_after;
+BEGIN
+    FOR v_row IN EXECUTE format(
+        'SELECT to_jsonb(t) FROM public.%I t WHERE $1 IS NULL OR t.id > $1 ORDER BY t.id LIMIT $2',
+        CASE WHEN p_type = 'lost' THEN 'lost_items' ELSE 'found_items' END
+    ) USING p_after, p_batch_size
+    LOOP
+        BEGIN
+            PERFORM public.upsert_item_from_legacy(v_row, p_type);
+            v_copied := v_copied + 1;
+        EXCEPTION WHEN others THEN
+            PERFORM public.record_mirror_failure(p_type, 'BACKFILL', v_row, SQLERRM);
+            v_failed := v_failed + 1;
+        END;
+        v_last := (v_row->>'id')::UUID;
+    END LOOP;
+
+    RETURN QUERY SELECT v_copied, v_failed, v_last;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+REVOKE ALL ON FUNCTION public.backfill_legacy_items(item_type, UUID, INTEGER) FROM PUBLIC, anon, authenticated;
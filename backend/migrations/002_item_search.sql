@@ -0,0 +1,89 @@
+-- Lost & Found Portal - Migration 002: indexed, ranked full-text search on items
+-- Run after 001_unified_items.sql.
+--
+-- GET /api/items?search=... used to filter with title/description ILIKE '%q%',
+-- which no index can serve. Each item table now carries a generated,
+-- weighted tsvector (title = A, description = B) with a GIN index. The API
+-- turns the search text into a prefix tsquery ('black:* & wall:*') and either
+-- filters with it (sort=recent) or calls search_items() below (sort=relevance).
+--
+-- Adding a STORED generated column rewrites the table; on large tables run
+-- this outside peak hours.
+
+-- 1. public.items
+ALTER TABLE public.items
+    ADD COLUMN IF NOT EXISTS search_vector TSVECTOR GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', COALESCE(title, '')), 'A') ||
+        setweight(to_tsvector('english', COALESCE(description, '')), 'B')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_items_search_vector
+    ON public.items USING GIN (search_vector);
+
+-- 2. Legacy tables, so ITEMS_SOURCE=legacy searches use the index too
+DO $$
+BEGIN
+    IF to_regclass('public.lost_items') IS NOT NULL THEN
+        ALTER TABLE public.lost_items
+            ADD COLUMN IF NOT EXISTS search_vector TSVECTOR GENERATED ALWAYS AS (
+                setweight(to_tsvector('english', COALESCE(title, '')), 'A') ||
+                setweight(to_tsvector('english', COALESCE(description, '')), 'B')
+            ) STORED;
+        CREATE INDEX IF NOT EXISTS idx_lost_items_search_vector
+            ON public.lost_items USING GIN (search_vector);
+    END IF;
+
+    IF to_regclass('public.found_items') IS NOT NULL THEN
+        ALTER TABLE public.found_items
+            ADD COLUMN IF NOT EXISTS search_vector TSVECTOR GENERATED ALWAYS AS (
+                setweight(to_tsvector('english', COALESCE(title, '')), 'A') ||
+                setweight(to_tsvector('english', COALESCE(description, '')), 'B')
+            ) STORED;
+        CREATE INDEX IF NOT EXISTS idx_found_items_search_vector
+            ON public.found_items USING GIN (search_vector);
+    END IF;
+END $$;
+
+-- 3. Relevance-ranked search over active items, one round trip per page.
+-- p_query is a to_tsquery() expression built by the API. Each row carries
+-- the item (with owner profile, as the REST embed would return it), its rank
+-- and the total number of matches.
+CREATE OR REPLACE FUNCTION public.search_items(
+    p_query TEXT,
+    p_type item_type DEFAULT NULL,
+    p_category item_category DEFAULT NULL,
+    p_location TEXT DEFAULT NULL,
+    p_urgency urgency_level DEFAULT NULL,
+    p_has_reward BOOLEAN DEFAULT NULL,
+    p_limit INTEGER DEFAULT 12,
+    p_offset INTEGER DEFAULT 0
+)
+RETURNS TABLE (item JSONB, rank REAL, total_count BIGINT) AS $$
+    WITH matches AS (
+        SELECT i.*, ts_rank_cd(i.search_vector, q.query, 32) AS search_rank
+        FROM public.items i,
+             to_tsquery('english', p_query) AS q(query)
+        WHERE i.search_vector @@ q.query
+          AND i.status = 'active'
+          AND i.is_active = true
+          AND (p_type IS NULL OR i.type = p_type)
+          AND (p_category IS NULL OR i.category = p_category)
+          AND (p_location IS NULL OR i.location ILIKE '%' || p_location || '%')
+          AND (p_urgency IS NULL OR i.urgency = p_urgency)
+          AND (p_has_reward IS NOT TRUE OR i.reward > 0)
+    )
+    SELECT
+        (to_jsonb(m) - 'search_vector' - 'search_rank') || jsonb_build_object(
+            'profiles', CASE WHEN p.id IS NULL THEN NULL ELSE jsonb_build_object(
+                'first_name', to_jsonb(p)->'first_name',
+                'last_name', to_jsonb(p)->'last_name',
+                'email', p.email
+            ) END
+        ),
+        m.search_rank,
+        count(*) OVER ()
+    FROM matches m
+    LEFT JOIN public.profiles p ON p.id = m.user_id
+    ORDER BY m.search_rank DESC, m.created_at DESC, m.id DESC
+    LIMIT p_limit OFFSET p_offset;
+$$ LANGUAGE sql STABLE;
@@ -0,0 +1,40 @@
+-- Lost & Found Portal - Migration 003: bulk conversation list support
+--
+-- GET /api/conversations used to fetch the latest message and the unread
+-- count with two queries per conversation. conversation_message_stats()
+-- returns both for every requested claim in a single call, each answered
+-- from the indexes below.
+--
+-- This is the legacy-mode (ITEMS_SOURCE=legacy) conversation list. With
+-- ITEMS_SOURCE=unified the list is read from conversation_summaries (005)
+-- and this function is unused, but keep it until every worker runs unified.
+
+CREATE INDEX IF NOT EXISTS idx_chat_messages_claim_created
+    ON public.chat_messages(claim_request_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_chat_messages_claim_unread
+    ON public.chat_messages(claim_request_id, sender_id)
+    WHERE is_read = false;
+
+CREATE OR REPLACE FUNCTION public.conversation_message_stats(
+    p_claim_ids UUID[],
+    p_user_id UUID
+)
+RETURNS TABLE (claim_request_id UUID, latest_message JSONB, unread_count BIGINT) AS $$
+    SELECT
+        c.id,
+        (
+            SELECT to_jsonb(m)
+            FROM public.chat_messages m
+            WHERE m.claim_request_id = c.id
+            ORDER BY m.created_at DESC
+            LIMIT 1
+        ),
+        (
+            SELECT count(*)
+            FROM public.chat_messages m
+            WHERE m.claim_request_id = c.id
+              AND m.is_read = false
+              AND m.sender_id <> p_user_id
+        )
+    FROM unnest(p_claim_ids) AS c(id);
+$$ LANGUAGE sql STABLE;
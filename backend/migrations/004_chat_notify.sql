@@ -0,0 +1,19 @@
+-- Lost & Found Portal - Migration 004: NOTIFY on new chat messages
+--
+-- API workers started with DATABASE_URL LISTEN on the "chat_messages" channel
+-- and push each new row to the WebSocket/SSE clients of that conversation,
+-- whichever worker (or other writer) inserted it.
+
+CREATE OR REPLACE FUNCTION public.notify_chat_message()
+RETURNS TRIGGER AS $$
+BEGIN
+    -- Messages are capped at 1000 characters, well inside NOTIFY's 8000-byte limit
+    PERFORM pg_notify('chat_messages', to_jsonb(NEW)::text);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS notify_chat_message ON public.chat_messages;
+CREATE TRIGGER notify_chat_message
+    AFTER INSERT ON public.chat_messages
+    FOR EACH ROW EXECUTE FUNCTION public.notify_chat_message();
@@ -0,0 +1,189 @@
+-- Lost & Found Portal - Migration 005: materialised conversation summaries
+--
+-- One row per claim request with everything the conversation list shows:
+-- both participants, a snapshot of the item, a preview of the latest message,
+-- the time of the last activity and an unread counter per participant.
+-- Triggers keep it current, so GET /api/conversations is a single indexed
+-- query ordered by last_activity_at.
+--
+-- Item owners are read from public.items; run 001 (and its backfill) first.
+-- The API reads this table with ITEMS_SOURCE=unified; legacy mode keeps using
+-- conversation_message_stats() from 003.
+
+-- 1. Table and list indexes
+CREATE TABLE IF NOT EXISTS public.conversation_summaries (
+    claim_request_id UUID PRIMARY KEY REFERENCES public.claim_requests(id) ON DELETE CASCADE,
+    claimer_id UUID NOT NULL REFERENCES public.profiles(id) ON DELETE CASCADE,
+    owner_id UUID NOT NULL REFERENCES public.profiles(id) ON DELETE CASCADE,
+    item_id UUID NOT NULL,
+    item_title TEXT NOT NULL,
+    item_type item_type NOT NULL,
+    item_image TEXT,
+    claim_status TEXT,
+    last_message_id UUID,
+    last_message_sender_id UUID,
+    last_message_preview TEXT,
+    last_message_at TIMESTAMP WITH TIME ZONE,
+    last_activity_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    claimer_unread_count INTEGER NOT NULL DEFAULT 0,
+    owner_unread_count INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS idx_conversation_summaries_claimer
+    ON public.conversation_summaries(claimer_id, last_activity_at DESC);
+CREATE INDEX IF NOT EXISTS idx_conversation_summaries_owner
+    ON public.conversation_summaries(owner_id, last_activity_at DESC);
+CREATE INDEX IF NOT EXISTS idx_conversation_summaries_item
+    ON public.conversation_summaries(item_id);
+
+ALTER TABLE public.conversation_summaries ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Participants can view their conversation summaries" ON public.conversation_summaries;
+CREATE POLICY "Participants can view their conversation summaries" ON public.conversation_summaries
+    FOR SELECT USING (auth.uid() IN (claimer_id, owner_id));
+
+-- 2. Rebuild one summary from the source tables (new claims, backfill, repairs)
+CREATE OR REPLACE FUNCTION public.refresh_conversation_summary(p_claim_request_id UUID)
+RETURNS VOID AS $$
+BEGIN
+    INSERT INTO public.conversation_summaries (
+        claim_request_id, claimer_id, owner_id, item_id, item_title, item_type, item_image,
+        claim_status, last_message_id, last_message_sender_id, last_message_preview,
+        last_message_at, last_activity_at, claimer_unread_count, owner_unread_count
+    )
+    SELECT
+        c.id, c.claimer_id, i.user_id, i.id, i.title, i.type, i.images[1],
+        c.status::TEXT, m.id, m.sender_id, left(m.message, 200),
+        m.created_at, GREATEST(c.created_at, m.created_at),
+        (SELECT count(*) FROM public.chat_messages u
+          WHERE u.claim_request_id = c.id AND u.is_read = false AND u.sender_id <> c.claimer_id),
+        (SELECT count(*) FROM public.chat_messages u
+          WHERE u.claim_request_id = c.id AND u.is_read = false AND u.sender_id <> i.user_id)
+    FROM public.claim_requests c
+    JOIN public.items i ON i.id = c.item_id
+    LEFT JOIN LATERAL (
+        SELECT id, sender_id, message, created_at
+        FROM public.chat_messages
+        WHERE claim_request_id = c.id
+        ORDER BY created_at DESC
+        LIMIT 1
+    ) m ON true
+    WHERE c.id = p_claim_request_id
+    ON CONFLICT (claim_request_id) DO UPDATE SET
+        owner_id = EXCLUDED.owner_id,
+        item_title = EXCLUDED.item_title,
+        item_type = EXCLUDED.item_type,
+        item_image = EXCLUDED.item_image,
+        claim_status = EXCLUDED.claim_status,
+        last_message_id = EXCLUDED.last_message_id,
+        last_message_sender_id = EXCLUDED.last_message_sender_id,
+        last_message_preview = EXCLUDED.last_message_preview,
+        last_message_at = EXCLUDED.last_message_at,
+        last_activity_at = EXCLUDED.last_activity_at,
+        claimer_unread_count = EXCLUDED.claimer_unread_count,
+        owner_unread_count = EXCLUDED.owner_unread_count;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+REVOKE ALL ON FUNCTION public.refresh_conversation_summary(UUID) FROM PUBLIC, anon, authenticated;
+
+-- 3. New claims and claim status changes
+CREATE OR REPLACE FUNCTION public.conversation_summary_on_claim()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM public.refresh_conversation_summary(NEW.id);
+    ELSIF NEW.status IS DISTINCT FROM OLD.status THEN
+        UPDATE public.conversation_summaries
+        SET claim_status = NEW.status::TEXT
+        WHERE claim_request_id = NEW.id;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+DROP TRIGGER IF EXISTS conversation_summary_on_claim ON public.claim_requests;
+CREATE TRIGGER conversation_summary_on_claim
+    AFTER INSERT OR UPDATE ON public.claim_requests
+    FOR EACH ROW EXECUTE FUNCTION public.conversation_summary_on_claim();
+
+-- 4. New messages: move the preview forward and count it as unread for the recipient
+CREATE OR REPLACE FUNCTION public.conversation_summary_on_message()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE public.conversation_summaries
+    SET last_message_id = NEW.id,
+        last_message_sender_id = NEW.sender_id,
+        last_message_preview = left(NEW.message, 200),
+        last_message_at = NEW.created_at,
+        last_activity_at = GREATEST(last_activity_at, NEW.created_at),
+        claimer_unread_count = claimer_unread_count
+            + CASE WHEN NOT NEW.is_read AND NEW.sender_id <> claimer_id THEN 1 ELSE 0 END,
+        owner_unread_count = owner_unread_count
+            + CASE WHEN NOT NEW.is_read AND NEW.sender_id <> owner_id THEN 1 ELSE 0 END
+    WHERE claim_request_id = NEW.claim_request_id;
+
+    IF NOT FOUND THEN
+        PERFORM public.refresh_conversation_summary(NEW.claim_request_id);
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+DROP TRIGGER IF EXISTS conversation_summary_on_message ON public.chat_messages;
+CREATE TRIGGER conversation_summary_on_message
+    AFTER INSERT ON public.chat_messages
+    FOR EACH ROW EXECUTE FUNCTION public.conversation_summary_on_message();
+
+-- 5. Read receipts: recount once per statement (mark-as-read updates many rows),
+--    using idx_chat_messages_claim_unread from migration 003
+CREATE OR REPLACE FUNCTION public.conversation_summary_on_read()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE public.conversation_summaries s
+    SET claimer_unread_count = (
+            SELECT count(*) FROM public.chat_messages u
+            WHERE u.claim_request_id = s.claim_request_id AND u.is_read = false AND u.sender_id <> s.claimer_id
+        ),
+        owner_unread_count = (
+            SELECT count(*) FROM public.chat_messages u
+            WHERE u.claim_request_id = s.claim_request_id AND u.is_read = false AND u.sender_id <> s.owner_id
+        )
+    WHERE s.claim_request_id IN (
+        SELECT n.claim_request_id
+        FROM new_rows n
+        JOIN old_rows o ON o.id = n.id
+        WHERE n.is_read IS DISTINCT FROM o.is_read
+    );
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- Transition tables cannot be combined with a column list, so this fires on every update
+DROP TRIGGER IF EXISTS conversation_summary_on_read ON public.chat_messages;
+CREATE TRIGGER conversation_summary_on_read
+    AFTER UPDATE ON public.chat_messages
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION public.conversation_summary_on_read();
+
+-- 6. Keep the item snapshot in step with edits
+CREATE OR REPLACE FUNCTION public.conversation_summary_on_item()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE public.conversation_summaries
+    SET item_title = NEW.title,
+        item_type = NEW.type,
+        item_image = NEW.images[1],
+        owner_id = NEW.user_id
+    WHERE item_id = NEW.id;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+DROP TRIGGER IF EXISTS conversation_summary_on_item ON public.items;
+CREATE TRIGGER conversation_summary_on_item
+    AFTER UPDATE OF title, type, images, user_id ON public.items
+    FOR EACH ROW EXECUTE FUNCTION public.conversation_summary_on_item();
+
+-- 7. Backfill existing conversations
+SELECT public.refresh_conversation_summary(id) FROM public.claim_requests;
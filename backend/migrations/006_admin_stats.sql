@@ -0,0 +1,38 @@
+-- Lost & Found Portal - Migration 006: grouped counts for the admin dashboard
+--
+-- GET /api/admin/stats used to download the status of every item row and
+-- count them in Python. admin_status_counts() returns one row per
+-- (source, status) for items, both legacy tables, claims and profiles, so the
+-- dashboard costs a single round trip whatever the catalogue size.
+
+CREATE OR REPLACE FUNCTION public.admin_status_counts()
+RETURNS TABLE (source TEXT, status TEXT, total BIGINT) AS $$
+BEGIN
+    RETURN QUERY SELECT 'profiles'::TEXT, NULL::TEXT, count(*) FROM public.profiles;
+
+    RETURN QUERY
+        SELECT 'claim_requests'::TEXT, c.status::TEXT, count(*)
+        FROM public.claim_requests c
+        GROUP BY c.status;
+
+    IF to_regclass('public.items') IS NOT NULL THEN
+        RETURN QUERY
+            SELECT 'items'::TEXT, i.status::TEXT, count(*)
+            FROM public.items i
+            GROUP BY i.status;
+    END IF;
+
+    -- Legacy tables are optional, so they are queried dynamically
+    IF to_regclass('public.lost_items') IS NOT NULL THEN
+        RETURN QUERY EXECUTE
+            'SELECT ''lost_items''::TEXT, status::TEXT, count(*) FROM public.lost_items GROUP BY status';
+    END IF;
+
+    IF to_regclass('public.found_items') IS NOT NULL THEN
+        RETURN QUERY EXECUTE
+            'SELECT ''found_items''::TEXT, status::TEXT, count(*) FROM public.found_items GROUP BY status';
+    END IF;
+END;
+$$ LANGUAGE plpgsql STABLE SECURITY DEFINER;
+
+REVOKE ALL ON FUNCTION public.admin_status_counts() FROM PUBLIC, anon, authenticated;
@@ -0,0 +1,222 @@
+-- Lost & Found Portal - Migration 007: daily rollups for admin analytics
+-- Run after 006_admin_stats.sql.
+--
+-- GET /api/admin/analytics used to download every profile, item and claim
+-- created in the window (up to 90 days) and count them in Python.
+-- public.daily_stats keeps one row per UTC day, maintained by the triggers
+-- below, so a timeframe is answered from at most 90 small rows.
+-- refresh_daily_stats() rebuilds any range from the raw tables (backfill,
+-- or repair after bulk imports that bypassed triggers).
+
+-- 1. Rollup table
+CREATE TABLE IF NOT EXISTS public.daily_stats (
+    day DATE PRIMARY KEY,
+    new_users INTEGER NOT NULL DEFAULT 0,
+    lost_items INTEGER NOT NULL DEFAULT 0,
+    found_items INTEGER NOT NULL DEFAULT 0,
+    claims_pending INTEGER NOT NULL DEFAULT 0,
+    claims_approved INTEGER NOT NULL DEFAULT 0,
+    claims_rejected INTEGER NOT NULL DEFAULT 0,
+    claims_completed INTEGER NOT NULL DEFAULT 0,
+    flagged_items INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+ALTER TABLE public.daily_stats ENABLE ROW LEVEL SECURITY;
+
+-- 2. Add delta to one counter of one day
+CREATE OR REPLACE FUNCTION public.bump_daily_stat(p_day DATE, p_column TEXT, p_delta INTEGER)
+RETURNS VOID AS $$
+BEGIN
+    EXECUTE format(
+        'INSERT INTO public.daily_stats AS d (day, %1$I) VALUES ($1, $2)
+         ON CONFLICT (day) DO UPDATE SET %1$I = d.%1$I + EXCLUDED.%1$I, updated_at = NOW()',
+        p_column
+    ) USING p_day, p_delta;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+REVOKE ALL ON FUNCTION public.bump_daily_stat(DATE, TEXT, INTEGER) FROM PUBLIC, anon, authenticated;
+
+CREATE OR REPLACE FUNCTION public.utc_day(p_at TIMESTAMP WITH TIME ZONE)
+RETURNS DATE AS $$
+    SELECT (COALESCE(p_at, NOW()) AT TIME ZONE 'UTC')::DATE;
+$$ LANGUAGE sql STABLE;
+
+-- 3. Triggers
+CREATE OR REPLACE FUNCTION public.daily_stats_on_profile()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM public.bump_daily_stat(public.utc_day(NEW.created_at), 'new_users', 1);
+    ELSE
+        PERFORM public.bump_daily_stat(public.utc_day(OLD.created_at), 'new_users', -1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+DROP TRIGGER IF EXISTS daily_stats_on_profile ON public.profiles;
+CREATE TRIGGER daily_stats_on_profile
+    AFTER INSERT OR DELETE ON public.profiles
+    FOR EACH ROW EXECUTE FUNCTION public.daily_stats_on_profile();
+
+CREATE OR REPLACE FUNCTION public.daily_stats_on_item()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM public.bump_daily_stat(public.utc_day(NEW.created_at), NEW.type || '_items', 1);
+        IF NEW.flagged THEN
+            PERFORM public.bump_daily_stat(public.utc_day(NEW.created_at), 'flagged_items', 1);
+        END IF;
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM public.bump_daily_stat(public.utc_day(OLD.created_at), OLD.type || '_items', -1);
+    ELSIF NEW.flagged AND NOT COALESCE(OLD.flagged, false) THEN
+        -- Flags are counted on the day they are raised
+        PERFORM public.bump_daily_stat(public.utc_day(NOW()), 'flagged_items', 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+DROP TRIGGER IF EXISTS daily_stats_on_item ON public.items;
+CREATE TRIGGER daily_stats_on_item
+    AFTER INSERT OR DELETE OR UPDATE OF flagged ON public.items
+    FOR EACH ROW EXECUTE FUNCTION public.daily_stats_on_item();
+
+-- Claims are counted on their creation day under their current status
+CREATE OR REPLACE FUNCTION public.daily_stats_on_claim()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM public.bump_daily_stat(public.utc_day(OLD.created_at), 'claims_' || OLD.status, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM public.bump_daily_stat(public.utc_day(NEW.created_at), 'claims_' || NEW.status, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+DROP TRIGGER IF EXISTS daily_stats_on_claim ON public.claim_requests;
+CREATE TRIGGER daily_stats_on_claim
+    AFTER INSERT OR DELETE ON public.claim_requests
+    FOR EACH ROW EXECUTE FUNCTION public.daily_stats_on_claim();
+
+DROP TRIGGER IF EXISTS daily_stats_on_claim_status ON public.claim_requests;
+CREATE TRIGGER daily_stats_on_claim_status
+    AFTER UPDATE OF status ON public.claim_requests
+    FOR EACH ROW
+    WHEN (OLD.status IS DISTINCT FROM NEW.status)
+    EXECUTE FUNCTION public.daily_stats_on_claim();
+
+-- 4. Rebuild a range of days from the raw tables
+CREATE OR REPLACE FUNCTION public.refresh_daily_stats(p_from DATE, p_to DATE)
+RETURNS INTEGER AS $$
+DECLARE
+    v_rows INTEGER;
+BEGIN
+    DELETE FROM public.daily_stats WHERE day BETWEEN p_from AND p_to;
+
+    -- One grouped pass per table over the range, instead of a count per day
+    INSERT INTO public.daily_stats (
+        day, new_users, lost_items, found_items,
+        claims_pending, claims_approved, claims_rejected, claims_completed, flagged_items
+    )
+    WITH days AS (
+        SELECT generate_series(p_from, p_to, INTERVAL '1 day')::DATE AS day
+    ),
+    users AS (
+        SELECT public.utc_day(created_at) AS day, count(*) AS total
+        FROM public.profiles
+        WHERE created_at >= p_from AND created_at < p_to + 1
+        GROUP BY 1
+    ),
+    new_items AS (
+        SELECT public.utc_day(created_at) AS day,
+               count(*) FILTER (WHERE type = 'lost') AS lost,
+               count(*) FILTER (WHERE type = 'found') AS found
+        FROM public.items
+        WHERE created_at >= p_from AND created_at < p_to + 1
+        GROUP BY 1
+    ),
+    claims AS (
+        SELECT public.utc_day(created_at) AS day,
+               count(*) FILTER (WHERE status = 'pending') AS pending,
+               count(*) FILTER (WHERE status = 'approved') AS approved,
+               count(*) FILTER (WHERE status = 'rejected') AS rejected,
+               count(*) FILTER (WHERE status = 'completed') AS completed
+        FROM public.claim_requests
+        WHERE created_at >= p_from AND created_at < p_to + 1
+        GROUP BY 1
+    ),
+    flags AS (
+        -- The flag time is not stored; the last moderation is the best approximation
+        SELECT public.utc_day(COALESCE(moderated_at, updated_at)) AS day, count(*) AS total
+        FROM public.items
+        WHERE flagged
+          AND COALESCE(moderated_at, updated_at) >= p_from
+          AND COALESCE(moderated_at, updated_at) < p_to + 1
+        GROUP BY 1
+    )
+    SELECT
+        d.day,
+        COALESCE(u.total, 0),
+        COALESCE(i.lost, 0),
+        COALESCE(i.found, 0),
+        COALESCE(c.pending, 0),
+        COALESCE(c.approved, 0),
+        COALESCE(c.rejected, 0),
+        COALESCE(c.completed, 0),
+        COALESCE(f.total, 0)
+    FROM days d
+    LEFT JOIN users u ON u.day = d.day
+    LEFT JOIN new_items i ON i.day = d.day
+    LEFT JOIN claims c ON c.day = d.day
+    LEFT JOIN flags f ON f.day = d.day;
+
+    GET DIAGNOSTICS v_rows = ROW_COUNT;
+    RETURN v_rows;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+REVOKE ALL ON FUNCTION public.refresh_daily_stats(DATE, DATE) FROM PUBLIC, anon, authenticated;
+
+-- 5. Currently flagged items, for the platform health block
+CREATE OR REPLACE FUNCTION public.admin_status_counts()
+RETURNS TABLE (source TEXT, status TEXT, total BIGINT) AS $$
+BEGIN
+    RETURN QUERY SELECT 'profiles'::TEXT, NULL::TEXT, count(*) FROM public.profiles;
+
+    RETURN QUERY
+        SELECT 'claim_requests'::TEXT, c.status::TEXT, count(*)
+        FROM public.claim_requests c
+        GROUP BY c.status;
+
+    IF to_regclass('public.items') IS NOT NULL THEN
+        RETURN QUERY
+            SELECT 'items'::TEXT, i.status::TEXT, count(*)
+            FROM public.items i
+            GROUP BY i.status;
+
+        RETURN QUERY
+            SELECT 'items_flagged'::TEXT, NULL::TEXT, count(*)
+            FROM public.items i
+            WHERE i.flagged;
+    END IF;
+
+    -- Legacy tables are optional, so they are queried dynamically
+    IF to_regclass('public.lost_items') IS NOT NULL THEN
+        RETURN QUERY EXECUTE
+            'SELECT ''lost_items''::TEXT, status::TEXT, count(*) FROM public.lost_items GROUP BY status';
+    END IF;
+
+    IF to_regclass('public.found_items') IS NOT NULL THEN
+        RETURN QUERY EXECUTE
+            'SELECT ''found_items''::TEXT, status::TEXT, count(*) FROM public.found_items GROUP BY status';
+    END IF;
+END;
+$$ LANGUAGE plpgsql STABLE SECURITY DEFINER;
+
+-- 6. Backfill the last year
+SELECT public.refresh_daily_stats(CURRENT_DATE - 365, CURRENT_DATE);
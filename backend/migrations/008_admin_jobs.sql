@@ -0,0 +1,31 @@
+-- Lost & Found Portal - Migration 008: background admin jobs
+--
+-- Large POST /api/admin/bulk-action batches run in the background. Their
+-- progress lives here rather than in the API process, so any worker can
+-- answer GET /api/admin/jobs/{id}.
+
+CREATE TABLE IF NOT EXISTS public.admin_jobs (
+    id UUID DEFAULT uuid_generate_v4() PRIMARY KEY,
+    admin_id UUID REFERENCES public.profiles(id) ON DELETE CASCADE NOT NULL,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued' CHECK (status IN ('queued', 'running', 'completed', 'failed')),
+    total INTEGER NOT NULL DEFAULT 0,
+    processed INTEGER NOT NULL DEFAULT 0,
+    succeeded INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    params JSONB DEFAULT '{}'::jsonb,
+    chunks JSONB DEFAULT '[]'::jsonb,
+    error TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_admin_jobs_admin_created
+    ON public.admin_jobs(admin_id, created_at DESC);
+
+ALTER TABLE public.admin_jobs ENABLE ROW LEVEL SECURITY;
+
+-- Per-item audit rows of bulk actions share a batch id in metadata
+CREATE INDEX IF NOT EXISTS idx_admin_actions_batch
+    ON public.admin_actions((metadata->>'batch_id'))
+    WHERE metadata ? 'batch_id';
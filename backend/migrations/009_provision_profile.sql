@@ -0,0 +1,35 @@
+-- Lost & Found Portal - Migration 009: profile provisioning at sign-up
+--
+-- POST /api/auth/register used to sleep a second (blocking the worker) for
+-- handle_new_user() and then read the profile back, inserting or updating it
+-- in further round trips. provision_profile() upserts the registration fields
+-- instead: it works whether or not the trigger already created the row, and
+-- it returns the profile in the same call.
+
+CREATE OR REPLACE FUNCTION public.provision_profile(
+    p_user_id UUID,
+    p_email TEXT,
+    p_first_name TEXT,
+    p_last_name TEXT,
+    p_is_admin BOOLEAN DEFAULT FALSE
+)
+RETURNS SETOF public.profiles AS $$
+    INSERT INTO public.profiles AS p (id, email, first_name, last_name, user_type, account_status, email_verified)
+    VALUES (
+        p_user_id,
+        p_email,
+        p_first_name,
+        p_last_name,
+        CASE WHEN p_is_admin THEN 'ADMIN' ELSE 'STUDENT' END,
+        'ACTIVE',
+        FALSE
+    )
+    ON CONFLICT (id) DO UPDATE SET
+        -- Keep anything the trigger (or an earlier attempt) already filled in
+        first_name = COALESCE(NULLIF(p.first_name, ''), EXCLUDED.first_name),
+        last_name = COALESCE(NULLIF(p.last_name, ''), EXCLUDED.last_name),
+        user_type = CASE WHEN p_is_admin THEN 'ADMIN' ELSE p.user_type END
+    RETURNING p.*;
+$$ LANGUAGE sql VOLATILE SECURITY DEFINER SET search_path = public;
+
+REVOKE ALL ON FUNCTION public.provision_profile(UUID, TEXT, TEXT, TEXT, BOOLEAN) FROM PUBLIC, anon, authenticated;
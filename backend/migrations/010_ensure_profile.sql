@@ -0,0 +1,32 @@
+-- Lost & Found Portal - Migration 010: profile lookup at login
+--
+-- POST /api/auth/login read the profile and, when handle_new_user() had not
+-- created one, inserted it in a second round trip. ensure_profile() does both
+-- in one call. Unlike provision_profile() (009) it never changes an existing
+-- row, so logging in cannot undo a role change made by an admin.
+
+CREATE OR REPLACE FUNCTION public.ensure_profile(
+    p_user_id UUID,
+    p_email TEXT,
+    p_first_name TEXT,
+    p_last_name TEXT,
+    p_is_admin BOOLEAN DEFAULT FALSE,
+    p_email_verified BOOLEAN DEFAULT FALSE
+)
+RETURNS SETOF public.profiles AS $$
+    INSERT INTO public.profiles (id, email, first_name, last_name, user_type, account_status, email_verified)
+    VALUES (
+        p_user_id,
+        p_email,
+        p_first_name,
+        p_last_name,
+        CASE WHEN p_is_admin THEN 'ADMIN' ELSE 'STUDENT' END,
+        'ACTIVE',
+        p_email_verified
+    )
+    ON CONFLICT (id) DO NOTHING;
+
+    SELECT * FROM public.profiles WHERE id = p_user_id;
+$$ LANGUAGE sql VOLATILE SECURITY DEFINER SET search_path = public;
+
+REVOKE ALL ON FUNCTION public.ensure_profile(UUID, TEXT, TEXT, TEXT, BOOLEAN, BOOLEAN) FROM PUBLIC, anon, authenticated;
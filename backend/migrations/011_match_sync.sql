@@ -0,0 +1,28 @@
+-- Lost & Found Portal - Migration 011: change feed for the matching index
+--
+-- Each API worker keeps an in-memory index of active items for
+-- GET /api/items/{id}/matches (matching.py). Every few seconds it reads the rows
+-- updated since its last sync, ordered by (updated_at, id), so the catch-up
+-- reads only recent changes. These indexes serve that query, and the triggers
+-- keep updated_at current on the legacy tables.
+
+CREATE INDEX IF NOT EXISTS idx_items_updated
+    ON public.items(updated_at, id);
+
+-- Fresh installs created from supabase_schema.sql have no legacy tables; skip there
+DO $$
+BEGIN
+    IF to_regclass('public.lost_items') IS NOT NULL THEN
+        CREATE INDEX IF NOT EXISTS idx_lost_items_updated ON public.lost_items(updated_at, id);
+        DROP TRIGGER IF EXISTS update_lost_items_updated_at ON public.lost_items;
+        CREATE TRIGGER update_lost_items_updated_at BEFORE UPDATE ON public.lost_items
+            FOR EACH ROW EXECUTE FUNCTION public.update_updated_at_column();
+    END IF;
+
+    IF to_regclass('public.found_items') IS NOT NULL THEN
+        CREATE INDEX IF NOT EXISTS idx_found_items_updated ON public.found_items(updated_at, id);
+        DROP TRIGGER IF EXISTS update_found_items_updated_at ON public.found_items;
+        CREATE TRIGGER update_found_items_updated_at BEFORE UPDATE ON public.found_items
+            FOR EACH ROW EXECUTE FUNCTION public.update_updated_at_column();
+    END IF;
+END $$;
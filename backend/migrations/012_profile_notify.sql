@@ -0,0 +1,19 @@
+-- Lost & Found Portal - Migration 012: NOTIFY on profile changes
+--
+-- Every API worker caches profiles (role, account status, names) for
+-- PROFILE_CACHE_TTL_SECONDS. A role change or ban used to clear the cache only
+-- in the worker that handled it. Workers started with DATABASE_URL LISTEN on
+-- "profile_changes" and drop the profile as soon as any writer changes it.
+
+CREATE OR REPLACE FUNCTION public.notify_profile_change()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify('profile_changes', OLD.id::text);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS notify_profile_change ON public.profiles;
+CREATE TRIGGER notify_profile_change
+    AFTER UPDATE OR DELETE ON public.profiles
+    FOR EACH ROW EXECUTE FUNCTION public.notify_profile_change();
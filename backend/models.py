@@ -29,6 +29,12 @@ class ItemStatus(str, Enum):
     CLAIMED = "claimed"
     RESOLVED = "resolved"
     ARCHIVED = "archived"
+    REJECTED = "rejected"
+    REMOVED = "removed"
+
+class ItemSort(str, Enum):
+    RECENT = "recent"
+    RELEVANCE = "relevance"  # Only meaningful together with search
 
 class ClaimStatus(str, Enum):
     PENDING = "pending"
@@ -111,6 +117,13 @@ class ItemUpdate(BaseModel):
     urgency: Optional[UrgencyLevel] = None
     status: Optional[ItemStatus] = None
 
+class ImageVariants(BaseModel):
+    """Downscaled copies generated at upload time"""
+    small_webp: str  # 320px wide
+    small_jpeg: str
+    medium_webp: str  # 800px wide
+    medium_jpeg: str
+
 class Item(ItemBase):
     id: str
     type: ItemType
@@ -123,6 +136,8 @@ class Item(ItemBase):
     
     # Frontend compatibility
     image: Optional[str] = None  # First image for display
+    thumbnail: Optional[str] = None  # 320px WebP of the first image for cards, else same as image
+    image_variants: Optional[ImageVariants] = None  # Only for images uploaded with variants
     
     # Computed fields
     owner_name: Optional[str] = None
@@ -160,6 +175,24 @@ class ItemListResponse(BaseModel):
     per_page: int
     has_next: bool
     has_prev: bool
+    next_cursor: Optional[str] = None  # Pass back as ?cursor= for the next page
+
+class ItemMatch(BaseModel):
+    """Opposite-type item that may be the same object"""
+    id: str
+    type: ItemType
+    title: str
+    category: str
+    location: str
+    thumbnail: Optional[str] = None
+    created_at: Optional[datetime] = None
+    score: float
+    matched_terms: List[str]  # Shared terms; "cat:" and "loc:" mark category and location
+
+class ItemMatchesResponse(BaseModel):
+    item_id: str
+    type: ItemType
+    matches: List[ItemMatch]
 
 class DashboardStats(BaseModel):
     total_items_posted: int
@@ -202,6 +235,7 @@ class ImageUploadResponse(BaseModel):
     url: str
     public_url: str
     path: str
+    variants: Optional[ImageVariants] = None
 
 # Messaging Models
 class MessageBase(BaseModel):
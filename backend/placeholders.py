@@ -0,0 +1,83 @@
+from typing import Tuple
+import hashlib
+import io
+import logging
+from PIL import Image, ImageDraw, ImageFont
+from config import settings
+from cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+PLACEHOLDER_BACKGROUND = '#f3f4f6'
+PLACEHOLDER_TEXT_COLOR = '#9ca3af'
+PLACEHOLDER_MEDIA_TYPES = {"png": "image/png", "svg": "image/svg+xml"}
+
+# Rendered at startup; 400x300 is what items without images point at
+COMMON_PLACEHOLDER_SIZES = [(400, 300), (300, 200), (320, 240), (800, 600)]
+
+# Placeholders never change for a given size, so entries only leave by LRU eviction
+placeholder_cache = TTLCache(maxsize=settings.placeholder_cache_size, ttl=float("inf"), name="placeholders")
+
+def clamp_placeholder_size(width: int, height: int) -> Tuple[int, int]:
+    """Limit size to prevent abuse"""
+    return min(max(width, 50), 1200), min(max(height, 50), 1200)
+
+def render_placeholder_png(width: int, height: int) -> bytes:
+    """Rasterise a grey box labelled with its size"""
+    img = Image.new('RGB', (width, height), color=PLACEHOLDER_BACKGROUND)
+    draw = ImageDraw.Draw(img)
+    
+    # Add text
+    text = f"{width}×{height}"
+    try:
+        # Try to use a default font
+        font = ImageFont.load_default()
+    except:
+        font = None
+    
+    # Calculate text position
+    if font:
+        bbox = draw.textbbox((0, 0), text, font=font)
+        text_width = bbox[2] - bbox[0]
+        text_height = bbox[3] - bbox[1]
+    else:
+        text_width = len(text) * 6
+        text_height = 11
+    
+    x = (width - text_width) // 2
+    y = (height - text_height) // 2
+    
+    draw.text((x, y), text, fill=PLACEHOLDER_TEXT_COLOR, font=font)
+    
+    # Save to bytes
+    img_bytes = io.BytesIO()
+    img.save(img_bytes, format='PNG')
+    return img_bytes.getvalue()
+
+def render_placeholder_svg(width: int, height: int) -> bytes:
+    """Same placeholder as markup; costs no rasterisation"""
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}">'
+        f'<rect width="100%" height="100%" fill="{PLACEHOLDER_BACKGROUND}"/>'
+        f'<text x="50%" y="50%" fill="{PLACEHOLDER_TEXT_COLOR}" font-family="sans-serif" font-size="12" '
+        f'text-anchor="middle" dominant-baseline="middle">{width}×{height}</text>'
+        f'</svg>'
+    ).encode()
+
+def get_placeholder(width: int, height: int, image_format: str = "png") -> Tuple[bytes, str]:
+    """Rendered placeholder body and its strong ETag, from the LRU when possible"""
+    key = (width, height, image_format)
+    entry = placeholder_cache.get(key)
+    if entry is None:
+        render = render_placeholder_svg if image_format == "svg" else render_placeholder_png
+        body = render(width, height)
+        entry = (body, f'"{hashlib.sha1(body).hexdigest()[:20]}"')
+        placeholder_cache.set(key, entry)
+    return entry
+
+def prerender_placeholders():
+    """Fill the cache with the sizes the API itself links to"""
+    for width, height in COMMON_PLACEHOLDER_SIZES:
+        for image_format in PLACEHOLDER_MEDIA_TYPES:
+            get_placeholder(width, height, image_format)
+    logger.info(f"Pre-rendered {len(placeholder_cache)} placeholders")
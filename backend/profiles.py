@@ -0,0 +1,99 @@
+from typing import Dict, Iterable, Optional
+import asyncio
+import logging
+from config import settings
+from cache import TTLCache
+from database import get_async_supabase_admin
+
+logger = logging.getLogger(__name__)
+
+# Fields used to show another user (names, email, avatar)
+PROFILE_SUMMARY_FIELDS = ("id", "first_name", "last_name", "full_name", "email", "avatar_url")
+
+# Display data keyed by user id, shared by every request in the process
+profile_summary_cache = TTLCache(
+    maxsize=settings.profile_cache_max_size,
+    ttl=settings.profile_summary_ttl_seconds,
+    name="profile_summaries"
+)
+
+def profile_summary(profile: dict) -> dict:
+    """Reduce a profiles row to the display fields"""
+    return {field: profile.get(field) for field in PROFILE_SUMMARY_FIELDS}
+
+def invalidate_profile_summary(user_id: str):
+    """Drop cached display data after a profile changes"""
+    profile_summary_cache.invalidate(user_id)
+
+class ProfileLoader:
+    """Request-scoped batch loader: load() calls made in the same tick share one in_() query"""
+    
+    def __init__(self):
+        self._futures: Dict[str, asyncio.Future] = {}
+        self._queue = []
+        self._dispatch_scheduled = False
+    
+    def prime(self, profile: dict):
+        """Seed the loader (and process cache) with a row the request already has"""
+        summary = profile_summary(profile)
+        profile_summary_cache.set(summary["id"], summary)
+        if summary["id"] not in self._futures:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(summary)
+            self._futures[summary["id"]] = future
+    
+    def load(self, user_id: str) -> "asyncio.Future":
+        """Future resolving to the user's display data, or None if there is no profile"""
+        future = self._futures.get(user_id)
+        if future is not None:
+            return future
+        
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._futures[user_id] = future
+        self._queue.append(user_id)
+        if not self._dispatch_scheduled:
+            self._dispatch_scheduled = True
+            loop.call_soon(lambda: asyncio.ensure_future(self._dispatch()))
+        return future
+    
+    async def load_many(self, user_ids: Iterable[str]) -> Dict[str, Optional[dict]]:
+        """Resolve several ids in one batch; returns {id: display data or None}"""
+        user_ids = list(dict.fromkeys(user_ids))
+        results = await asyncio.gather(*(self.load(user_id) for user_id in user_ids))
+        return dict(zip(user_ids, results))
+    
+    async def _dispatch(self):
+        batch, self._queue = self._queue, []
+        self._dispatch_scheduled = False
+        
+        missing = []
+        for user_id in batch:
+            summary = profile_summary_cache.get(user_id)
+            if summary is None:
+                missing.append(user_id)
+            else:
+                self._futures[user_id].set_result(summary)
+        
+        if not missing:
+            return
+        
+        try:
+            response = await get_async_supabase_admin().table("profiles").select("*").in_("id", missing).execute()
+        except Exception as e:
+            logger.error(f"Profile batch load failed: {e}")
+            for user_id in missing:
+                # Let a later load() in the same request retry
+                self._futures.pop(user_id).set_exception(e)
+            return
+        
+        found = {}
+        for row in response.data or []:
+            found[row["id"]] = profile_summary(row)
+            profile_summary_cache.set(row["id"], found[row["id"]])
+        for user_id in missing:
+            self._futures[user_id].set_result(found.get(user_id))
+
+def get_profile_loader() -> ProfileLoader:
+    """FastAPI dependency: one loader per request"""
+    return ProfileLoader()
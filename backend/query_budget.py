@@ -0,0 +1,140 @@
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Union
+import json
+import logging
+import time
+import httpx
+from metrics import observe_supabase_call
+
+logger = logging.getLogger(__name__)
+
+class QueryTrace:
+    """Backend calls made while handling one request, by kind"""
+    
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.calls: Dict[str, List[float]] = {}
+    
+    def record(self, kind: str, seconds: float):
+        entry = self.calls.setdefault(kind, [0, 0.0])
+        entry[0] += 1
+        entry[1] += seconds
+    
+    @property
+    def count(self) -> int:
+        return sum(int(count) for count, _ in self.calls.values())
+    
+    def server_timing(self) -> str:
+        """Server-Timing value: one metric per call kind plus the whole request"""
+        metrics = [
+            f'{kind};desc="{int(count)} call{"" if count == 1 else "s"}";dur={seconds * 1000:.1f}'
+            for kind, (count, seconds) in sorted(self.calls.items())
+        ]
+        metrics.append(f"app;dur={(time.perf_counter() - self.started) * 1000:.1f}")
+        return ", ".join(metrics)
+
+current_trace: ContextVar[Optional[QueryTrace]] = ContextVar("current_trace", default=None)
+
+def call_kind(path: str) -> str:
+    if path.startswith("/rest/v1/rpc/"):
+        return "rpc"
+    if path.startswith("/rest/v1/"):
+        return "db"
+    if path.startswith("/auth/"):
+        return "auth"
+    if path.startswith("/storage/"):
+        return "storage"
+    return "http"
+
+class CountingTransport(httpx.AsyncBaseTransport):
+    """Wraps the shared Supabase transport so every execute()/rpc() (and auth/storage call) lands in the current trace and /metrics"""
+    
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self.transport = transport
+    
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        try:
+            return await self.transport.handle_async_request(request)
+        finally:
+            elapsed = time.perf_counter() - started
+            observe_supabase_call(request.method, request.url.path, elapsed)
+            trace = current_trace.get()
+            if trace is not None:
+                trace.record(call_kind(request.url.path), elapsed)
+    
+    async def aclose(self):
+        await self.transport.aclose()
+
+def query_budget(limit: Union[int, Callable[[], int]]):
+    """Declare the most backend calls an endpoint may make per request (checked by QueryBudgetMiddleware); a callable is read per request"""
+    def mark(endpoint):
+        endpoint.query_budget = limit
+        return endpoint
+    return mark
+
+class QueryBudgetMiddleware:
+    """
+    Traces backend calls per request, adds a Server-Timing header and checks
+    declared budgets: mode "warn" logs overruns, "enforce" (for tests and load
+    runs) turns them into 500 responses, "off" skips the check.
+    """
+    
+    def __init__(self, app, mode: str = "warn", server_timing: bool = True):
+        self.app = app
+        self.mode = mode
+        self.server_timing = server_timing
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        trace = QueryTrace()
+        token = current_trace.set(trace)
+        overrun = False
+        
+        async def send_with_trace(message):
+            nonlocal overrun
+            if message["type"] == "http.response.start":
+                error = self.check_budget(scope, trace)
+                if error and self.mode == "enforce":
+                    overrun = True
+                    body = json.dumps({"detail": error}).encode()
+                    await send({
+                        "type": "http.response.start",
+                        "status": 500,
+                        "headers": self.headers(trace, [
+                            (b"content-type", b"application/json"),
+                            (b"content-length", str(len(body)).encode())
+                        ])
+                    })
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                message["headers"] = self.headers(trace, list(message.get("headers", [])))
+            elif overrun:
+                return
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_with_trace)
+        finally:
+            current_trace.reset(token)
+    
+    def headers(self, trace: QueryTrace, headers: list) -> list:
+        if self.server_timing:
+            headers.append((b"server-timing", trace.server_timing().encode()))
+        return headers
+    
+    def check_budget(self, scope, trace: QueryTrace) -> Optional[str]:
+        if self.mode == "off":
+            return None
+        limit = getattr(scope.get("endpoint"), "query_budget", None)
+        if callable(limit):
+            limit = limit()
+        if limit is None or trace.count <= limit:
+            return None
+        route = getattr(scope.get("route"), "path", scope["path"])
+        error = f"Query budget exceeded: {scope['method']} {route} made {trace.count} backend calls (budget {limit})"
+        logger.warning(f"{error}: {trace.server_timing()}")
+        return error
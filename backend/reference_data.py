@@ -0,0 +1,90 @@
+from typing import Dict, List, Optional
+import asyncio
+import logging
+import time
+from config import settings
+from database import get_async_supabase_admin
+from query_budget import current_trace
+
+logger = logging.getLogger(__name__)
+
+class ReferenceDataCache:
+    """Process-wide id<->name maps for the categories and locations tables"""
+    
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.categories: Dict[str, str] = {}  # id -> name
+        self.locations: Dict[str, str] = {}  # id -> name
+        self.category_ids: Dict[str, str] = {}  # lowercase name -> id
+        self.location_ids: Dict[str, str] = {}  # lowercase name -> id
+        self.loaded_at = 0.0
+        self.loaded = False
+        self._reload: Optional[asyncio.Task] = None
+    
+    @property
+    def stale(self) -> bool:
+        return time.monotonic() - self.loaded_at > self.ttl
+    
+    async def load(self):
+        """Reload both tables (two queries)"""
+        supabase = get_async_supabase_admin()
+        categories_response = await supabase.table("categories").select("id, name").execute()
+        locations_response = await supabase.table("locations").select("id, name").execute()
+        
+        self.categories = {row["id"]: row["name"] for row in categories_response.data or []}
+        self.locations = {row["id"]: row["name"] for row in locations_response.data or []}
+        self.category_ids = {name.lower(): row_id for row_id, name in self.categories.items()}
+        self.location_ids = {name.lower(): row_id for row_id, name in self.locations.items()}
+        self.loaded_at = time.monotonic()
+        self.loaded = True
+        logger.info(f"Reference data loaded: {len(self.categories)} categories, {len(self.locations)} locations")
+    
+    async def _reload_untraced(self):
+        """load() outside the request trace: the reload serves the whole process, not the request that noticed it"""
+        current_trace.set(None)
+        try:
+            await self.load()
+        except Exception as e:
+            logger.error(f"Reference data reload failed: {e}")
+    
+    async def ensure_fresh(self):
+        """Once the TTL has passed, reload in the background and keep serving the current maps; only a cold cache waits"""
+        if not self.stale:
+            return
+        if self._reload is None or self._reload.done():
+            self._reload = asyncio.create_task(self._reload_untraced())
+        if not self.loaded:
+            # Shielded so a cancelled request does not cancel the reload other callers share
+            await asyncio.shield(self._reload)
+            if not self.loaded:
+                raise RuntimeError("Reference data is not available")
+    
+    async def category_id(self, name: str) -> Optional[str]:
+        await self.ensure_fresh()
+        return self.category_ids.get(name.lower())
+    
+    async def location_id(self, name: str) -> Optional[str]:
+        await self.ensure_fresh()
+        return self.location_ids.get(name.lower())
+    
+    async def location_ids_matching(self, text: str) -> List[str]:
+        """In-memory equivalent of locations.name ILIKE '%text%'"""
+        await self.ensure_fresh()
+        needle = text.lower()
+        return [row_id for name, row_id in self.location_ids.items() if needle in name]
+    
+    def add_category(self, row: dict):
+        self.categories[row["id"]] = row["name"]
+        self.category_ids[row["name"].lower()] = row["id"]
+    
+    def add_location(self, row: dict):
+        """Record a newly inserted location without waiting for the next reload"""
+        self.locations[row["id"]] = row["name"]
+        self.location_ids[row["name"].lower()] = row["id"]
+    
+    def invalidate(self):
+        """Reload on next access, serving the current maps until it finishes"""
+        self.loaded_at = 0.0
+
+# Global instance
+reference_data = ReferenceDataCache(ttl=settings.reference_cache_ttl_seconds)
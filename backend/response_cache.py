@@ -0,0 +1,60 @@
+from typing import Hashable, Optional, Tuple
+import hashlib
+from config import settings
+from cache import TTLCache
+
+class ResponseCache:
+    """Serialised public item responses with their ETags, dropped when items are written"""
+    
+    def __init__(self, maxsize: int, list_ttl: float, item_ttl: float):
+        # Any write can change any listing, so lists are cleared wholesale;
+        # single items are dropped by id
+        self.lists = TTLCache(maxsize=maxsize, ttl=list_ttl, name="response_lists")
+        self.items = TTLCache(maxsize=maxsize, ttl=item_ttl, name="response_items")
+        self.invalidations = 0
+    
+    def _store(self, key: Hashable) -> TTLCache:
+        return self.items if key[0] == "item" else self.lists
+    
+    def get(self, key: Hashable) -> Optional[Tuple[bytes, str]]:
+        """(body, etag) for a key built by list_key()/item_key(), or None"""
+        return self._store(key).get(key)
+    
+    def set(self, key: Hashable, body: bytes) -> Tuple[bytes, str]:
+        entry = (body, f'"{hashlib.sha1(body).hexdigest()[:20]}"')
+        self._store(key).set(key, entry)
+        return entry
+    
+    def invalidate_item(self, item_id: Optional[str] = None):
+        """Forget one item (or all of them) and every listing"""
+        if item_id is None:
+            self.items.clear()
+        else:
+            self.items.invalidate(self.item_key(item_id))
+        self.lists.clear()
+        self.invalidations += 1
+    
+    @staticmethod
+    def list_key(**params) -> tuple:
+        """Order-independent key; None/empty parameters are left out"""
+        return ("items", settings.items_source) + tuple(
+            sorted((name, value) for name, value in params.items() if value not in (None, ""))
+        )
+    
+    @staticmethod
+    def item_key(item_id: str) -> tuple:
+        return ("item", settings.items_source, item_id)
+    
+    def stats(self) -> dict:
+        return {
+            "lists": self.lists.stats(),
+            "items": self.items.stats(),
+            "invalidations": self.invalidations
+        }
+
+# Global instance
+response_cache = ResponseCache(
+    maxsize=settings.response_cache_size,
+    list_ttl=settings.response_cache_list_ttl_seconds,
+    item_ttl=settings.response_cache_item_ttl_seconds
+)
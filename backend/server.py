@@ -1,22 +1,45 @@
-from fastapi import FastAPI, APIRouter, Depends, HTTPException, status, UploadFile, File, Query
+from fastapi import FastAPI, APIRouter, Depends, HTTPException, status, UploadFile, File, Query, Request, WebSocket
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List, Optional
+from typing import List, Optional, Literal
 import logging
 from pathlib import Path
+from urllib.parse import quote
 import uuid
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 import os
 import aiofiles
-from PIL import Image, ImageDraw, ImageFont
-import io
 import time
+import base64
+import heapq
+import itertools
+import asyncio
+import json
+import re
 from pydantic import BaseModel
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse, JSONResponse
+from starlette.concurrency import run_in_threadpool
 
 # Import our custom modules
 from config import settings
-from database import get_supabase, get_supabase_admin
+from cache import TTLCache
+from database import get_supabase, get_async_supabase, get_async_supabase_admin, supabase_client, or_filter
+from auth import verify_access_token, get_profile, invalidate_profile, profile_cache, sign_in_with_password, sign_up, AuthRequestError
+from profiles import ProfileLoader, get_profile_loader
+from placeholders import (
+    placeholder_cache, get_placeholder, prerender_placeholders, clamp_placeholder_size, PLACEHOLDER_MEDIA_TYPES
+)
+from http_cache import etag_matches, file_response, IMMUTABLE_CACHE_CONTROL
+from conversation_hub import conversation_hub, start_bridge, stop_bridge, PROFILE_NOTIFY_CHANNEL
+from image_processing import (
+    image_pool, process_image, image_variant_urls, variant_filename, variant_content_type,
+    ORIGINAL_IMAGE_STEM, InvalidImageError, ImagePoolSaturated
+)
+from reference_data import reference_data
+from response_cache import response_cache
+from query_budget import QueryBudgetMiddleware, query_budget
+from metrics import MetricsMiddleware, UPLOAD_BYTES, render as render_metrics
+from matching import MatchIndex, MatchDocument
 from models import *
 
 # API Configuration
@@ -51,6 +74,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Counts backend calls per request for the Server-Timing header and @query_budget checks
+app.add_middleware(
+    QueryBudgetMiddleware,
+    mode=settings.query_budget_mode,
+    server_timing=settings.server_timing_enabled
+)
+
+# Outermost, so the latency histogram covers the other middleware too
+app.add_middleware(MetricsMiddleware)
+
 # Helper function to get full name
 def get_full_name(user_data):
     """Get full name from user data"""
@@ -78,34 +111,218 @@ def get_full_name_from_profile(profile_data):
     else:
         return "Unknown"
 
+PLACEHOLDER_IMAGE_URL = f"{API_BASE_URL}/placeholder/400x300?format=svg"
+
+def item_image_fields(images, placeholder=PLACEHOLDER_IMAGE_URL):
+    """image/thumbnail/image_variants for an item's image list"""
+    first_image = images[0] if images else None
+    variants = image_variant_urls(first_image)
+    return {
+        "image": first_image or placeholder,
+        "thumbnail": variants["small_webp"] if variants else first_image or placeholder,
+        "image_variants": variants
+    }
+
+def lost_item_to_unified(item_data):
+    """Convert a lost_items row (with joined names) to the unified Item shape"""
+    return {
+        "id": item_data["id"],
+        "type": "lost",
+        "user_id": item_data["user_id"],
+        "title": item_data["title"],
+        "description": item_data["description"],
+        "category": item_data["categories"]["name"].lower() if item_data.get("categories") else "other",
+        "location": item_data["locations"]["name"] if item_data.get("locations") else "Unknown",
+        "images": item_data.get("images", []) or [],
+        **item_image_fields(item_data.get("images")),
+        "reward": item_data.get("reward_amount", 0) or 0,
+        "urgency": item_data.get("urgency", "medium").lower(),
+        "date_lost": item_data.get("date_lost"),
+        "time_lost": item_data.get("time_lost"),
+        "contact_preference": item_data.get("contact_method", "email").lower(),
+        "status": item_data.get("status", "active").lower(),
+        "created_at": item_data["created_at"],
+        "updated_at": item_data["updated_at"],
+        "owner_name": get_full_name_from_profile(item_data.get("profiles")),
+        "owner_email": item_data["profiles"]["email"] if item_data.get("profiles") else "Unknown"
+    }
+
+def found_item_to_unified(item_data):
+    """Convert a found_items row (with joined names) to the unified Item shape"""
+    return {
+        "id": item_data["id"],
+        "type": "found",
+        "user_id": item_data["user_id"],
+        "title": item_data["title"],
+        "description": item_data["description"],
+        "category": item_data["categories"]["name"].lower() if item_data.get("categories") else "other",
+        "location": item_data["locations"]["name"] if item_data.get("locations") else "Unknown",
+        "images": item_data.get("images", []) or [],
+        **item_image_fields(item_data.get("images")),
+        "reward": 0,  # Found items don't have rewards
+        "urgency": "medium",  # Default urgency for found items
+        "date_lost": item_data.get("date_found"),  # Use date_found as date_lost for consistency
+        "time_lost": item_data.get("time_found"),
+        "contact_preference": item_data.get("contact_method", "email").lower(),
+        "status": "active" if item_data.get("status", "available").lower() == "available" else item_data.get("status", "active").lower(),
+        "created_at": item_data["created_at"],
+        "updated_at": item_data["updated_at"],
+        "owner_name": get_full_name_from_profile(item_data.get("profiles")),
+        "owner_email": item_data["profiles"]["email"] if item_data.get("profiles") else "Unknown"
+    }
+
+# Item storage
+# ITEMS_SOURCE=legacy reads and writes lost_items/found_items (mirrored into
+# public.items once migrations/001_unified_items.sql is applied). After
+# backfill_items.py has run, ITEMS_SOURCE=unified serves every endpoint from
+# public.items with a single query per lookup or listing.
+LEGACY_ITEM_TABLES = {"lost": "lost_items", "found": "found_items"}
+
+ITEM_SELECT = """
+    *,
+    profiles!items_user_id_fkey(first_name, last_name, email)
+"""
+
+def unified_items_enabled():
+    """Whether endpoints read and write the single public.items table"""
+    return settings.items_source == "unified"
+
+def item_row_to_unified(item_data):
+    """Convert a public.items row (with joined owner profile) to the unified Item shape"""
+    images = item_data.get("images") or []
+    return {
+        "id": item_data["id"],
+        "type": item_data["type"],
+        "user_id": item_data["user_id"],
+        "title": item_data["title"],
+        "description": item_data["description"],
+        "category": item_data.get("category") or "other",
+        "location": item_data.get("location") or "Unknown",
+        "images": images,
+        **item_image_fields(images),
+        "reward": int(float(item_data.get("reward") or 0)),
+        "urgency": item_data.get("urgency") or "medium",
+        "date_lost": item_data.get("date_lost") or item_data.get("date_found"),
+        "time_lost": item_data.get("time_lost") or item_data.get("time_found"),
+        "contact_preference": item_data.get("contact_preference") or "email",
+        "status": item_data.get("status") or "active",
+        "created_at": item_data["created_at"],
+        "updated_at": item_data["updated_at"],
+        "owner_name": get_full_name_from_profile(item_data.get("profiles")),
+        "owner_email": item_data["profiles"]["email"] if item_data.get("profiles") else "Unknown"
+    }
+
+async def fetch_item_row(supabase, item_id, columns="*"):
+    """Look up an item by id; returns (row with "type" set, table name) or (None, None)"""
+    if unified_items_enabled():
+        response = await supabase.table("items").select(columns).eq("id", item_id).execute()
+        return (response.data[0], "items") if response.data else (None, None)
+    
+    for item_type, table_name in LEGACY_ITEM_TABLES.items():
+        response = await supabase.table(table_name).select(columns).eq("id", item_id).execute()
+        if response.data:
+            item = response.data[0]
+            item["type"] = item_type
+            return item, table_name
+    return None, None
+
+async def fetch_item_rows(supabase, item_ids, columns="*"):
+    """Bulk version of fetch_item_row: {id: row with "type" set}, one query per item table"""
+    if not item_ids:
+        return {}
+    
+    item_ids = list(set(item_ids))
+    if unified_items_enabled():
+        response = await supabase.table("items").select(columns).in_("id", item_ids).execute()
+        return {item["id"]: item for item in response.data or []}
+    
+    items = {}
+    for item_type, table_name in LEGACY_ITEM_TABLES.items():
+        response = await supabase.table(table_name).select(columns).in_("id", item_ids).execute()
+        for item in response.data or []:
+            item["type"] = item_type
+            items[item["id"]] = item
+    return items
+
+# Keyset pagination helpers
+def encode_cursor(item_data):
+    """Build an opaque cursor pointing just past the given row"""
+    raw = json.dumps([item_data["created_at"], item_data["id"]]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor):
+    """Decode a cursor into its (created_at, id) pair"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, item_id = json.loads(base64.urlsafe_b64decode(padded))
+        # Both values end up inside the or=(...) filter, so only accept well-formed ones
+        return datetime.fromisoformat(created_at).isoformat(), str(uuid.UUID(item_id))
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+def item_sort_key(item_data):
+    """Newest-first ordering key shared by the database and the in-memory merge"""
+    return (datetime.fromisoformat(item_data["created_at"]), item_data["id"])
+
+def apply_keyset(query, after, limit):
+    """Order by (created_at, id) descending, start after the cursor and cap the row count"""
+    if after:
+        created_at, item_id = after
+        query = or_filter(query, f'created_at.lt."{created_at}",and(created_at.eq."{created_at}",id.lt.{item_id})')
+    # Single order param so both keys survive regardless of client-side order() merging
+    return query.order("created_at.desc,id", desc=True).limit(limit)
+
+# Full-text search helpers (migrations/002_item_search.sql)
+SEARCH_TEXT_CONFIG = "english"
+MAX_SEARCH_TERMS = 8
+
+def build_search_query(search):
+    """Turn free text into a prefix-matching tsquery ('black:* & wall:*'), or None"""
+    terms = re.findall(r"\w+", search.lower())[:MAX_SEARCH_TERMS]
+    if not terms:
+        return None
+    return " & ".join(f"{term}:*" for term in terms)
+
+def full_text_search_enabled():
+    """Whether the search_vector columns from migrations/002_item_search.sql are in use"""
+    if settings.item_search == "auto":
+        return unified_items_enabled()
+    return settings.item_search == "fts"
+
+def apply_search(query, search, tsquery):
+    """Filter on the indexed search_vector column, or with ILIKE where migration 002 is not applied"""
+    if full_text_search_enabled():
+        return query.filter("search_vector", f"fts({SEARCH_TEXT_CONFIG})", tsquery)
+    # Quoted so commas and parentheses in the text cannot break out of or=(...)
+    pattern = search.replace("\\", "\\\\").replace('"', '\\"')
+    return or_filter(query, f'title.ilike."%{pattern}%",description.ilike."%{pattern}%"')
+
 # Authentication dependency
+async def authenticate_token(token: str):
+    """Resolve an access token to the caller's profile (HTTP and WebSocket auth)"""
+    # Verify token signature and expiry without a network round trip
+    claims = await verify_access_token(token)
+    
+    # Get user profile (cached per user id)
+    profile_data = await get_profile(claims["sub"])
+    if not profile_data:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User profile not found"
+        )
+    
+    # Add email to profile data
+    profile_data["email"] = claims.get("email")
+    
+    return profile_data
+
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    """Get current authenticated user from Supabase JWT"""
+    """Get current authenticated user from Supabase JWT (verified locally, profile cached)"""
     try:
-        supabase = get_supabase()
-        supabase_admin = get_supabase_admin()  # Use admin client for profile access
-        
-        # Get user from token
-        user = supabase.auth.get_user(credentials.credentials)
-        if not user or not user.user:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid authentication credentials"
-            )
-        
-        # Get user profile using admin client
-        profile_response = supabase_admin.table("profiles").select("*").eq("id", user.user.id).execute()
-        if not profile_response.data:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User profile not found"
-            )
-        
-        profile_data = profile_response.data[0]
-        # Add email to profile data
-        profile_data["email"] = user.user.email
-        
-        return profile_data
+        return await authenticate_token(credentials.credentials)
     except Exception as e:
         logger.error(f"Authentication error: {str(e)}")
         raise HTTPException(
@@ -127,6 +344,22 @@ async def health_check():
     """Health check endpoint"""
     return {"status": "healthy", "timestamp": datetime.utcnow()}
 
+# Set once every startup hook has run, cleared as soon as shutdown begins
+readiness = {"ready": False}
+
+@api_router.get("/ready")
+async def readiness_check():
+    """Readiness probe: 503 while this worker is starting up or draining"""
+    if not readiness["ready"]:
+        return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content={"status": "unavailable"})
+    return {"status": "ready", "pid": os.getpid()}
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint; nginx only proxies /api, so it is reachable on the API port only"""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
 class RegisterRequest(BaseModel):
     email: str
     password: str
@@ -138,8 +371,6 @@ class RegisterRequest(BaseModel):
 async def register(request: RegisterRequest):
     """Register a new user"""
     try:
-        supabase = get_supabase()
-        
         # Check if email is university email (basic validation)
         if not request.email.endswith('@umt.edu'):
             raise HTTPException(
@@ -147,75 +378,37 @@ async def register(request: RegisterRequest):
                 detail="Please use your university email address"
             )
         
-        # Create user in Supabase Auth
-        auth_response = supabase.auth.sign_up({
-            "email": request.email,
-            "password": request.password,
-            "options": {
-                "data": {
-                    "full_name": request.full_name,
-                    "is_admin": request.is_admin
-                }
-            }
+        # Create user in Supabase Auth (stateless call, safe to run concurrently)
+        signup_response = await sign_up(request.email, request.password, {
+            "full_name": request.full_name,
+            "is_admin": request.is_admin
         })
+        # A session wraps the user when email confirmation is off
+        auth_user = signup_response.get("user") or signup_response
         
-        if auth_response.user is None:
+        if not auth_user.get("id"):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Registration failed. Please check your email and try again."
             )
         
-        # Create profile manually if needed
-        user_id = auth_response.user.id
+        user_id = auth_user["id"]
         
-        # Wait for trigger to complete and check if profile exists
-        time.sleep(1.0)  # Increased wait time
-        
-        # Use admin client to create profile
-        supabase_admin = get_supabase_admin()
-        profile_response = supabase_admin.table("profiles").select("*").eq("id", user_id).execute()
-        
-        if not profile_response.data:
-            # Profile not created by trigger, create manually
-            # Split full name into first and last name
-            name_parts = request.full_name.strip().split()
-            first_name = name_parts[0] if name_parts else "User"
-            last_name = " ".join(name_parts[1:]) if len(name_parts) > 1 else ""
-            
-            profile_data = {
-                "id": user_id,
-                "first_name": first_name,
-                "last_name": last_name,
-                "user_type": "ADMIN" if request.is_admin else "STUDENT",
-                "account_status": "ACTIVE",
-                "email_verified": False
-            }
-            
-            try:
-                create_response = supabase_admin.table("profiles").insert(profile_data).execute()
-                if create_response.data:
-                    logger.info(f"Profile created manually for user {user_id} with admin status: {request.is_admin}")
-                else:
-                    logger.error(f"Failed to create profile for user {user_id}")
-            except Exception as e:
-                logger.error(f"Failed to create profile: {e}")
-                # Continue anyway as user is created in auth
-        else:
-            # Update existing profile with admin status if needed
-            if request.is_admin:
-                try:
-                    supabase_admin.table("profiles").update({
-                        "user_type": "ADMIN"
-                    }).eq("id", user_id).execute()
-                    logger.info(f"Updated profile to admin for user {user_id}")
-                except Exception as e:
-                    logger.error(f"Failed to update profile to admin: {e}")
-        
-        # Sign out the user to ensure clean state for login
+        # One upsert whether or not the signup trigger already created the profile (migrations/009)
+        name_parts = request.full_name.strip().split()
+        supabase_admin = get_async_supabase_admin()
         try:
-            supabase.auth.sign_out()
+            await supabase_admin.rpc("provision_profile", {
+                "p_user_id": user_id,
+                "p_email": request.email,
+                "p_first_name": name_parts[0] if name_parts else "User",
+                "p_last_name": " ".join(name_parts[1:]),
+                "p_is_admin": bool(request.is_admin)
+            }).execute()
+            invalidate_profile(user_id)
         except Exception as e:
-            logger.warning(f"Failed to sign out after registration: {e}")
+            logger.error(f"Failed to provision profile for user {user_id}: {e}")
+            # Continue anyway as user is created in auth
         
         # Return success response
         return {
@@ -224,7 +417,7 @@ async def register(request: RegisterRequest):
             "user_id": user_id,
             "email": request.email,
             "is_admin": request.is_admin,
-            "requires_confirmation": auth_response.session is None
+            "requires_confirmation": "access_token" not in signup_response
         }
         
     except HTTPException:
@@ -240,71 +433,50 @@ async def register(request: RegisterRequest):
 async def login(request: LoginRequest):
     """Login user"""
     try:
-        supabase = get_supabase()
-        supabase_admin = get_supabase_admin()  # Use admin client for profile access
-        
-        # Clear any existing session first
+        # Password grant over the shared pool: no client session, so logins run concurrently
         try:
-            supabase.auth.sign_out()
-        except Exception as e:
-            logger.debug(f"No existing session to clear: {e}")
-        
-        # Attempt login
-        auth_response = supabase.auth.sign_in_with_password({
-            "email": request.email,
-            "password": request.password
-        })
-        
-        if auth_response.user is None or auth_response.session is None:
+            session = await sign_in_with_password(request.email, request.password)
+        except AuthRequestError as e:
+            if e.status_code >= 500:
+                raise
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid email or password. Please check your credentials and try again."
             )
         
-        # Get user profile using admin client
-        profile_response = supabase_admin.table("profiles").select("*").eq("id", auth_response.user.id).execute()
+        auth_user = session["user"]
+        metadata = auth_user.get("user_metadata") or {}
+        name_parts = (metadata.get("full_name") or "User").strip().split()
+        
+        # Profile read, created first if the signup trigger never did, in one round trip (migrations/010)
+        supabase_admin = get_async_supabase_admin()
+        profile_response = await supabase_admin.rpc("ensure_profile", {
+            "p_user_id": auth_user["id"],
+            "p_email": auth_user["email"],
+            "p_first_name": name_parts[0] if name_parts else "User",
+            "p_last_name": " ".join(name_parts[1:]),
+            "p_is_admin": bool(metadata.get("is_admin", False)),
+            "p_email_verified": auth_user.get("email_confirmed_at") is not None
+        }).execute()
         
         if not profile_response.data:
-            # Profile doesn't exist, create it
-            # Split full name from user metadata
-            full_name = auth_response.user.user_metadata.get("full_name", "User")
-            name_parts = full_name.strip().split()
-            first_name = name_parts[0] if name_parts else "User"
-            last_name = " ".join(name_parts[1:]) if len(name_parts) > 1 else ""
-            is_admin = auth_response.user.user_metadata.get("is_admin", False)
-            
-            profile_data = {
-                "id": auth_response.user.id,
-                "first_name": first_name,
-                "last_name": last_name,
-                "user_type": "ADMIN" if is_admin else "STUDENT",
-                "account_status": "ACTIVE",
-                "email_verified": auth_response.user.email_confirmed_at is not None
-            }
-            
-            create_response = supabase_admin.table("profiles").insert(profile_data).execute()
-            if create_response.data:
-                profile_data = create_response.data[0]
-                logger.info(f"Created missing profile for user {auth_response.user.id}")
-            else:
-                logger.error(f"Failed to create profile for user {auth_response.user.id}")
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail="Failed to create user profile. Please contact support."
-                )
-        else:
-            profile_data = profile_response.data[0]
+            logger.error(f"Failed to create profile for user {auth_user['id']}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to create user profile. Please contact support."
+            )
+        profile_data = profile_response.data[0]
         
         # Add email to profile data for the response
-        profile_data["email"] = auth_response.user.email
+        profile_data["email"] = auth_user["email"]
         
         # Determine if user is admin based on user_type
         profile_data["is_admin"] = profile_data.get("user_type") == "ADMIN"
         
-        logger.info(f"User {auth_response.user.email} logged in successfully (Admin: {profile_data['is_admin']})")
+        logger.info(f"User {auth_user['email']} logged in successfully (Admin: {profile_data['is_admin']})")
         
         return LoginResponse(
-            access_token=auth_response.session.access_token,
+            access_token=session["access_token"],
             user=UserProfile(**profile_data)
         )
         
@@ -323,8 +495,29 @@ async def get_current_user_profile(current_user = Depends(get_current_user)):
     return UserProfile(**current_user)
 
 # Items endpoints
+# Public reads are the same for every caller, so whole responses are cached;
+# clients revalidate with If-None-Match on every use
+PUBLIC_READ_CACHE_CONTROL = "public, no-cache"
+
+async def cached_json_response(request: Request, key, load):
+    """Serve a response_cache entry (filling it from load() on a miss) with an ETag and 304s"""
+    entry = response_cache.get(key)
+    cache_status = "HIT"
+    if entry is None:
+        model = await load()
+        entry = response_cache.set(key, model.model_dump_json().encode())
+        cache_status = "MISS"
+    
+    body, etag = entry
+    headers = {"ETag": etag, "Cache-Control": PUBLIC_READ_CACHE_CONTROL, "X-Cache": cache_status}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
 @api_router.get("/items", response_model=ItemListResponse)
+@query_budget(2)
 async def get_items(
+    request: Request,
     type: Optional[ItemType] = Query(None, description="Filter by item type"),
     category: Optional[ItemCategory] = Query(None, description="Filter by category"),
     location: Optional[str] = Query(None, description="Filter by location"),
@@ -332,34 +525,109 @@ async def get_items(
     search: Optional[str] = Query(None, description="Search in title and description"),
     has_reward: Optional[bool] = Query(None, description="Filter items with rewards"),
     page: int = Query(1, ge=1, description="Page number"),
-    per_page: int = Query(12, ge=1, le=50, description="Items per page")
+    per_page: int = Query(12, ge=1, le=50, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    sort: ItemSort = Query(ItemSort.RECENT, description="recent, or relevance when searching")
 ):
-    """Get list of items from both lost_items and found_items tables with filtering and pagination"""
+    """Get list of items, served from the response cache when the same query was seen recently"""
+    # Both filters are case-insensitive, so differently typed queries share an entry
+    location = location.strip().lower() or None if location else None
+    search = " ".join(search.split()).lower() or None if search else None
+    
+    key = response_cache.list_key(
+        type=type.value if type else None,
+        category=category.value if category else None,
+        location=location,
+        urgency=urgency.value if urgency else None,
+        search=search,
+        has_reward=has_reward,
+        page=page,
+        per_page=per_page,
+        cursor=cursor,
+        sort=sort.value
+    )
+    return await cached_json_response(request, key, lambda: load_items_page(
+        type, category, location, urgency, search, has_reward, page, per_page, cursor, sort
+    ))
+
+async def load_items_page(type, category, location, urgency, search, has_reward, page, per_page, cursor, sort):
+    """Get list of items from both lost_items and found_items tables with filtering and keyset pagination"""
     try:
-        supabase = get_supabase()
-        all_items = []
+        supabase = get_async_supabase()
+        after = decode_cursor(cursor) if cursor else None
+        tsquery = build_search_query(search) if search else None
+        
+        # Ranked search runs in the database; pages are numbered, not keyset
+        if tsquery and sort == ItemSort.RELEVANCE and unified_items_enabled() and full_text_search_enabled():
+            response = await supabase.rpc("search_items", {
+                "p_query": tsquery,
+                "p_type": type.value if type else None,
+                "p_category": category.value if category else None,
+                "p_location": location,
+                "p_urgency": urgency.value if urgency else None,
+                "p_has_reward": has_reward,
+                "p_limit": per_page + 1,
+                "p_offset": (page - 1) * per_page
+            }).execute()
+            rows = response.data or []
+            return ItemListResponse(
+                items=[Item(**item_row_to_unified(row["item"])) for row in rows[:per_page]],
+                total=rows[0]["total_count"] if rows else 0,
+                page=page,
+                per_page=per_page,
+                has_next=len(rows) > per_page,
+                has_prev=page > 1
+            )
+        
+        # Each source returns at most one row past the page; legacy page numbers
+        # without a cursor need every source's first page * per_page rows instead
+        fetch_limit = per_page + 1 if after else page * per_page + 1
+        sources = []
+        total = 0
+        unified = unified_items_enabled()
+        
+        # Single indexed query against public.items
+        if unified:
+            query = supabase.table("items").select(ITEM_SELECT, count="estimated").eq("status", "active").eq("is_active", True)
+            
+            if type:
+                query = query.eq("type", type.value)
+            if category:
+                query = query.eq("category", category.value)
+            if location:
+                query = query.ilike("location", f"%{location}%")
+            if urgency:
+                query = query.eq("urgency", urgency.value)
+            if has_reward:
+                query = query.gt("reward", 0)
+            if tsquery:
+                query = apply_search(query, search, tsquery)
+            
+            query = apply_keyset(query, after, fetch_limit)
+            response = await query.execute()
+            total = response.count or 0
+            sources.append([item_row_to_unified(item_data) for item_data in response.data])
         
         # Fetch from lost_items table if not filtering for found items only
-        if not type or type == ItemType.LOST:
+        if not unified and (not type or type == ItemType.LOST):
             lost_query = supabase.table("lost_items").select("""
                 *,
                 categories!lost_items_category_id_fkey(name),
                 locations!lost_items_location_id_fkey(name),
                 profiles!lost_items_user_id_fkey(first_name, last_name, email)
-            """).eq("status", "ACTIVE")
+            """, count="estimated").eq("status", "ACTIVE")
             
             # Apply filters for lost items
             if category:
-                # Get category ID first
-                cat_response = supabase.table("categories").select("id").eq("name", category.value.title()).execute()
-                if cat_response.data:
-                    lost_query = lost_query.eq("category_id", cat_response.data[0]["id"])
+                # Category ID from the reference-data cache
+                category_id = await reference_data.category_id(category.value)
+                if category_id:
+                    lost_query = lost_query.eq("category_id", category_id)
             
             if location:
-                # Get location ID first
-                loc_response = supabase.table("locations").select("id").ilike("name", f"%{location}%").execute()
-                if loc_response.data:
-                    location_ids = [loc["id"] for loc in loc_response.data]
+                # Location IDs resolved in memory
+                location_ids = await reference_data.location_ids_matching(location)
+                if location_ids:
                     lost_query = lost_query.in_("location_id", location_ids)
             
             if urgency:
@@ -368,107 +636,65 @@ async def get_items(
             if has_reward:
                 lost_query = lost_query.gt("reward_amount", 0) if has_reward else lost_query.eq("reward_amount", 0)
             
-            if search:
-                lost_query = lost_query.or_(f"title.ilike.%{search}%,description.ilike.%{search}%")
-            
-            lost_response = lost_query.execute()
+            if tsquery:
+                lost_query = apply_search(lost_query, search, tsquery)
             
-            # Transform lost items to unified format
-            for item_data in lost_response.data:
-                unified_item = {
-                    "id": item_data["id"],
-                    "type": "lost",
-                    "user_id": item_data["user_id"],
-                    "title": item_data["title"],
-                    "description": item_data["description"],
-                    "category": item_data["categories"]["name"].lower() if item_data.get("categories") else "other",
-                    "location": item_data["locations"]["name"] if item_data.get("locations") else "Unknown",
-                    "images": item_data.get("images", []) or [],  # Get images from database
-                    "image": item_data.get("images", [None])[0] if item_data.get("images") else f"{API_BASE_URL}/placeholder/400x300",  # First image or placeholder
-                    "reward": item_data.get("reward_amount", 0) or 0,
-                    "urgency": item_data["urgency"].lower(),
-                    "date_lost": item_data.get("date_lost"),
-                    "time_lost": item_data.get("time_lost"),
-                    "contact_preference": item_data["contact_method"].lower(),
-                    "status": item_data["status"].lower(),
-                    "created_at": item_data["created_at"],
-                    "updated_at": item_data["updated_at"],
-                    "owner_name": get_full_name_from_profile(item_data.get("profiles")),
-                    "owner_email": item_data["profiles"]["email"] if item_data.get("profiles") else "Unknown"
-                }
-                all_items.append(Item(**unified_item))
+            lost_query = apply_keyset(lost_query, after, fetch_limit)
+            lost_response = await lost_query.execute()
+            total += lost_response.count or 0
+            sources.append([lost_item_to_unified(item_data) for item_data in lost_response.data])
         
         # Fetch from found_items table if not filtering for lost items only
-        if not type or type == ItemType.FOUND:
+        if not unified and (not type or type == ItemType.FOUND):
             found_query = supabase.table("found_items").select("""
                 *,
                 categories!found_items_category_id_fkey(name),
                 locations!found_items_location_id_fkey(name),
                 profiles!found_items_user_id_fkey(first_name, last_name, email)
-            """).eq("status", "AVAILABLE")
+            """, count="estimated").eq("status", "AVAILABLE")
             
             # Apply filters for found items
             if category:
-                # Get category ID first
-                cat_response = supabase.table("categories").select("id").eq("name", category.value.title()).execute()
-                if cat_response.data:
-                    found_query = found_query.eq("category_id", cat_response.data[0]["id"])
+                # Category ID from the reference-data cache
+                category_id = await reference_data.category_id(category.value)
+                if category_id:
+                    found_query = found_query.eq("category_id", category_id)
             
             if location:
-                # Get location ID first
-                loc_response = supabase.table("locations").select("id").ilike("name", f"%{location}%").execute()
-                if loc_response.data:
-                    location_ids = [loc["id"] for loc in loc_response.data]
+                # Location IDs resolved in memory
+                location_ids = await reference_data.location_ids_matching(location)
+                if location_ids:
                     found_query = found_query.in_("location_id", location_ids)
             
-            if search:
-                found_query = found_query.or_(f"title.ilike.%{search}%,description.ilike.%{search}%")
-            
-            found_response = found_query.execute()
+            if tsquery:
+                found_query = apply_search(found_query, search, tsquery)
             
-            # Transform found items to unified format
-            for item_data in found_response.data:
-                unified_item = {
-                    "id": item_data["id"],
-                    "type": "found",
-                    "user_id": item_data["user_id"],
-                    "title": item_data["title"],
-                    "description": item_data["description"],
-                    "category": item_data["categories"]["name"].lower() if item_data.get("categories") else "other",
-                    "location": item_data["locations"]["name"] if item_data.get("locations") else "Unknown",
-                    "images": item_data.get("images", []) or [],  # Get images from database
-                    "image": item_data.get("images", [None])[0] if item_data.get("images") else f"{API_BASE_URL}/placeholder/400x300",  # First image or placeholder
-                    "reward": 0,  # Found items don't have rewards
-                    "urgency": "medium",  # Default urgency for found items
-                    "date_lost": item_data.get("date_found"),  # Use date_found as date_lost for consistency
-                    "time_lost": item_data.get("time_found"),
-                    "contact_preference": item_data["contact_method"].lower(),
-                    "status": "active" if item_data["status"].lower() == "available" else item_data["status"].lower(),
-                    "created_at": item_data["created_at"],
-                    "updated_at": item_data["updated_at"],
-                    "owner_name": get_full_name_from_profile(item_data.get("profiles")),
-                    "owner_email": item_data["profiles"]["email"] if item_data.get("profiles") else "Unknown"
-                }
-                all_items.append(Item(**unified_item))
+            found_query = apply_keyset(found_query, after, fetch_limit)
+            found_response = await found_query.execute()
+            total += found_response.count or 0
+            sources.append([found_item_to_unified(item_data) for item_data in found_response.data])
         
-        # Sort by created_at (newest first)
-        all_items.sort(key=lambda x: x.created_at, reverse=True)
+        # k-way merge of the already-sorted sources, newest first
+        merged = heapq.merge(*sources, key=item_sort_key, reverse=True)
+        start = 0 if after else (page - 1) * per_page
+        window = list(itertools.islice(merged, start, start + per_page + 1))
         
-        # Apply pagination
-        total = len(all_items)
-        start = (page - 1) * per_page
-        end = start + per_page
-        paginated_items = all_items[start:end]
+        has_next = len(window) > per_page
+        page_rows = window[:per_page]
+        paginated_items = [Item(**item_data) for item_data in page_rows]
         
         return ItemListResponse(
             items=paginated_items,
             total=total,
             page=page,
             per_page=per_page,
-            has_next=end < total,
-            has_prev=page > 1
+            has_next=has_next,
+            has_prev=page > 1 or after is not None,
+            next_cursor=encode_cursor(page_rows[-1]) if has_next else None
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching items: {str(e)}")
         raise HTTPException(
@@ -477,13 +703,27 @@ async def get_items(
         )
 
 @api_router.get("/items/{item_id}", response_model=Item)
-async def get_item(item_id: str):
+@query_budget(3)
+async def get_item(request: Request, item_id: str):
     """Get single item by ID"""
+    return await cached_json_response(request, response_cache.item_key(item_id), lambda: load_item(item_id))
+
+async def load_item(item_id: str):
+    """Fetch one item as an Item, or raise 404"""
     try:
-        supabase = get_supabase()
+        supabase = get_async_supabase()
+        
+        if unified_items_enabled():
+            response = await supabase.table("items").select(ITEM_SELECT).eq("id", item_id).execute()
+            if not response.data:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Item not found"
+                )
+            return Item(**item_row_to_unified(response.data[0]))
         
         # First try to find the item in lost_items table
-        lost_response = supabase.table("lost_items").select("""
+        lost_response = await supabase.table("lost_items").select("""
             *,
             categories!lost_items_category_id_fkey(name),
             locations!lost_items_location_id_fkey(name),
@@ -492,32 +732,10 @@ async def get_item(item_id: str):
         
         if lost_response.data:
             # Item found in lost_items table
-            item_data = lost_response.data[0]
-            unified_item = {
-                "id": item_data["id"],
-                "type": "lost",
-                "user_id": item_data["user_id"],
-                "title": item_data["title"],
-                "description": item_data["description"],
-                "category": item_data["categories"]["name"].lower() if item_data.get("categories") else "other",
-                "location": item_data["locations"]["name"] if item_data.get("locations") else "Unknown",
-                "images": item_data.get("images", []) or [],
-                "image": item_data.get("images", [None])[0] if item_data.get("images") else f"{API_BASE_URL}/placeholder/400x300",
-                "reward": item_data.get("reward_amount", 0) or 0,
-                "urgency": item_data.get("urgency", "medium").lower(),
-                "date_lost": item_data.get("date_lost"),
-                "time_lost": item_data.get("time_lost"),
-                "contact_preference": item_data.get("contact_method", "email").lower(),
-                "status": item_data.get("status", "active").lower(),
-                "created_at": item_data["created_at"],
-                "updated_at": item_data["updated_at"],
-                "owner_name": get_full_name_from_profile(item_data.get("profiles")),
-                "owner_email": item_data["profiles"]["email"] if item_data.get("profiles") else "Unknown"
-            }
-            return Item(**unified_item)
+            return Item(**lost_item_to_unified(lost_response.data[0]))
         
         # Try found_items table
-        found_response = supabase.table("found_items").select("""
+        found_response = await supabase.table("found_items").select("""
             *,
             categories!found_items_category_id_fkey(name),
             locations!found_items_location_id_fkey(name),
@@ -526,29 +744,7 @@ async def get_item(item_id: str):
         
         if found_response.data:
             # Item found in found_items table
-            item_data = found_response.data[0]
-            unified_item = {
-                "id": item_data["id"],
-                "type": "found",
-                "user_id": item_data["user_id"],
-                "title": item_data["title"],
-                "description": item_data["description"],
-                "category": item_data["categories"]["name"].lower() if item_data.get("categories") else "other",
-                "location": item_data["locations"]["name"] if item_data.get("locations") else "Unknown",
-                "images": item_data.get("images", []) or [],
-                "image": item_data.get("images", [None])[0] if item_data.get("images") else f"{API_BASE_URL}/placeholder/400x300",
-                "reward": 0,  # Found items don't have rewards
-                "urgency": "medium",  # Default urgency for found items
-                "date_lost": item_data.get("date_found"),  # Use date_found as date_lost for consistency
-                "time_lost": item_data.get("time_found"),
-                "contact_preference": item_data.get("contact_method", "email").lower(),
-                "status": "active" if item_data.get("status", "available").lower() == "available" else item_data.get("status", "active").lower(),
-                "created_at": item_data["created_at"],
-                "updated_at": item_data["updated_at"],
-                "owner_name": get_full_name_from_profile(item_data.get("profiles")),
-                "owner_email": item_data["profiles"]["email"] if item_data.get("profiles") else "Unknown"
-            }
-            return Item(**unified_item)
+            return Item(**found_item_to_unified(found_response.data[0]))
         
         # Item not found in either table
         raise HTTPException(
@@ -569,8 +765,41 @@ async def get_item(item_id: str):
 async def create_item(item: ItemCreate, current_user = Depends(get_current_user)):
     """Create a new item in the appropriate table (lost_items or found_items)"""
     try:
-        supabase = get_supabase()  # Use regular client for main operations
-        supabase_admin = get_supabase_admin()  # Use admin client for categories/locations
+        supabase = get_async_supabase()  # Use regular client for main operations
+        supabase_admin = get_async_supabase_admin()  # Use admin client for categories/locations
+        
+        if unified_items_enabled():
+            item_data = {
+                "user_id": current_user["id"],
+                "type": item.type.value,
+                "title": item.title,
+                "description": item.description,
+                "category": item.category.value,
+                "location": item.location,
+                "images": item.images or [],
+                "reward": (item.reward or 0) if item.type == ItemType.LOST else 0,
+                "urgency": item.urgency.value,
+                "contact_preference": item.contact_preference,
+                "status": "active"
+            }
+            date_field = "date_lost" if item.type == ItemType.LOST else "date_found"
+            time_field = "time_lost" if item.type == ItemType.LOST else "time_found"
+            if item.date_lost:
+                item_data[date_field] = item.date_lost.isoformat()
+            if item.time_lost:
+                item_data[time_field] = item.time_lost
+            
+            # Ownership is enforced above via current_user, so write with the service client
+            response = await supabase_admin.table("items").insert(item_data).execute()
+            if not response.data:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Failed to create item - no data returned"
+                )
+            
+            response_cache.invalidate_item(response.data[0]["id"])
+            index_item_rows("items", response.data)
+            return Item(**item_row_to_unified({**response.data[0], "profiles": current_user}))
         
         # Determine which table to use based on item type
         if item.type == ItemType.LOST:
@@ -607,25 +836,22 @@ async def create_item(item: ItemCreate, current_user = Depends(get_current_user)
         
         # Handle category - find or create
         try:
-            category_response = supabase_admin.table("categories").select("id").eq("name", item.category.value.title()).execute()
-            if category_response.data:
-                item_data["category_id"] = category_response.data[0]["id"]
+            # Resolved from the reference-data cache; use default category if not found
+            category_id = await reference_data.category_id(item.category.value) or await reference_data.category_id("Other")
+            if category_id:
+                item_data["category_id"] = category_id
             else:
-                # Use default category if not found
-                default_cat_response = supabase_admin.table("categories").select("id").eq("name", "Other").execute()
-                if default_cat_response.data:
-                    item_data["category_id"] = default_cat_response.data[0]["id"]
-                else:
-                    # Create Other category as fallback
-                    new_category = {
-                        "name": "Other",
-                        "description": "Miscellaneous items",
-                        "icon": "help-circle",
-                        "color": "#6B7280"
-                    }
-                    category_create_response = supabase_admin.table("categories").insert(new_category).execute()
-                    if category_create_response.data:
-                        item_data["category_id"] = category_create_response.data[0]["id"]
+                # Create Other category as fallback
+                new_category = {
+                    "name": "Other",
+                    "description": "Miscellaneous items",
+                    "icon": "help-circle",
+                    "color": "#6B7280"
+                }
+                category_create_response = await supabase_admin.table("categories").insert(new_category).execute()
+                if category_create_response.data:
+                    item_data["category_id"] = category_create_response.data[0]["id"]
+                    reference_data.add_category(category_create_response.data[0])
         except Exception as e:
             logger.error(f"Category handling error: {e}")
             # Skip category if there's an error
@@ -633,9 +859,16 @@ async def create_item(item: ItemCreate, current_user = Depends(get_current_user)
         
         # Handle location - find or create
         try:
-            location_response = supabase_admin.table("locations").select("id").eq("name", item.location).execute()
-            if location_response.data:
-                item_data["location_id"] = location_response.data[0]["id"]
+            location_id = await reference_data.location_id(item.location)
+            if not location_id:
+                # Another worker may have created it since our last reload
+                location_response = await supabase_admin.table("locations").select("id, name").eq("name", item.location).execute()
+                if location_response.data:
+                    location_id = location_response.data[0]["id"]
+                    reference_data.add_location(location_response.data[0])
+            
+            if location_id:
+                item_data["location_id"] = location_id
             else:
                 # Create location if it doesn't exist
                 new_location = {
@@ -643,9 +876,10 @@ async def create_item(item: ItemCreate, current_user = Depends(get_current_user)
                     "building": item.location,
                     "description": f"Location: {item.location}"
                 }
-                location_create_response = supabase_admin.table("locations").insert(new_location).execute()
+                location_create_response = await supabase_admin.table("locations").insert(new_location).execute()
                 if location_create_response.data:
                     item_data["location_id"] = location_create_response.data[0]["id"]
+                    reference_data.add_location(location_create_response.data[0])
         except Exception as e:
             logger.error(f"Location handling error: {e}")
             # Skip location if there's an error
@@ -663,7 +897,7 @@ async def create_item(item: ItemCreate, current_user = Depends(get_current_user)
         logger.info(f"Attempting to insert into {table_name} with data: {item_data}")
         
         # Insert into the appropriate table
-        response = supabase.table(table_name).insert(item_data).execute()
+        response = await supabase.table(table_name).insert(item_data).execute()
         
         if not response.data:
             logger.error(f"No data returned from {table_name} insert")
@@ -685,7 +919,7 @@ async def create_item(item: ItemCreate, current_user = Depends(get_current_user)
             "category": item.category.value,
             "location": item.location,
             "images": item.images or [],
-            "image": item.images[0] if item.images else f"{API_BASE_URL}/placeholder/400x300",  # Use actual API URL for placeholder
+            **item_image_fields(item.images),
             "reward": created_item.get("reward_amount", 0) or 0,
             "urgency": created_item.get("urgency", "medium").lower() if item.type == ItemType.LOST else "medium",
             "date_lost": created_item.get(date_field),
@@ -706,6 +940,8 @@ async def create_item(item: ItemCreate, current_user = Depends(get_current_user)
             except:
                 pass  # Keep as string if conversion fails
         
+        response_cache.invalidate_item(created_item["id"])
+        index_item_rows(table_name, [created_item])
         return Item(**unified_item)
         
     except HTTPException:
@@ -722,10 +958,10 @@ async def create_item(item: ItemCreate, current_user = Depends(get_current_user)
 async def update_item(item_id: str, item_update: ItemUpdate, current_user = Depends(get_current_user)):
     """Update an item"""
     try:
-        supabase = get_supabase()
+        supabase = get_async_supabase()
         
         # Check if user owns the item
-        existing_item = supabase.table("items").select("user_id").eq("id", item_id).execute()
+        existing_item = await supabase.table("items").select("user_id").eq("id", item_id).execute()
         if not existing_item.data or existing_item.data[0]["user_id"] != current_user["id"]:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -734,7 +970,7 @@ async def update_item(item_id: str, item_update: ItemUpdate, current_user = Depe
         
         # Update item
         update_data = {k: v for k, v in item_update.model_dump().items() if v is not None}
-        response = supabase.table("items").update(update_data).eq("id", item_id).execute()
+        response = await supabase.table("items").update(update_data).eq("id", item_id).execute()
         
         if not response.data:
             raise HTTPException(
@@ -742,11 +978,9 @@ async def update_item(item_id: str, item_update: ItemUpdate, current_user = Depe
                 detail="Item not found"
             )
         
-        updated_item = response.data[0]
-        updated_item["owner_name"] = get_full_name(current_user)
-        updated_item["owner_email"] = current_user["email"]
-        
-        return Item(**updated_item)
+        response_cache.invalidate_item(item_id)
+        index_item_rows("items", response.data)
+        return Item(**item_row_to_unified({**response.data[0], "profiles": current_user}))
         
     except HTTPException:
         raise
@@ -757,6 +991,169 @@ async def update_item(item_id: str, item_update: ItemUpdate, current_user = Depe
             detail=f"Error updating item: {str(e)}"
         )
 
+# Lost/found matching (matching.py)
+# Every worker keeps its own MatchIndex of active items. Writes made here are
+# applied straight away; writes from other workers arrive with the next delta
+# sync, and hard deletes elsewhere with the next full rebuild. Deletes made here
+# while a rebuild is scanning are replayed onto the new index before the swap.
+MATCH_COLUMNS = "id, type, user_id, title, description, category, location, images, status, is_active, created_at, updated_at"
+LEGACY_MATCH_COLUMNS = "id, user_id, title, description, category_id, location_id, images, status, created_at, updated_at"
+# updated_at is set when a transaction starts, so rows can commit slightly out of order
+MATCH_SYNC_OVERLAP_SECONDS = 5
+MIN_UUID = "00000000-0000-0000-0000-000000000000"
+
+match_index = MatchIndex()
+match_state = {"ready": False, "watermarks": {}, "reloaded_at": 0.0, "task": None, "rebuild_removals": None}
+
+def match_sources():
+    """(table, item type or None when the row has one, columns) for the active item storage"""
+    if unified_items_enabled():
+        return [("items", None, MATCH_COLUMNS)]
+    return [(table_name, item_type, LEGACY_MATCH_COLUMNS) for item_type, table_name in LEGACY_ITEM_TABLES.items()]
+
+def match_row(item_data, item_type=None):
+    """Convert a public.items or legacy row to the shape MatchIndex indexes"""
+    category = item_data.get("category")
+    if category is None and item_data.get("category_id"):
+        category = reference_data.categories.get(item_data["category_id"])
+    location = item_data.get("location")
+    if location is None and item_data.get("location_id"):
+        location = reference_data.locations.get(item_data["location_id"])
+    # Legacy tables use ACTIVE (lost) and AVAILABLE (found) for listed items
+    item_status = (item_data.get("status") or "active").lower()
+    return {
+        "id": item_data["id"],
+        "type": item_type or item_data["type"],
+        "user_id": item_data.get("user_id"),
+        "title": item_data.get("title"),
+        "description": item_data.get("description"),
+        "category": (category or "other").lower(),
+        "location": location or "Unknown",
+        "images": item_data.get("images") or [],
+        "created_at": item_data.get("created_at"),
+        "status": "active" if item_status == "available" else item_status,
+        "is_active": item_data.get("is_active") is not False
+    }
+
+def index_item_rows(table_name, rows):
+    """Apply rows just written to table_name to this worker's match index"""
+    if not settings.match_index_enabled:
+        return
+    for source_table, item_type, _ in match_sources():
+        if source_table == table_name:
+            for row in rows:
+                match_index.apply(match_row(row, item_type))
+
+def unindex_item(item_id):
+    """Drop a deleted item from this worker's match index, and from one being rebuilt"""
+    match_index.remove(item_id)
+    if match_state["rebuild_removals"] is not None:
+        match_state["rebuild_removals"].append(item_id)
+
+async def scan_match_rows(supabase, table_name, columns, after=None):
+    """Yield rows updated after the (updated_at, id) watermark, oldest first, a page per query"""
+    page_size = settings.match_page_size
+    while True:
+        query = supabase.table(table_name).select(columns)
+        if after:
+            updated_at, item_id = after
+            query = or_filter(query, f'updated_at.gt."{updated_at}",and(updated_at.eq."{updated_at}",id.gt.{item_id})')
+        response = await query.order("updated_at,id").limit(page_size).execute()
+        rows = response.data or []
+        for row in rows:
+            yield row
+        if len(rows) < page_size:
+            return
+        after = (rows[-1]["updated_at"], rows[-1]["id"])
+
+async def sync_match_index(rebuild=False):
+    """Apply rows changed since the last sync, or build a fresh index and swap it in"""
+    global match_index
+    supabase = get_async_supabase_admin()
+    if not unified_items_enabled():
+        # Legacy rows carry category/location ids
+        await reference_data.ensure_fresh()
+    
+    index = MatchIndex() if rebuild else match_index
+    watermarks = {} if rebuild else dict(match_state["watermarks"])
+    if rebuild:
+        # Hard deletes never show up in a later delta sync, so collect the ones made mid-scan
+        match_state["rebuild_removals"] = []
+    try:
+        for table_name, item_type, columns in match_sources():
+            after = watermarks.get(table_name)
+            if after:
+                updated_at = datetime.fromisoformat(after[0]) - timedelta(seconds=MATCH_SYNC_OVERLAP_SECONDS)
+                after = (updated_at.isoformat(), MIN_UUID)
+            async for row in scan_match_rows(supabase, table_name, columns, after):
+                index.apply(match_row(row, item_type))
+                watermarks[table_name] = (row["updated_at"], row["id"])
+    
+        if rebuild:
+            # No await between the replay and the swap, so no delete can slip in between
+            for item_id in match_state["rebuild_removals"]:
+                index.remove(item_id)
+            match_index = index
+            match_state["reloaded_at"] = time.monotonic()
+            logger.info(f"Match index built: {index.stats()}")
+    finally:
+        if rebuild:
+            match_state["rebuild_removals"] = None
+    match_state["watermarks"] = watermarks
+    match_state["ready"] = True
+
+async def maintain_match_index():
+    """Build the match index, then keep it in step with the database"""
+    while True:
+        try:
+            stale = time.monotonic() - match_state["reloaded_at"] > settings.match_rebuild_interval_seconds
+            await sync_match_index(rebuild=not match_state["ready"] or stale)
+        except Exception as e:
+            logger.warning(f"Match index sync failed: {e}")
+        await asyncio.sleep(settings.match_sync_interval_seconds)
+
+@api_router.get("/items/{item_id}/matches", response_model=ItemMatchesResponse)
+@query_budget(2)
+async def get_item_matches(item_id: str, limit: int = Query(10, ge=1, le=50)):
+    """Opposite-type items most likely to be the same object, best first"""
+    if not match_state["ready"]:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Match index is loading",
+            headers={"Retry-After": str(int(settings.match_sync_interval_seconds))}
+        )
+    
+    document = match_index.get(item_id)
+    if document is None:
+        # Not listed (claimed, archived, ...); still match it, at the cost of a lookup
+        columns = MATCH_COLUMNS if unified_items_enabled() else LEGACY_MATCH_COLUMNS
+        item, _ = await fetch_item_row(get_async_supabase(), item_id, columns)
+        if not item:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Item not found"
+            )
+        document = MatchDocument(match_row(item))
+    
+    return ItemMatchesResponse(
+        item_id=item_id,
+        type=document.type,
+        matches=[
+            ItemMatch(
+                id=candidate.id,
+                type=candidate.type,
+                title=candidate.title,
+                category=candidate.category,
+                location=candidate.location,
+                thumbnail=item_image_fields([candidate.image] if candidate.image else [])["thumbnail"],
+                created_at=candidate.created_at,
+                score=round(score, 3),
+                matched_terms=terms
+            )
+            for candidate, score, terms in match_index.matches(document, limit)
+        ]
+    )
+
 # File upload endpoint
 @api_router.post("/upload", response_model=ImageUploadResponse)
 async def upload_image(file: UploadFile = File(...), current_user = Depends(get_current_user)):
@@ -776,37 +1173,26 @@ async def upload_image(file: UploadFile = File(...), current_user = Depends(get_
         
         # Check file size (max 10MB)
         content = await file.read()
+        UPLOAD_BYTES.observe(len(content))
         if len(content) > 10 * 1024 * 1024:  # 10MB
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="File size too large. Maximum size is 10MB"
             )
         
-        # Validate and process image (skip for SVG)
+        # Validate and process image (skip for SVG) off the event loop
+        variants = {}
         if file.content_type != "image/svg+xml":
             try:
-                # Reset file pointer for PIL
-                image = Image.open(io.BytesIO(content))
-                
-                # Convert to RGB if necessary (for JPEG compatibility)
-                if image.mode in ('RGBA', 'LA', 'P'):
-                    background = Image.new('RGB', image.size, (255, 255, 255))
-                    if image.mode == 'P':
-                        image = image.convert('RGBA')
-                    background.paste(image, mask=image.split()[-1] if image.mode == 'RGBA' else None)
-                    image = background
-                
-                # Resize if too large (max 1920x1920)
-                max_size = (1920, 1920)
-                if image.size[0] > max_size[0] or image.size[1] > max_size[1]:
-                    image.thumbnail(max_size, Image.Resampling.LANCZOS)
-                
-                # Save optimized image
-                output = io.BytesIO()
-                image_format = 'JPEG' if file.content_type in ['image/jpeg', 'image/jpg'] else 'PNG'
-                image.save(output, format=image_format, quality=85, optimize=True)
-                content = output.getvalue()
-            except Exception as e:
+                content, variants = await image_pool.run(process_image, content, file.content_type)
+            except ImagePoolSaturated:
+                logger.warning(f"Image pool saturated ({image_pool.pending} pending), rejecting upload")
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Image processing is busy, please retry shortly",
+                    headers={"Retry-After": str(settings.image_pool_retry_after_seconds)}
+                )
+            except InvalidImageError as e:
                 logger.error(f"Image processing error: {str(e)}")
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
@@ -820,8 +1206,15 @@ async def upload_image(file: UploadFile = File(...), current_user = Depends(get_
             if original_ext in ['jpg', 'jpeg', 'png', 'gif', 'webp', 'bmp', 'tiff', 'svg']:
                 file_extension = original_ext
         
-        # Create filename with user folder structure
-        filename = f"{current_user['id']}/{uuid.uuid4()}.{file_extension}"
+        # Create filename with user folder structure; uploads with variants get their
+        # own folder: {user_id}/{upload_id}/original.<ext>, 320.webp, 800.jpg, ...
+        def upload_paths(upload_id):
+            if not variants:
+                return f"{current_user['id']}/{upload_id}.{file_extension}", {}
+            folder = f"{current_user['id']}/{upload_id}"
+            return f"{folder}/{ORIGINAL_IMAGE_STEM}.{file_extension}", {name: f"{folder}/{variant_filename(name)}" for name in variants}
+        
+        filename, variant_paths = upload_paths(uuid.uuid4())
         
         # Upload to Supabase Storage
         supabase = get_supabase()
@@ -829,17 +1222,18 @@ async def upload_image(file: UploadFile = File(...), current_user = Depends(get_
         try:
             # First, try to create the bucket if it doesn't exist
             try:
-                supabase.storage.create_bucket("item-images", {"public": True})
+                await run_in_threadpool(supabase.storage.create_bucket, "item-images", {"public": True})
             except Exception as bucket_error:
                 logger.info(f"Bucket creation failed (may already exist): {bucket_error}")
             
             # Upload the file
-            storage_response = supabase.storage.from_("item-images").upload(
+            storage_response = await run_in_threadpool(
+                supabase.storage.from_("item-images").upload,
                 filename, 
                 content, 
                 {
                     "content-type": file.content_type,
-                    "upsert": False
+                    "upsert": "false"
                 }
             )
             
@@ -849,13 +1243,14 @@ async def upload_image(file: UploadFile = File(...), current_user = Depends(get_
             if isinstance(storage_response, bool):
                 if not storage_response:
                     # Upload failed, try with upsert=True
-                    filename = f"{current_user['id']}/{uuid.uuid4()}-{int(time.time())}.{file_extension}"
-                    storage_response = supabase.storage.from_("item-images").upload(
+                    filename, variant_paths = upload_paths(f"{uuid.uuid4()}-{int(time.time())}")
+                    storage_response = await run_in_threadpool(
+                        supabase.storage.from_("item-images").upload,
                         filename, 
                         content, 
                         {
                             "content-type": file.content_type,
-                            "upsert": True
+                            "upsert": "true"
                         }
                     )
                     
@@ -868,13 +1263,14 @@ async def upload_image(file: UploadFile = File(...), current_user = Depends(get_
                 raise Exception(f"Supabase storage error: {storage_response.error}")
             elif hasattr(storage_response, 'data') and not storage_response.data:
                 # Try with upsert=True in case of filename conflict
-                filename = f"{current_user['id']}/{uuid.uuid4()}-{int(time.time())}.{file_extension}"
-                storage_response = supabase.storage.from_("item-images").upload(
+                filename, variant_paths = upload_paths(f"{uuid.uuid4()}-{int(time.time())}")
+                storage_response = await run_in_threadpool(
+                    supabase.storage.from_("item-images").upload,
                     filename, 
                     content, 
                     {
                         "content-type": file.content_type,
-                        "upsert": True
+                        "upsert": "true"
                     }
                 )
                 
@@ -883,6 +1279,20 @@ async def upload_image(file: UploadFile = File(...), current_user = Depends(get_
                     # Fallback to local storage
                     raise Exception(f"Retry upload failed: {storage_response.error}")
             
+            # Variants next to the original; if any fails the whole upload goes local
+            await asyncio.gather(*(
+                run_in_threadpool(
+                    supabase.storage.from_("item-images").upload,
+                    path,
+                    variants[name],
+                    {
+                        "content-type": variant_content_type(name),
+                        "upsert": "true"
+                    }
+                )
+                for name, path in variant_paths.items()
+            ))
+            
         except HTTPException:
             raise
         except Exception as e:
@@ -890,21 +1300,17 @@ async def upload_image(file: UploadFile = File(...), current_user = Depends(get_
             
             # Fallback: Save to local uploads directory
             uploads_dir = Path("uploads")
-            uploads_dir.mkdir(exist_ok=True)
-            
-            user_dir = uploads_dir / current_user['id']
-            user_dir.mkdir(exist_ok=True)
-            
-            local_filename = f"{uuid.uuid4()}.{file_extension}"
-            local_path = user_dir / local_filename
+            filename, variant_paths = upload_paths(uuid.uuid4())
+            local_files = [(filename, content)] + [(path, variants[name]) for name, path in variant_paths.items()]
             
-            # Save file locally
-            async with aiofiles.open(local_path, 'wb') as f:
-                await f.write(content)
+            # Save files locally
+            for path, data in local_files:
+                local_path = uploads_dir / path
+                local_path.parent.mkdir(parents=True, exist_ok=True)
+                async with aiofiles.open(local_path, 'wb') as f:
+                    await f.write(data)
             
-            # Use local URL
-            filename = f"{current_user['id']}/{local_filename}"
-            logger.info(f"Saved image locally: {local_path}")
+            logger.info(f"Saved image locally: {uploads_dir / filename} ({len(variant_paths)} variants)")
         
         # Get public URL - construct it manually for reliability
         try:
@@ -930,7 +1336,8 @@ async def upload_image(file: UploadFile = File(...), current_user = Depends(get_
         return ImageUploadResponse(
             url=public_url,
             public_url=public_url,
-            path=filename
+            path=filename,
+            variants=image_variant_urls(public_url) if variant_paths else None
         )
         
     except HTTPException:
@@ -947,14 +1354,14 @@ async def upload_image(file: UploadFile = File(...), current_user = Depends(get_
 async def get_dashboard(current_user = Depends(get_current_user)):
     """Get user dashboard data"""
     try:
-        supabase = get_supabase()
+        supabase = get_async_supabase()
         
         # Get user's items
-        items_response = supabase.table("items").select("*").eq("user_id", current_user["id"]).execute()
+        items_response = await supabase.table("items").select("*").eq("user_id", current_user["id"]).execute()
         user_items = items_response.data or []
         
         # Get claim requests for user's items
-        claims_response = supabase.table("claim_requests").select("""
+        claims_response = await supabase.table("claim_requests").select("""
             *,
             items!claim_requests_item_id_fkey(title),
             profiles!claim_requests_claimer_id_fkey(first_name, last_name, email)
@@ -988,9 +1395,7 @@ async def get_dashboard(current_user = Depends(get_current_user)):
         # Transform recent items
         recent_items = []
         for item_data in user_items[:5]:  # Last 5 items
-            item_data["owner_name"] = get_full_name(current_user)
-            item_data["owner_email"] = current_user["email"]
-            recent_items.append(Item(**item_data))
+            recent_items.append(Item(**item_row_to_unified({**item_data, "profiles": current_user})))
         
         return DashboardData(
             stats=stats,
@@ -1010,10 +1415,10 @@ async def get_dashboard(current_user = Depends(get_current_user)):
 async def create_claim_request(claim: ClaimRequestCreate, current_user = Depends(get_current_user)):
     """Create a claim request for an item"""
     try:
-        supabase = get_supabase()
+        supabase = get_async_supabase()
         
         # Check if item exists and is active
-        item_response = supabase.table("items").select("*").eq("id", claim.item_id).execute()
+        item_response = await supabase.table("items").select("*").eq("id", claim.item_id).execute()
         if not item_response.data:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -1037,7 +1442,7 @@ async def create_claim_request(claim: ClaimRequestCreate, current_user = Depends
         claim_data = claim.model_dump()
         claim_data["claimer_id"] = current_user["id"]
         
-        response = supabase.table("claim_requests").insert(claim_data).execute()
+        response = await supabase.table("claim_requests").insert(claim_data).execute()
         
         if not response.data:
             raise HTTPException(
@@ -1051,7 +1456,7 @@ async def create_claim_request(claim: ClaimRequestCreate, current_user = Depends
         created_claim["item_title"] = item["title"]
         
         # Create notification for item owner
-        supabase.rpc("create_notification", {
+        await supabase.rpc("create_notification", {
             "p_user_id": item["user_id"],
             "p_title": "New Claim Request",
             "p_message": f"Someone wants to claim your {item['type']} item: {item['title']}",
@@ -1072,124 +1477,186 @@ async def create_claim_request(claim: ClaimRequestCreate, current_user = Depends
         )
 
 # Messaging endpoints
+async def authorize_conversation(supabase, claim_request_id, user_id):
+    """Load a claim and its item's owner id; 404 if missing, 403 unless user_id is a participant"""
+    claim_response = await supabase.table("claim_requests").select("*").eq("id", claim_request_id).execute()
+    if not claim_response.data:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Conversation not found"
+        )
+    claim = claim_response.data[0]
+    
+    # Get item to check ownership
+    item = None
+    try:
+        item, _ = await fetch_item_row(supabase, claim["item_id"], "user_id")
+    except:
+        pass
+    
+    if not item:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Item not found"
+        )
+    
+    if user_id not in (claim["claimer_id"], item["user_id"]):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied"
+        )
+    return claim, item
+
+# Conversation list rows come from conversation_summaries (migrations/005), with
+# both participants embedded through the table's foreign keys
+CONVERSATION_SUMMARY_SELECT = (
+    "*, "
+    "claimer:profiles!conversation_summaries_claimer_id_fkey(id, first_name, last_name, full_name, email), "
+    "owner:profiles!conversation_summaries_owner_id_fkey(id, first_name, last_name, full_name, email)"
+)
+
+async def load_conversation_summaries(supabase, current_user):
+    """Conversation list from conversation_summaries (migrations/005): one indexed query"""
+    # Answered from the (claimer_id|owner_id, last_activity_at) indexes
+    summaries_response = await or_filter(
+        supabase.table("conversation_summaries").select(CONVERSATION_SUMMARY_SELECT),
+        f"claimer_id.eq.{current_user['id']},owner_id.eq.{current_user['id']}"
+    ).order("last_activity_at", desc=True).execute()
+    
+    conversations = []
+    for summary in summaries_response.data or []:
+        # Determine other participant info
+        is_claimer = summary["claimer_id"] == current_user["id"]
+        if is_claimer:
+            other_participant = summary.get("owner") or {}
+            relationship = "owner"
+            unread_count = summary["claimer_unread_count"]
+        else:
+            other_participant = summary.get("claimer") or {}
+            relationship = "claimer"
+            unread_count = summary["owner_unread_count"]
+        
+        latest_message = None
+        if summary.get("last_message_id"):
+            latest_message = {
+                "id": summary["last_message_id"],
+                "claim_request_id": summary["claim_request_id"],
+                "sender_id": summary["last_message_sender_id"],
+                "message": summary["last_message_preview"],
+                "created_at": summary["last_message_at"]
+            }
+        
+        conversation_data = {
+            "claim_request_id": summary["claim_request_id"],
+            "item": {
+                "id": summary["item_id"],
+                "title": summary["item_title"],
+                "type": summary["item_type"],
+                "image": summary.get("item_image"),
+                "thumbnail": item_image_fields([summary["item_image"]] if summary.get("item_image") else None, placeholder=None)["thumbnail"]
+            },
+            "other_participant": {
+                "id": other_participant.get("id"),
+                "name": get_full_name_from_profile(other_participant),
+                "email": other_participant.get("email")
+            },
+            "relationship": relationship,
+            "status": summary.get("claim_status"),
+            "latest_message": latest_message,
+            "unread_count": unread_count,
+            "last_activity": summary["last_activity_at"]
+        }
+        conversations.append(conversation_data)
+    return conversations
+
+async def load_legacy_conversations(supabase, current_user):
+    """Conversation list for the legacy item tables, which conversation_summaries does not cover"""
+    # Claims the user made or received, in one query
+    user_item_ids = []
+    for table_name in LEGACY_ITEM_TABLES.values():
+        response = await supabase.table(table_name).select("id").eq("user_id", current_user["id"]).execute()
+        user_item_ids.extend(item["id"] for item in response.data or [])
+    claims_query = supabase.table("claim_requests").select("*")
+    if user_item_ids:
+        claims_query = or_filter(claims_query, f"claimer_id.eq.{current_user['id']},item_id.in.({','.join(user_item_ids)})")
+    else:
+        claims_query = claims_query.eq("claimer_id", current_user["id"])
+    claims_response = await claims_query.order("created_at", desc=True).execute()
+    claims = claims_response.data or []
+    if not claims:
+        return []
+    
+    # Everything else is loaded in bulk, so the query count does not grow with the list
+    items = await fetch_item_rows(supabase, [claim["item_id"] for claim in claims])
+    
+    profile_ids = {claim["claimer_id"] for claim in claims}
+    profile_ids.update(item["user_id"] for item in items.values())
+    profiles_response = await supabase.table("profiles").select("*").in_("id", list(profile_ids)).execute()
+    profiles = {profile["id"]: profile for profile in profiles_response.data or []}
+    
+    # migrations/003_conversation_list.sql
+    stats_response = await supabase.rpc("conversation_message_stats", {
+        "p_claim_ids": [claim["id"] for claim in claims],
+        "p_user_id": current_user["id"]
+    }).execute()
+    message_stats = {row["claim_request_id"]: row for row in stats_response.data or []}
+    
+    conversations = []
+    for claim in claims:
+        item = items.get(claim["item_id"])
+        if not item:
+            continue
+        
+        claimer_profile = profiles.get(claim["claimer_id"])
+        owner_profile = profiles.get(item["user_id"])
+        if not claimer_profile or not owner_profile:
+            continue
+        
+        stats = message_stats.get(claim["id"]) or {}
+        is_claimer = claim["claimer_id"] == current_user["id"]
+        other_participant = owner_profile if is_claimer else claimer_profile
+        latest_message = stats.get("latest_message")
+        image = item["images"][0] if item.get("images") else None
+        
+        conversations.append({
+            "claim_request_id": claim["id"],
+            "item": {
+                "id": item["id"],
+                "title": item["title"],
+                "type": item["type"],
+                "image": image,
+                "thumbnail": item_image_fields([image] if image else None, placeholder=None)["thumbnail"]
+            },
+            "other_participant": {
+                "id": other_participant["id"],
+                "name": get_full_name_from_profile(other_participant),
+                "email": other_participant["email"]
+            },
+            "relationship": "owner" if is_claimer else "claimer",
+            "status": claim.get("status"),
+            "latest_message": latest_message,
+            "unread_count": stats.get("unread_count") or 0,
+            "last_activity": latest_message["created_at"] if latest_message else claim["created_at"]
+        })
+    
+    # Same order as the summary table: most recent activity first
+    conversations.sort(key=lambda conversation: conversation["last_activity"], reverse=True)
+    return conversations
+
 @api_router.get("/conversations", response_model=ConversationListResponse)
+# Unified: the summary query (+ a profile cache miss); legacy: item ids, claims, items, profiles and stats
+@query_budget(lambda: 2 if unified_items_enabled() else 8)
 async def get_user_conversations(current_user = Depends(get_current_user)):
     """Get all conversations for the current user"""
     try:
-        supabase = get_supabase_admin()
-        
-        # Get claim requests where user is claimer
-        claimer_claims_response = supabase.table("claim_requests").select("*").eq("claimer_id", current_user["id"]).order("created_at", desc=True).execute()
-
-        # Get claim requests where user is item owner
-        # First get the user's items from both tables
-        lost_items_response = supabase.table("lost_items").select("id").eq("user_id", current_user["id"]).execute()
-        found_items_response = supabase.table("found_items").select("id").eq("user_id", current_user["id"]).execute()
-        
-        user_item_ids = []
-        if lost_items_response.data:
-            user_item_ids.extend([item["id"] for item in lost_items_response.data])
-        if found_items_response.data:
-            user_item_ids.extend([item["id"] for item in found_items_response.data])
-        
-        owner_claims_response = None
-        if user_item_ids:
-            owner_claims_response = supabase.table("claim_requests").select("*").in_("item_id", user_item_ids).order("created_at", desc=True).execute()
-
-        # Combine all claims
-        all_claims = []
-        if claimer_claims_response.data:
-            all_claims.extend(claimer_claims_response.data)
-        if owner_claims_response and owner_claims_response.data:
-            all_claims.extend(owner_claims_response.data)
-
-        # Remove duplicates based on claim ID
-        seen_ids = set()
-        unique_claims = []
-        for claim in all_claims:
-            if claim["id"] not in seen_ids:
-                unique_claims.append(claim)
-                seen_ids.add(claim["id"])
-
-        conversations = []
-        for claim in unique_claims:
-            # Get item details
-            item = None
-            try:
-                # Try lost_items first
-                lost_item_response = supabase.table("lost_items").select("*").eq("id", claim["item_id"]).execute()
-                if lost_item_response.data:
-                    item = lost_item_response.data[0]
-                    item["type"] = "lost"
-                else:
-                    # Try found_items
-                    found_item_response = supabase.table("found_items").select("*").eq("id", claim["item_id"]).execute()
-                    if found_item_response.data:
-                        item = found_item_response.data[0]
-                        item["type"] = "found"
-            except:
-                continue
-            
-            if not item:
-                continue
-            
-            # Get claimer profile
-            claimer_profile = None
-            try:
-                claimer_response = supabase.table("profiles").select("*").eq("id", claim["claimer_id"]).execute()
-                if claimer_response.data:
-                    claimer_profile = claimer_response.data[0]
-            except:
-                continue
-            
-            # Get owner profile  
-            owner_profile = None
-            try:
-                owner_response = supabase.table("profiles").select("*").eq("id", item["user_id"]).execute()
-                if owner_response.data:
-                    owner_profile = owner_response.data[0]
-            except:
-                continue
-            
-            if not claimer_profile or not owner_profile:
-                continue
-            
-            # Get latest message for this conversation
-            latest_msg_response = supabase.table("chat_messages").select("*").eq("claim_request_id", claim["id"]).order("created_at", desc=True).limit(1).execute()
-            
-            # Get unread count
-            unread_response = supabase.table("chat_messages").select("*", count="exact").eq("claim_request_id", claim["id"]).eq("is_read", False).neq("sender_id", current_user["id"]).execute()
-            
-            # Determine other participant info
-            is_claimer = claim["claimer_id"] == current_user["id"]
-            if is_claimer:
-                other_participant = owner_profile
-                relationship = "owner"
-            else:
-                other_participant = claimer_profile
-                relationship = "claimer"
-            
-            conversation_data = {
-                "claim_request_id": claim["id"],
-                "item": {
-                    "id": item["id"],
-                    "title": item["title"],
-                    "type": item["type"],
-                    "image": item.get("images", [None])[0] if item.get("images") else None
-                },
-                "other_participant": {
-                    "id": other_participant["id"],
-                    "name": get_full_name_from_profile(other_participant),
-                    "email": other_participant["email"]
-                },
-                "relationship": relationship,
-                "latest_message": latest_msg_response.data[0] if latest_msg_response.data else None,
-                "unread_count": unread_response.count or 0,
-                "last_activity": claim["created_at"]
-            }
-            conversations.append(conversation_data)
-
-        return ConversationListResponse(conversations=conversations)
+        supabase = get_async_supabase_admin()
+        
+        # conversation_summaries needs migrations 001 and 005, which the unified mode requires anyway
+        if unified_items_enabled():
+            conversations = await load_conversation_summaries(supabase, current_user)
+        else:
+            conversations = await load_legacy_conversations(supabase, current_user)
+        return ConversationListResponse(conversations=conversations, total=len(conversations))
         
     except Exception as e:
         logger.error(f"Error fetching conversations: {str(e)}")
@@ -1199,13 +1666,14 @@ async def get_user_conversations(current_user = Depends(get_current_user)):
         )
 
 @api_router.get("/conversations/{claim_request_id}", response_model=ConversationResponse)
-async def get_conversation(claim_request_id: str, current_user = Depends(get_current_user)):
+@query_budget(6)
+async def get_conversation(claim_request_id: str, current_user = Depends(get_current_user), profile_loader: ProfileLoader = Depends(get_profile_loader)):
     """Get specific conversation with all messages"""
     try:
-        supabase = get_supabase_admin()
+        supabase = get_async_supabase_admin()
         
         # Get claim request
-        claim_response = supabase.table("claim_requests").select("*").eq("id", claim_request_id).execute()
+        claim_response = await supabase.table("claim_requests").select("*").eq("id", claim_request_id).execute()
 
         if not claim_response.data:
             raise HTTPException(
@@ -1218,17 +1686,7 @@ async def get_conversation(claim_request_id: str, current_user = Depends(get_cur
         # Get item details
         item = None
         try:
-            # Try lost_items first
-            lost_item_response = supabase.table("lost_items").select("*").eq("id", claim["item_id"]).execute()
-            if lost_item_response.data:
-                item = lost_item_response.data[0]
-                item["type"] = "lost"
-            else:
-                # Try found_items
-                found_item_response = supabase.table("found_items").select("*").eq("id", claim["item_id"]).execute()
-                if found_item_response.data:
-                    item = found_item_response.data[0]
-                    item["type"] = "found"
+            item, _ = await fetch_item_row(supabase, claim["item_id"])
         except:
             pass
         
@@ -1249,17 +1707,21 @@ async def get_conversation(claim_request_id: str, current_user = Depends(get_cur
             )
         
         # Get all messages with sender profiles
-        messages_response = supabase.table("chat_messages").select("*").eq("claim_request_id", claim_request_id).order("created_at").execute()
+        messages_response = await supabase.table("chat_messages").select("*").eq("claim_request_id", claim_request_id).order("created_at").execute()
 
         # Mark messages as read for current user
-        supabase.table("chat_messages").update({"is_read": True}).eq("claim_request_id", claim_request_id).neq("sender_id", current_user["id"]).execute()
+        await supabase.table("chat_messages").update({"is_read": True}).eq("claim_request_id", claim_request_id).neq("sender_id", current_user["id"]).execute()
 
+        # Senders and both participants resolved in one batch
+        profile_loader.prime(current_user)
+        profiles = await profile_loader.load_many(
+            [item["user_id"], claim["claimer_id"]] + [msg["sender_id"] for msg in messages_response.data]
+        )
+        
         # Format messages
         messages = []
         for msg in messages_response.data:
-            # Get sender profile
-            sender_response = supabase.table("profiles").select("*").eq("id", msg["sender_id"]).execute()
-            sender_profile = sender_response.data[0] if sender_response.data else {}
+            sender_profile = profiles.get(msg["sender_id"]) or {}
             
             message_data = Message(
                 id=msg["id"],
@@ -1273,12 +1735,9 @@ async def get_conversation(claim_request_id: str, current_user = Depends(get_cur
             )
             messages.append(message_data)
 
-        # Get participant profiles
-        owner_response = supabase.table("profiles").select("*").eq("id", item["user_id"]).execute()
-        claimer_response = supabase.table("profiles").select("*").eq("id", claim["claimer_id"]).execute()
-        
-        owner_profile = owner_response.data[0] if owner_response.data else {}
-        claimer_profile = claimer_response.data[0] if claimer_response.data else {}
+        # Participant profiles
+        owner_profile = profiles.get(item["user_id"]) or {}
+        claimer_profile = profiles.get(claim["claimer_id"]) or {}
         
         # Create UserProfile objects
         participants = [
@@ -1307,15 +1766,15 @@ async def get_conversation(claim_request_id: str, current_user = Depends(get_cur
             "user_id": item["user_id"],
             "title": item["title"],
             "description": item["description"],
-            "category": "other",  # Default
-            "location": "Unknown",  # Default
+            "category": item.get("category") or "other",  # Legacy rows only carry category_id
+            "location": item.get("location") or "Unknown",
             "images": item.get("images", []) or [],
-            "image": item.get("images", [None])[0] if item.get("images") else None,
-            "reward": item.get("reward_amount", 0) or 0,
+            **item_image_fields(item.get("images"), placeholder=None),
+            "reward": int(float(item.get("reward_amount") or item.get("reward") or 0)),
             "urgency": item.get("urgency", "medium").lower() if item["type"] == "lost" else "medium",
             "date_lost": item.get("date_lost") or item.get("date_found"),
             "time_lost": item.get("time_lost") or item.get("time_found"),
-            "contact_preference": item.get("contact_method", "email").lower(),
+            "contact_preference": (item.get("contact_method") or item.get("contact_preference") or "email").lower(),
             "status": "active",
             "created_at": item["created_at"],
             "updated_at": item["updated_at"],
@@ -1340,51 +1799,14 @@ async def get_conversation(claim_request_id: str, current_user = Depends(get_cur
         )
 
 @api_router.post("/conversations/{claim_request_id}/messages", response_model=Message)
-async def send_message(claim_request_id: str, message_data: MessageCreate, current_user = Depends(get_current_user)):
+@query_budget(4)
+async def send_message(claim_request_id: str, message_data: MessageCreate, current_user = Depends(get_current_user), profile_loader: ProfileLoader = Depends(get_profile_loader)):
     """Send a new message in a conversation"""
     try:
-        supabase = get_supabase_admin()
+        supabase = get_async_supabase_admin()
         
         # Verify claim request exists and user has access
-        claim_response = supabase.table("claim_requests").select("*").eq("id", claim_request_id).execute()
-
-        if not claim_response.data:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Conversation not found"
-            )
-
-        claim = claim_response.data[0]
-        
-        # Get item to check ownership
-        item = None
-        try:
-            # Try lost_items first
-            lost_item_response = supabase.table("lost_items").select("*").eq("id", claim["item_id"]).execute()
-            if lost_item_response.data:
-                item = lost_item_response.data[0]
-            else:
-                # Try found_items
-                found_item_response = supabase.table("found_items").select("*").eq("id", claim["item_id"]).execute()
-                if found_item_response.data:
-                    item = found_item_response.data[0]
-        except:
-            pass
-        
-        if not item:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Item not found"
-            )
-        
-        is_claimer = claim["claimer_id"] == current_user["id"]
-        is_owner = item["user_id"] == current_user["id"]
-        
-        if not (is_claimer or is_owner):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Access denied"
-            )
+        await authorize_conversation(supabase, claim_request_id, current_user["id"])
 
         # Create message
         message_insert = {
@@ -1394,7 +1816,7 @@ async def send_message(claim_request_id: str, message_data: MessageCreate, curre
             "is_read": False
         }
 
-        created_message = supabase.table("chat_messages").insert(message_insert).execute()
+        created_message = await supabase.table("chat_messages").insert(message_insert).execute()
 
         if not created_message.data:
             raise HTTPException(
@@ -1403,15 +1825,18 @@ async def send_message(claim_request_id: str, message_data: MessageCreate, curre
             )
 
         # Get sender info for response
-        sender_response = supabase.table("profiles").select("full_name, email").eq("id", current_user["id"]).single().execute()
-        sender = sender_response.data
+        profile_loader.prime(current_user)
+        sender = await profile_loader.load(current_user["id"])
 
         message_response = Message(
             **created_message.data[0],
-            sender_name=sender["full_name"],
+            sender_name=get_full_name_from_profile(sender),
             sender_email=sender["email"]
         )
 
+        # Push to open WebSocket/SSE connections of this conversation
+        conversation_hub.publish(claim_request_id, message_response.model_dump(mode="json"))
+        
         return message_response
         
     except HTTPException:
@@ -1423,14 +1848,92 @@ async def send_message(claim_request_id: str, message_data: MessageCreate, curre
             detail=f"Error sending message: {str(e)}"
         )
 
+# Real-time conversation updates. Browsers cannot set headers on WebSocket or
+# EventSource requests, so both endpoints also accept ?token=<access token>.
+async def chat_message_event(row):
+    """Shape a chat_messages row (from NOTIFY) like send_message's response"""
+    sender = await ProfileLoader().load(row["sender_id"])
+    return Message(
+        **row,
+        sender_name=get_full_name_from_profile(sender),
+        sender_email=sender["email"] if sender else "Unknown"
+    ).model_dump(mode="json")
+
+@api_router.websocket("/conversations/{claim_request_id}/ws")
+async def conversation_websocket(websocket: WebSocket, claim_request_id: str, token: str = Query(...)):
+    """Push new messages of a conversation as they are sent"""
+    try:
+        user = await authenticate_token(token)
+        await authorize_conversation(get_async_supabase_admin(), claim_request_id, user["id"])
+    except Exception as e:
+        logger.info(f"Rejected conversation socket: {e}")
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    
+    await websocket.accept()
+    queue = conversation_hub.subscribe(claim_request_id)
+    
+    async def push():
+        while True:
+            await websocket.send_json({"type": "message", "data": await queue.get()})
+    
+    async def receive():
+        # Clients send nothing we act on; this returns once the socket closes
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+    
+    tasks = [asyncio.create_task(push()), asyncio.create_task(receive())]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        conversation_hub.unsubscribe(claim_request_id, queue)
+
+@api_router.get("/conversations/{claim_request_id}/events")
+async def conversation_events(request: Request, claim_request_id: str, token: Optional[str] = Query(None)):
+    """Server-Sent Events fallback for clients that cannot open a WebSocket"""
+    authorization = request.headers.get("authorization", "")
+    token = token or (authorization[7:] if authorization.lower().startswith("bearer ") else None)
+    try:
+        user = await authenticate_token(token or "")
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials"
+        )
+    await authorize_conversation(get_async_supabase_admin(), claim_request_id, user["id"])
+    
+    queue = conversation_hub.subscribe(claim_request_id)
+    
+    async def stream():
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=settings.realtime_keepalive_seconds)
+                except asyncio.TimeoutError:
+                    # Comment line keeps proxies from closing an idle stream
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"id: {event['id']}\nevent: message\ndata: {json.dumps(event)}\n\n"
+        finally:
+            conversation_hub.unsubscribe(claim_request_id, queue)
+    
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @api_router.put("/conversations/{claim_request_id}/read")
 async def mark_conversation_read(claim_request_id: str, current_user = Depends(get_current_user)):
     """Mark all messages in conversation as read"""
     try:
-        supabase = get_supabase_admin()
+        supabase = get_async_supabase_admin()
         
         # Mark messages as read
-        update_response = supabase.table("chat_messages").update({"is_read": True}).eq("claim_request_id", claim_request_id).neq("sender_id", current_user["id"]).execute()
+        update_response = await supabase.table("chat_messages").update({"is_read": True}).eq("claim_request_id", claim_request_id).neq("sender_id", current_user["id"]).execute()
 
         return {"success": True, "message": "Conversation marked as read"}
         
@@ -1452,50 +1955,63 @@ async def get_admin_user(current_user = Depends(get_current_user)):
     return current_user
 
 # Admin endpoints
+# Dashboard counts are shared by every admin and allowed to be a few seconds old
+admin_stats_cache = TTLCache(maxsize=2, ttl=settings.admin_stats_ttl_seconds, name="admin_stats")
+admin_stats_lock = asyncio.Lock()
+
+async def fetch_status_counts(supabase):
+    """{(source, status): count} from one admin_status_counts() call"""
+    counts_response = await supabase.rpc("admin_status_counts", {}).execute()
+    return {(row["source"], row["status"]): row["total"] for row in counts_response.data or []}
+
+def count_total(counts, source, *statuses):
+    """Sum the counts of a source, optionally limited to some statuses"""
+    return sum(count for (row_source, row_status), count in counts.items()
+               if row_source == source and (not statuses or row_status in statuses))
+
+async def load_admin_stats(supabase):
+    """Build the dashboard numbers from grouped counts"""
+    counts = await fetch_status_counts(supabase)
+    
+    def total(source, *statuses):
+        return count_total(counts, source, *statuses)
+    
+    if unified_items_enabled():
+        active_items = total("items", "active")
+        resolved_items = total("items", "resolved", "claimed")
+        total_items = total("items")
+    else:
+        active_items = total("lost_items", "ACTIVE") + total("found_items", "AVAILABLE")
+        resolved_items = total("lost_items", "RESOLVED") + total("found_items", "CLAIMED")
+        total_items = total("lost_items") + total("found_items")
+    
+    # Calculate success rate
+    success_rate = (resolved_items / total_items * 100) if total_items > 0 else 0
+    
+    return {
+        "total_users": total("profiles"),
+        "active_items": active_items,
+        "resolved_items": resolved_items,
+        "pending_claims": total("claim_requests", "pending"),
+        "success_rate": round(success_rate, 1),
+        "total_items": total_items
+    }
+
 @api_router.get("/admin/stats")
+@query_budget(2)
 async def get_admin_stats(admin_user = Depends(get_admin_user)):
     """Get admin dashboard statistics"""
     try:
-        supabase = get_supabase_admin()
-        
-        # Get user count
-        users_response = supabase.table("profiles").select("id", count="exact").execute()
-        total_users = users_response.count or 0
-        
-        # Get items count from both tables
-        lost_items_response = supabase.table("lost_items").select("status", count="exact").execute()
-        found_items_response = supabase.table("found_items").select("status", count="exact").execute()
-        
-        # Count active items
-        active_lost = len([item for item in lost_items_response.data if item.get("status") == "ACTIVE"])
-        active_found = len([item for item in found_items_response.data if item.get("status") == "AVAILABLE"])
-        active_items = active_lost + active_found
-        
-        # Count resolved items
-        resolved_lost = len([item for item in lost_items_response.data if item.get("status") == "RESOLVED"])
-        resolved_found = len([item for item in found_items_response.data if item.get("status") == "CLAIMED"])
-        resolved_items = resolved_lost + resolved_found
-        
-        # Get pending claims (if claim_requests table exists)
-        pending_claims = 0
-        try:
-            claims_response = supabase.table("claim_requests").select("status", count="exact").eq("status", "pending").execute()
-            pending_claims = claims_response.count or 0
-        except Exception as e:
-            logger.warning(f"Could not fetch claims: {e}")
-        
-        # Calculate success rate
-        total_items = len(lost_items_response.data) + len(found_items_response.data)
-        success_rate = (resolved_items / total_items * 100) if total_items > 0 else 0
-        
-        return {
-            "total_users": total_users,
-            "active_items": active_items,
-            "resolved_items": resolved_items,
-            "pending_claims": pending_claims,
-            "success_rate": round(success_rate, 1),
-            "total_items": total_items
-        }
+        cache_key = settings.items_source
+        stats = admin_stats_cache.get(cache_key)
+        if stats is None:
+            # Concurrent refreshes wait for the one already querying
+            async with admin_stats_lock:
+                stats = admin_stats_cache.get(cache_key)
+                if stats is None:
+                    stats = await load_admin_stats(get_async_supabase_admin())
+                    admin_stats_cache.set(cache_key, stats)
+        return stats
         
     except Exception as e:
         logger.error(f"Error fetching admin stats: {str(e)}")
@@ -1504,6 +2020,17 @@ async def get_admin_stats(admin_user = Depends(get_admin_user)):
             detail="Error fetching admin statistics"
         )
 
+@api_router.get("/admin/cache-stats")
+async def get_cache_stats(admin_user = Depends(get_admin_user)):
+    """Hit/miss counters of the in-process caches (this worker only)"""
+    return {
+        "responses": response_cache.stats(),
+        "profiles": profile_cache.stats(),
+        "placeholders": placeholder_cache.stats(),
+        "admin_stats": admin_stats_cache.stats(),
+        "match_index": {**match_index.stats(), "ready": match_state["ready"]}
+    }
+
 @api_router.get("/admin/items")
 async def get_admin_items(
     status: Optional[str] = Query(None),
@@ -1514,9 +2041,38 @@ async def get_admin_items(
 ):
     """Get all items for admin review"""
     try:
-        supabase = get_supabase_admin()
+        supabase = get_async_supabase_admin()
         all_items = []
         
+        if unified_items_enabled():
+            query = supabase.table("items").select(ITEM_SELECT, count="exact")
+            if status:
+                query = query.eq("status", status.lower())
+            if flagged_only:
+                query = query.eq("flagged", True)
+            
+            offset = (page - 1) * per_page
+            response = await query.order("created_at", desc=True).range(offset, offset + per_page - 1).execute()
+            
+            for item_data in response.data:
+                unified_item = item_row_to_unified(item_data)
+                unified_item.update({
+                    "flagged": item_data.get("flagged", False),
+                    "flag_reason": item_data.get("flag_reason"),
+                    "moderation_notes": item_data.get("moderation_notes"),
+                    "moderated_by": item_data.get("moderated_by"),
+                    "moderated_at": item_data.get("moderated_at"),
+                    "table_name": "items"
+                })
+                all_items.append(unified_item)
+            
+            return {
+                "items": all_items,
+                "total": response.count or 0,
+                "page": page,
+                "per_page": per_page
+            }
+        
         # Fetch from lost_items table
         lost_query = supabase.table("lost_items").select("""
             *,
@@ -1528,7 +2084,7 @@ async def get_admin_items(
         if status:
             lost_query = lost_query.eq("status", status.upper())
         
-        lost_response = lost_query.execute()
+        lost_response = await lost_query.execute()
         
         # Transform lost items
         for item_data in lost_response.data:
@@ -1568,7 +2124,7 @@ async def get_admin_items(
             found_status = "AVAILABLE" if status.lower() == "active" else status.upper()
             found_query = found_query.eq("status", found_status)
         
-        found_response = found_query.execute()
+        found_response = await found_query.execute()
         
         # Transform found items
         for item_data in found_response.data:
@@ -1627,7 +2183,7 @@ async def get_admin_claims(
 ):
     """Get all claim requests for admin review"""
     try:
-        supabase = get_supabase_admin()
+        supabase = get_async_supabase_admin()
         
         query = supabase.table("claim_requests").select("""
             *,
@@ -1643,7 +2199,7 @@ async def get_admin_claims(
         offset = (page - 1) * per_page
         query = query.order("created_at", desc=True).range(offset, offset + per_page - 1)
         
-        response = query.execute()
+        response = await query.execute()
         
         # Transform data
         claims = []
@@ -1682,10 +2238,10 @@ async def update_claim_status(
 ):
     """Update claim status (admin action)"""
     try:
-        supabase = get_supabase_admin()
+        supabase = get_async_supabase_admin()
         
         update_data = claim_update.model_dump()
-        response = supabase.table("claim_requests").update(update_data).eq("id", claim_id).execute()
+        response = await supabase.table("claim_requests").update(update_data).eq("id", claim_id).execute()
         
         if not response.data:
             raise HTTPException(
@@ -1698,7 +2254,7 @@ async def update_claim_status(
         
         # Create notification for claimer
         if claim_update.status == ClaimStatus.APPROVED:
-            supabase.rpc("create_notification", {
+            await supabase.rpc("create_notification", {
                 "p_user_id": claim["claimer_id"],
                 "p_title": "Claim Approved",
                 "p_message": "Your claim request has been approved by admin.",
@@ -1706,7 +2262,7 @@ async def update_claim_status(
                 "p_related_claim_id": claim_id
             }).execute()
         elif claim_update.status == ClaimStatus.REJECTED:
-            supabase.rpc("create_notification", {
+            await supabase.rpc("create_notification", {
                 "p_user_id": claim["claimer_id"],
                 "p_title": "Claim Rejected",
                 "p_message": "Your claim request has been rejected by admin.",
@@ -1733,9 +2289,9 @@ async def update_item_status_admin(
 ):
     """Update item status (admin action)"""
     try:
-        supabase = get_supabase_admin()
+        supabase = get_async_supabase_admin()
         
-        response = supabase.table("items").update({"status": new_status.value}).eq("id", item_id).execute()
+        response = await supabase.table("items").update({"status": new_status.value}).eq("id", item_id).execute()
         
         if not response.data:
             raise HTTPException(
@@ -1743,6 +2299,8 @@ async def update_item_status_admin(
                 detail="Item not found"
             )
         
+        response_cache.invalidate_item(item_id)
+        index_item_rows("items", response.data)
         return response.data[0]
         
     except HTTPException:
@@ -1763,18 +2321,18 @@ async def get_admin_users(
 ):
     """Get all users for admin management"""
     try:
-        supabase = get_supabase_admin()
+        supabase = get_async_supabase_admin()
         
         query = supabase.table("profiles").select("*")
         
         if search:
-            query = query.or_(f"first_name.ilike.%{search}%,last_name.ilike.%{search}%,email.ilike.%{search}%")
+            query = or_filter(query, f"first_name.ilike.%{search}%,last_name.ilike.%{search}%,email.ilike.%{search}%")
         
         # Apply pagination
         offset = (page - 1) * per_page
         query = query.order("created_at", desc=True).range(offset, offset + per_page - 1)
         
-        response = query.execute()
+        response = await query.execute()
         
         return {
             "users": response.data,
@@ -1797,9 +2355,9 @@ async def update_user_role(
 ):
     """Update user admin status"""
     try:
-        supabase = get_supabase_admin()
+        supabase = get_async_supabase_admin()
         
-        response = supabase.table("profiles").update({"is_admin": is_admin}).eq("id", user_id).execute()
+        response = await supabase.table("profiles").update({"is_admin": is_admin}).eq("id", user_id).execute()
         
         if not response.data:
             raise HTTPException(
@@ -1807,6 +2365,8 @@ async def update_user_role(
                 detail="User not found"
             )
         
+        invalidate_profile(user_id)
+        
         return response.data[0]
         
     except HTTPException:
@@ -1828,7 +2388,7 @@ async def get_admin_disputes(
 ):
     """Get all disputes for admin review"""
     try:
-        supabase = get_supabase_admin()
+        supabase = get_async_supabase_admin()
         
         # For now, we'll create a disputes table structure
         # This would need to be added to the schema
@@ -1847,7 +2407,7 @@ async def get_admin_disputes(
         offset = (page - 1) * per_page
         query = query.order("created_at", desc=True).range(offset, offset + per_page - 1)
         
-        response = query.execute()
+        response = await query.execute()
         
         return {
             "disputes": response.data,
@@ -1871,7 +2431,7 @@ async def update_dispute_status(
 ):
     """Update dispute status and add admin notes"""
     try:
-        supabase = get_supabase_admin()
+        supabase = get_async_supabase_admin()
         
         update_data = {
             "status": action,
@@ -1883,7 +2443,7 @@ async def update_dispute_status(
             update_data["resolved_at"] = datetime.utcnow().isoformat()
             update_data["resolved_by"] = admin_user["id"]
         
-        response = supabase.table("disputes").update(update_data).eq("id", dispute_id).execute()
+        response = await supabase.table("disputes").update(update_data).eq("id", dispute_id).execute()
         
         if not response.data:
             raise HTTPException(
@@ -1895,7 +2455,7 @@ async def update_dispute_status(
         dispute = response.data[0]
         if action == "resolve":
             # Notify all parties about resolution
-            supabase.rpc("create_notification", {
+            await supabase.rpc("create_notification", {
                 "p_user_id": dispute["owner_id"],
                 "p_title": "Dispute Resolved",
                 "p_message": f"The dispute regarding your item has been resolved by admin.",
@@ -1923,51 +2483,60 @@ async def moderate_item(
 ):
     """Moderate an item with admin actions and notes"""
     try:
-        supabase = get_supabase_admin()
-        
-        # First, try to find the item in lost_items table
-        lost_response = supabase.table("lost_items").select("*").eq("id", item_id).execute()
-        
-        if lost_response.data:
-            # Item found in lost_items table
-            item = lost_response.data[0]
-            table_name = "lost_items"
-        else:
-            # Try found_items table
-            found_response = supabase.table("found_items").select("*").eq("id", item_id).execute()
-            
-            if found_response.data:
-                # Item found in found_items table
-                item = found_response.data[0]
-                table_name = "found_items"
-            else:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Item not found"
-                )
+        supabase = get_async_supabase_admin()
         
         # Update item status based on action
         update_data = {
-            "moderation_status": action,
             "moderated_at": datetime.utcnow().isoformat(),
             "moderated_by": admin_user["id"],
             "moderation_notes": note
         }
         
-        if action == "approve":
-            if table_name == "lost_items":
-                update_data["status"] = "ACTIVE"
-            else:  # found_items
-                update_data["status"] = "AVAILABLE"
-        elif action == "reject":
-            update_data["status"] = "REJECTED"
-        elif action == "archive":
-            update_data["status"] = "ARCHIVED"
-        elif action == "flag":
+        if action == "flag":
             update_data["flagged"] = True
             update_data["flag_reason"] = note
         
-        response = supabase.table(table_name).update(update_data).eq("id", item_id).execute()
+        if unified_items_enabled():
+            unified_updates = {
+                "approve": {"status": "active", "moderation_status": "approved"},
+                "reject": {"status": "rejected", "moderation_status": "rejected"},
+                "archive": {"status": "archived"},
+                "flag": {"moderation_status": "flagged"}
+            }
+            update_data.update(unified_updates.get(action, {}))
+            
+            # The update returns the row, so no separate lookup is needed
+            response = await supabase.table("items").update(update_data).eq("id", item_id).execute()
+            if not response.data:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Item not found"
+                )
+            item = response.data[0]
+            table_name = "items"
+        else:
+            item, table_name = await fetch_item_row(supabase, item_id)
+            if not item:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Item not found"
+                )
+            
+            update_data["moderation_status"] = action
+            if action == "approve":
+                if table_name == "lost_items":
+                    update_data["status"] = "ACTIVE"
+                else:  # found_items
+                    update_data["status"] = "AVAILABLE"
+            elif action == "reject":
+                update_data["status"] = "REJECTED"
+            elif action == "archive":
+                update_data["status"] = "ARCHIVED"
+            
+            response = await supabase.table(table_name).update(update_data).eq("id", item_id).execute()
+        
+        response_cache.invalidate_item(item_id)
+        index_item_rows(table_name, response.data or [])
         
         # Create notification for item owner
         notification_messages = {
@@ -1979,7 +2548,7 @@ async def moderate_item(
         
         if action in notification_messages:
             try:
-                supabase.rpc("create_notification", {
+                await supabase.rpc("create_notification", {
                     "p_user_id": item["user_id"],
                     "p_title": f"Item {action.title()}d",
                     "p_message": notification_messages[action],
@@ -2010,12 +2579,12 @@ async def get_flagged_content(
 ):
     """Get all flagged content for admin review"""
     try:
-        supabase = get_supabase_admin()
+        supabase = get_async_supabase_admin()
         
         # Get flagged items
         flagged_items = []
         if not type or type == "item":
-            items_response = supabase.table("items").select("""
+            items_response = await supabase.table("items").select("""
                 *,
                 profiles!items_user_id_fkey(first_name, last_name, email)
             """).eq("flagged", True).execute()
@@ -2068,28 +2637,31 @@ async def handle_flagged_content(
 ):
     """Take action on flagged content"""
     try:
-        supabase = get_supabase_admin()
+        supabase = get_async_supabase_admin()
         
         if content_type == "item":
             if action == "approve":
                 # Remove flag and approve item
-                response = supabase.table("items").update({
+                response = await supabase.table("items").update({
                     "flagged": False,
                     "flag_reason": None,
                     "status": "active",
                     "moderated_by": admin_user["id"],
                     "moderation_notes": note
                 }).eq("id", content_id).execute()
+                index_item_rows("items", response.data or [])
             elif action == "remove":
                 # Archive/remove the item
-                response = supabase.table("items").update({
+                response = await supabase.table("items").update({
                     "status": "removed",
                     "moderated_by": admin_user["id"],
                     "moderation_notes": note
                 }).eq("id", content_id).execute()
+                index_item_rows("items", response.data or [])
+            response_cache.invalidate_item(content_id)
         
         # Create audit log entry
-        supabase.table("admin_actions").insert({
+        await supabase.table("admin_actions").insert({
             "admin_id": admin_user["id"],
             "action": action,
             "content_type": content_type,
@@ -2108,48 +2680,54 @@ async def handle_flagged_content(
         )
 
 @api_router.get("/admin/analytics")
+@query_budget(3)
 async def get_admin_analytics(
     timeframe: str = Query("7d", description="Time frame: 1d, 7d, 30d, 90d"),
     admin_user = Depends(get_admin_user)
 ):
     """Get analytics data for admin dashboard"""
     try:
-        supabase = get_supabase_admin()
+        supabase = get_async_supabase_admin()
         
-        # Calculate date range
+        # Calculate date range (whole UTC days, today included)
         from datetime import timedelta
-        end_date = datetime.utcnow()
         days = {"1d": 1, "7d": 7, "30d": 30, "90d": 90}
-        start_date = end_date - timedelta(days=days.get(timeframe, 7))
-        
-        # Get various metrics
-        analytics = {}
-        
-        # User registrations over time
-        users_response = supabase.table("profiles").select("created_at").gte(
-            "created_at", start_date.isoformat()
-        ).execute()
-        analytics["new_users"] = len(users_response.data)
-        
-        # Items posted over time
-        items_response = supabase.table("items").select("created_at, type, status").gte(
-            "created_at", start_date.isoformat()
-        ).execute()
-        analytics["new_items"] = len(items_response.data)
-        analytics["lost_items"] = len([i for i in items_response.data if i["type"] == "lost"])
-        analytics["found_items"] = len([i for i in items_response.data if i["type"] == "found"])
-        
-        # Claims and success rates
-        claims_response = supabase.table("claim_requests").select("created_at, status").gte(
-            "created_at", start_date.isoformat()
-        ).execute()
-        analytics["new_claims"] = len(claims_response.data)
-        analytics["approved_claims"] = len([c for c in claims_response.data if c["status"] == "approved"])
+        end_date = datetime.utcnow().date()
+        start_date = end_date - timedelta(days=days.get(timeframe, 7) - 1)
+        
+        # One row per day from the daily_stats rollup (migrations/007)
+        rollup_response = await supabase.table("daily_stats").select("*").gte(
+            "day", start_date.isoformat()
+        ).lte("day", end_date.isoformat()).order("day").execute()
+        rollups = {row["day"]: row for row in rollup_response.data or []}
+        
+        # Days without activity have no row; report them as zeros
+        series = []
+        for offset in range((end_date - start_date).days + 1):
+            day = (start_date + timedelta(days=offset)).isoformat()
+            row = rollups.get(day) or {}
+            series.append({
+                "date": day,
+                "new_users": row.get("new_users", 0),
+                "lost_items": row.get("lost_items", 0),
+                "found_items": row.get("found_items", 0),
+                "new_claims": sum(row.get(f"claims_{claim_status}", 0) for claim_status in ("pending", "approved", "rejected", "completed")),
+                "approved_claims": row.get("claims_approved", 0),
+                "flagged_items": row.get("flagged_items", 0)
+            })
+        
+        analytics = {
+            key: sum(day[key] for day in series)
+            for key in ("new_users", "lost_items", "found_items", "new_claims", "approved_claims", "flagged_items")
+        }
+        analytics["new_items"] = analytics["lost_items"] + analytics["found_items"]
+        analytics["series"] = series
         
         # Platform health metrics
-        total_items = supabase.table("items").select("id", count="exact").execute().count
-        active_items = supabase.table("items").select("id", count="exact").eq("status", "active").execute().count
-        flagged_items = supabase.table("items").select("id", count="exact").eq("flagged", True).execute().count
+        counts = await fetch_status_counts(supabase)
+        total_items = count_total(counts, "items")
+        active_items = count_total(counts, "items", "active")
+        flagged_items = count_total(counts, "items_flagged")
         
         analytics["platform_health"] = {
             "total_items": total_items,
@@ -2167,6 +2745,109 @@ async def get_admin_analytics(
             detail="Error fetching analytics data"
         )
 
+# Bulk moderation
+BULK_ACTION_UPDATES = {
+    "approve": {"status": "active"},
+    "reject": {"status": "rejected"},
+    "archive": {"status": "archived"},
+    "flag": {"flagged": True}
+}
+
+# Running background jobs; holding the tasks keeps them from being garbage collected
+background_jobs = set()
+
+async def apply_bulk_action(supabase, admin_id, item_ids, action, note, batch_id, on_chunk=None):
+    """Apply an action with one set-based UPDATE per chunk of ids; returns one result per chunk"""
+    # One timestamp for the whole batch
+    moderated_at = datetime.utcnow().isoformat()
+    update_data = {
+        "moderated_by": admin_id,
+        "moderated_at": moderated_at,
+        "moderation_notes": note,
+        **BULK_ACTION_UPDATES[action]
+    }
+    if action == "flag":
+        update_data["flag_reason"] = note
+    
+    chunk_size = settings.bulk_action_chunk_size
+    chunks = []
+    for offset in range(0, len(item_ids), chunk_size):
+        chunk = item_ids[offset:offset + chunk_size]
+        try:
+            response = await supabase.table("items").update(update_data).in_("id", chunk).execute()
+        except Exception as e:
+            logger.error(f"Bulk {action} chunk at {offset} failed: {e}")
+            chunks.append({"offset": offset, "size": len(chunk), "succeeded": 0, "error": str(e)})
+            if on_chunk:
+                await on_chunk(chunks)
+            continue
+            
+        # The update is committed; drop stale copies before anything else can fail
+        updated = response.data or []
+        updated_ids = {item["id"] for item in updated}
+        for item_id in updated_ids:
+            response_cache.invalidate_item(item_id)
+        index_item_rows("items", updated)
+        result = {
+            "offset": offset,
+            "size": len(chunk),
+            "succeeded": len(updated_ids),
+            "not_found": [item_id for item_id in chunk if item_id not in updated_ids]
+        }
+        
+        # One audit row per item, tied together by the batch id; a failure here leaves the updates in place
+        if updated:
+            try:
+                await supabase.table("admin_actions").insert([{
+                    "admin_id": admin_id,
+                    "action": f"bulk_{action}",
+                    "content_type": "items",
+                    "content_id": item["id"],
+                    "target_user_id": item.get("user_id"),
+                    "notes": note,
+                    "metadata": {"batch_id": batch_id},
+                    "created_at": moderated_at
+                } for item in updated]).execute()
+            except Exception as e:
+                logger.error(f"Bulk {action} audit at {offset} failed: {e}")
+                result["audit_error"] = str(e)
+        chunks.append(result)
+        
+        if on_chunk:
+            await on_chunk(chunks)
+    return chunks
+
+def summarize_bulk_chunks(chunks):
+    processed = sum(chunk["size"] for chunk in chunks)
+    succeeded = sum(chunk["succeeded"] for chunk in chunks)
+    return {"processed": processed, "succeeded": succeeded, "failed": processed - succeeded}
+
+async def run_bulk_action_job(job_id, admin_id, item_ids, action, note):
+    """Background body of a large bulk action; progress is written after every chunk"""
+    supabase = get_async_supabase_admin()
+    
+    async def record_progress(chunks):
+        await supabase.table("admin_jobs").update({
+            **summarize_bulk_chunks(chunks),
+            "chunks": chunks,
+            "updated_at": datetime.utcnow().isoformat()
+        }).eq("id", job_id).execute()
+    
+    try:
+        await supabase.table("admin_jobs").update({"status": "running"}).eq("id", job_id).execute()
+        await apply_bulk_action(supabase, admin_id, item_ids, action, note, job_id, on_chunk=record_progress)
+        final_update = {"status": "completed"}
+    except asyncio.CancelledError:
+        final_update = {"status": "failed", "error": "Interrupted by server shutdown"}
+    except Exception as e:
+        logger.error(f"Bulk action job {job_id} failed: {e}")
+        final_update = {"status": "failed", "error": str(e)}
+    
+    await supabase.table("admin_jobs").update({
+        **final_update,
+        "updated_at": datetime.utcnow().isoformat()
+    }).eq("id", job_id).execute()
+
 @api_router.post("/admin/bulk-action")
 async def bulk_admin_action(
     item_ids: List[str],
@@ -2175,57 +2856,48 @@ async def bulk_admin_action(
     admin_user = Depends(get_admin_user)
 ):
     """Perform bulk actions on multiple items"""
+    if action not in BULK_ACTION_UPDATES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown action: {action}"
+        )
+    
+    # Duplicates would be updated (and audited) twice
+    item_ids = list(dict.fromkeys(item_ids))
+    
     try:
-        supabase = get_supabase_admin()
+        supabase = get_async_supabase_admin()
         
-        results = []
-        for item_id in item_ids:
-            try:
-                # Apply action to each item
-                update_data = {
-                    "moderated_by": admin_user["id"],
-                    "moderated_at": datetime.utcnow().isoformat(),
-                    "moderation_notes": note
-                }
+        if len(item_ids) > settings.bulk_action_background_threshold:
+            job_response = await supabase.table("admin_jobs").insert({
+                "admin_id": admin_user["id"],
+                "kind": f"bulk_{action}",
+                "total": len(item_ids),
+                "params": {"action": action, "note": note}
+            }).execute()
+            job = job_response.data[0]
                 
-                if action == "approve":
-                    update_data["status"] = "active"
-                elif action == "reject":
-                    update_data["status"] = "rejected"
-                elif action == "archive":
-                    update_data["status"] = "archived"
-                elif action == "flag":
-                    update_data["flagged"] = True
-                    update_data["flag_reason"] = note
+            task = asyncio.create_task(run_bulk_action_job(job["id"], admin_user["id"], item_ids, action, note))
+            background_jobs.add(task)
+            task.add_done_callback(background_jobs.discard)
                 
-                response = supabase.table("items").update(update_data).eq("id", item_id).execute()
+            return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content={
+                "success": True,
+                "job_id": job["id"],
+                "status": job["status"],
+                "total": len(item_ids),
+                "progress_url": f"/api/admin/jobs/{job['id']}"
+            })
                 
-                if response.data:
-                    results.append({"item_id": item_id, "success": True})
-                else:
-                    results.append({"item_id": item_id, "success": False, "error": "Item not found"})
-                    
-            except Exception as e:
-                results.append({"item_id": item_id, "success": False, "error": str(e)})
-        
-        # Log bulk action
-        supabase.table("admin_actions").insert({
-            "admin_id": admin_user["id"],
-            "action": f"bulk_{action}",
-            "content_type": "items",
-            "content_id": ",".join(item_ids),
-            "notes": note,
-            "created_at": datetime.utcnow().isoformat()
-        }).execute()
-        
-        successful_count = len([r for r in results if r["success"]])
+        chunks = await apply_bulk_action(supabase, admin_user["id"], item_ids, action, note, str(uuid.uuid4()))
+        summary = summarize_bulk_chunks(chunks)
         
         return {
             "success": True,
-            "processed": len(item_ids),
-            "successful": successful_count,
-            "failed": len(item_ids) - successful_count,
-            "results": results
+            "processed": summary["processed"],
+            "successful": summary["succeeded"],
+            "failed": summary["failed"],
+            "chunks": chunks
         }
         
     except Exception as e:
@@ -2235,6 +2907,22 @@ async def bulk_admin_action(
             detail=f"Error performing bulk action: {str(e)}"
         )
 
+@api_router.get("/admin/jobs/{job_id}")
+async def get_admin_job(job_id: str, admin_user = Depends(get_admin_user)):
+    """Progress of a background admin job"""
+    supabase = get_async_supabase_admin()
+    job_response = await supabase.table("admin_jobs").select("*").eq("id", job_id).execute()
+    
+    if not job_response.data:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    
+    job = job_response.data[0]
+    job["percent_complete"] = round(job["processed"] / job["total"] * 100, 1) if job["total"] else 100.0
+    return job
+
 @api_router.delete("/admin/items/{item_id}")
 async def delete_item(
     item_id: str,
@@ -2242,44 +2930,29 @@ async def delete_item(
 ):
     """Delete an item (admin only)"""
     try:
-        supabase = get_supabase_admin()
-        
-        # First, try to find the item in lost_items table
-        lost_response = supabase.table("lost_items").select("*").eq("id", item_id).execute()
+        supabase = get_async_supabase_admin()
         
-        if lost_response.data:
-            # Item found in lost_items table
-            item = lost_response.data[0]
-            table_name = "lost_items"
-            
-            # Delete from lost_items
-            delete_response = supabase.table("lost_items").delete().eq("id", item_id).execute()
-        else:
-            # Try found_items table
-            found_response = supabase.table("found_items").select("*").eq("id", item_id).execute()
-            
-            if found_response.data:
-                # Item found in found_items table
-                item = found_response.data[0]
-                table_name = "found_items"
-                
-                # Delete from found_items
-                delete_response = supabase.table("found_items").delete().eq("id", item_id).execute()
-            else:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Item not found"
-                )
+        # Delete returns the removed row, so no lookup is needed first
+        tables = ["items"] if unified_items_enabled() else list(LEGACY_ITEM_TABLES.values())
+        item = None
+        for table_name in tables:
+            delete_response = await supabase.table(table_name).delete().eq("id", item_id).execute()
+            if delete_response.data:
+                item = delete_response.data[0]
+                break
         
-        if not delete_response.data:
+        if not item:
             raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Failed to delete item"
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Item not found"
             )
         
+        response_cache.invalidate_item(item_id)
+        unindex_item(item_id)
+        
         # Log admin action
         try:
-            supabase.table("admin_actions").insert({
+            await supabase.table("admin_actions").insert({
                 "admin_id": admin_user["id"],
                 "action": "delete_item",
                 "content_type": "item",
@@ -2308,45 +2981,27 @@ async def delete_item(
 
 # Add this endpoint before the existing endpoints
 @api_router.get("/placeholder/{width}x{height}")
-async def get_placeholder_image(width: int, height: int):
-    """Generate a placeholder image"""
+async def get_placeholder_image(
+    request: Request,
+    width: int,
+    height: int,
+    format: Literal["png", "svg"] = Query("png", description="png, or svg to skip rasterisation")
+):
+    """Serve a placeholder image, rendered once per size and cached by browsers"""
     try:
-        # Limit size to prevent abuse
-        width = min(max(width, 50), 1200)
-        height = min(max(height, 50), 1200)
-        
-        # Create image
-        img = Image.new('RGB', (width, height), color='#f3f4f6')
-        draw = ImageDraw.Draw(img)
-        
-        # Add text
-        text = f"{width}×{height}"
-        try:
-            # Try to use a default font
-            font = ImageFont.load_default()
-        except:
-            font = None
+        width, height = clamp_placeholder_size(width, height)
         
-        # Calculate text position
-        if font:
-            bbox = draw.textbbox((0, 0), text, font=font)
-            text_width = bbox[2] - bbox[0]
-            text_height = bbox[3] - bbox[1]
+        # PNG misses rasterise off the event loop; SVG is just a string
+        if format == "png" and (width, height, format) not in placeholder_cache:
+            body, etag = await run_in_threadpool(get_placeholder, width, height, format)
         else:
-            text_width = len(text) * 6
-            text_height = 11
-        
-        x = (width - text_width) // 2
-        y = (height - text_height) // 2
+            body, etag = get_placeholder(width, height, format)
         
-        draw.text((x, y), text, fill='#9ca3af', font=font)
+        headers = {"ETag": etag, "Cache-Control": IMMUTABLE_CACHE_CONTROL}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
         
-        # Save to bytes
-        img_bytes = io.BytesIO()
-        img.save(img_bytes, format='PNG')
-        img_bytes.seek(0)
-        
-        return Response(content=img_bytes.getvalue(), media_type="image/png")
+        return Response(content=body, media_type=PLACEHOLDER_MEDIA_TYPES[format], headers=headers)
         
     except Exception as e:
         logger.error(f"Error generating placeholder: {e}")
@@ -2354,7 +3009,7 @@ async def get_placeholder_image(width: int, height: int):
         return Response(content=b'', media_type="image/png")
 
 @api_router.get("/uploads/{file_path:path}")
-async def serve_uploaded_image(file_path: str):
+async def serve_uploaded_image(file_path: str, request: Request):
     """Serve locally uploaded images"""
     try:
         # Construct the full path
@@ -2389,11 +3044,15 @@ async def serve_uploaded_image(file_path: str):
         }
         content_type = content_type_map.get(file_extension, 'application/octet-stream')
         
-        # Read and return the file
-        async with aiofiles.open(full_path, 'rb') as f:
-            content = await f.read()
+        # Behind nginx: hand the file to its sendfile path (it handles Range/ETag itself)
+        if settings.uploads_accel_redirect_prefix:
+            return Response(
+                media_type=content_type,
+                headers={"X-Accel-Redirect": f"{settings.uploads_accel_redirect_prefix.rstrip('/')}/{quote(file_path)}"}
+            )
         
-        return Response(content=content, media_type=content_type)
+        # Stream the file with validators and byte-range support
+        return file_response(request, full_path, content_type)
         
     except HTTPException:
         raise
@@ -2407,6 +3066,74 @@ async def serve_uploaded_image(file_path: str):
 # Include router in app
 app.include_router(api_router)
 
+@app.on_event("startup")
+async def warm_reference_data():
+    """Load category/location maps before the first request"""
+    if unified_items_enabled():
+        return
+    try:
+        await reference_data.load()
+    except Exception as e:
+        logger.warning(f"Could not preload reference data: {e}")
+
+@app.on_event("startup")
+async def warm_placeholders():
+    """Render the placeholder sizes items link to"""
+    await run_in_threadpool(prerender_placeholders)
+
+@app.on_event("startup")
+async def start_realtime_bridge():
+    """LISTEN for chat inserts and profile changes from every worker (needs DATABASE_URL)"""
+    await start_bridge(chat_message_event, {PROFILE_NOTIFY_CHANNEL: invalidate_profile})
+
+@app.on_event("startup")
+async def start_match_index():
+    """Load the match index in the background; /matches answers 503 until it is ready"""
+    if not settings.match_index_enabled:
+        return
+    match_state["task"] = asyncio.create_task(maintain_match_index())
+
+@app.on_event("startup")
+async def mark_ready():
+    """Registered last, so readiness means every hook above has finished"""
+    readiness["ready"] = True
+
+@app.on_event("shutdown")
+async def mark_draining():
+    readiness["ready"] = False
+
+@app.on_event("shutdown")
+async def cancel_background_jobs():
+    """Give running jobs JOB_DRAIN_TIMEOUT_SECONDS to finish, then let the rest record that they were interrupted while the pool is still open"""
+    if background_jobs:
+        await asyncio.wait(list(background_jobs), timeout=settings.job_drain_timeout_seconds)
+    for task in list(background_jobs):
+        task.cancel()
+    if background_jobs:
+        await asyncio.gather(*background_jobs, return_exceptions=True)
+
+@app.on_event("shutdown")
+async def stop_match_index():
+    """Stop the match index sync loop; it never finishes, so it is not drained with the jobs"""
+    task = match_state["task"]
+    if task:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+@app.on_event("shutdown")
+async def stop_realtime_bridge():
+    await stop_bridge()
+
+@app.on_event("shutdown")
+async def close_supabase_pool():
+    """Release pooled Supabase connections on shutdown"""
+    await supabase_client.aclose()
+
+@app.on_event("shutdown")
+async def close_image_pool():
+    """Stop image processing workers"""
+    image_pool.shutdown()
+
 # Root endpoint
 @app.get("/")
 async def root():
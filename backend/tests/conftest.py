@@ -0,0 +1,106 @@
+"""
+Shared fixtures: the API runs in-process against a fake Supabase.
+
+FakeSupabase answers the PostgREST/Auth calls a test registers and records
+every request. It sits behind the real CountingTransport, so query budgets,
+Server-Timing and /metrics see the calls exactly as in production.
+
+    cd backend && python -m pytest tests
+"""
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple, Union
+import os
+import sys
+import time
+
+# Settings are read at import time, so configure before the app is imported
+os.environ.update({
+    "SUPABASE_URL": "http://supabase.test",
+    "SUPABASE_ANON_KEY": "anon-key",
+    "SUPABASE_SERVICE_ROLE_KEY": "service-role-key",
+    "SUPABASE_JWT_SECRET": "test-jwt-secret",
+    "DATABASE_URL": "",
+    "QUERY_BUDGET_MODE": "enforce",
+    "MATCH_INDEX_ENABLED": "false"
+})
+os.environ.pop("PROMETHEUS_MULTIPROC_DIR", None)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import httpx
+import pytest
+import pytest_asyncio
+from jose import jwt
+
+import server
+from auth import profile_cache
+from config import settings
+from database import supabase_client
+from profiles import profile_summary_cache
+from query_budget import CountingTransport
+from reference_data import reference_data
+from response_cache import response_cache
+
+Handler = Union[Callable[[httpx.Request], httpx.Response], list, dict]
+
+class FakeSupabase:
+    """Canned Supabase responses keyed by (method, path), with a log of every request"""
+
+    def __init__(self):
+        self.routes: Dict[Tuple[str, str], Handler] = {}
+        self.requests: List[httpx.Request] = []
+
+    def on(self, method: str, path: str, handler: Handler):
+        """Answer method + path with a JSON body, or with handler(request) -> httpx.Response"""
+        self.routes[(method, path)] = handler
+
+    def calls(self, method: str, path: str) -> List[httpx.Request]:
+        return [request for request in self.requests if request.method == method and request.url.path == path]
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        handler = self.routes.get((request.method, request.url.path))
+        if handler is None:
+            return httpx.Response(404, json={"message": f"No fake for {request.method} {request.url.path}"})
+        if callable(handler):
+            return handler(request)
+        return httpx.Response(200, json=handler, headers={"content-range": f"0-{max(len(handler) - 1, 0)}/{len(handler)}"} if isinstance(handler, list) else {})
+
+def reset_clients():
+    supabase_client.async_client = None
+    supabase_client.async_service_client = None
+    supabase_client.http_client = None
+    supabase_client.transport = None
+
+@pytest.fixture
+def supabase():
+    """A fresh FakeSupabase behind the shared transport, with every in-process cache emptied"""
+    fake = FakeSupabase()
+    reset_clients()
+    supabase_client.transport = CountingTransport(httpx.MockTransport(fake.handle))
+    for cache in (profile_cache, profile_summary_cache):
+        cache.clear()
+    response_cache.invalidate_item()
+    reference_data.__init__(ttl=reference_data.ttl)
+    yield fake
+    reset_clients()
+
+@pytest.fixture
+def items_source(monkeypatch):
+    """Switch ITEMS_SOURCE for one test: items_source("legacy")"""
+    def switch(source: str):
+        monkeypatch.setattr(settings, "items_source", source)
+    return switch
+
+@pytest_asyncio.fixture
+async def client():
+    async with httpx.AsyncClient(app=server.app, base_url="http://api.test") as api:
+        yield api
+
+def make_token(user_id: str, email: str) -> str:
+    """Access token the API verifies locally with SUPABASE_JWT_SECRET"""
+    now = int(time.time())
+    return jwt.encode(
+        {"sub": user_id, "email": email, "role": "authenticated", "aud": "authenticated", "iat": now, "exp": now + 3600},
+        settings.supabase_jwt_secret,
+        algorithm="HS256"
+    )
@@ -0,0 +1,42 @@
+import asyncio
+import json
+
+import pytest
+
+from conversation_hub import CHAT_NOTIFY_CHANNEL, ConversationHub, PostgresNotifyBridge
+
+CLAIM_ID = "66666666-6666-6666-6666-666666666666"
+
+def bridge_with_enrich_log():
+    hub = ConversationHub()
+    enriched = []
+    
+    async def enrich(row):
+        enriched.append(row["id"])
+        return {**row, "sender_name": "Sam Lee"}
+    
+    return hub, PostgresNotifyBridge("postgresql://unused", hub, enrich), enriched
+
+def notify(bridge, message_id):
+    payload = json.dumps({"id": message_id, "claim_request_id": CLAIM_ID, "message": "Is it still there?"})
+    bridge._on_notify(None, 0, CHAT_NOTIFY_CHANNEL, payload)
+
+@pytest.mark.asyncio
+async def test_notification_without_local_subscribers_is_not_enriched():
+    hub, bridge, enriched = bridge_with_enrich_log()
+    
+    notify(bridge, "m1")
+    await asyncio.sleep(0)
+    
+    assert enriched == []
+
+@pytest.mark.asyncio
+async def test_notification_is_enriched_and_delivered_to_local_subscribers():
+    hub, bridge, enriched = bridge_with_enrich_log()
+    queue = hub.subscribe(CLAIM_ID)
+    
+    notify(bridge, "m1")
+    event = await asyncio.wait_for(queue.get(), timeout=1)
+    
+    assert enriched == ["m1"]
+    assert event["sender_name"] == "Sam Lee"
@@ -0,0 +1,56 @@
+import httpx
+import pytest
+
+import server
+from matching import MatchIndex
+
+KEPT_ID = "44444444-4444-4444-4444-444444444444"
+DELETED_ID = "55555555-5555-5555-5555-555555555555"
+
+def item_row(item_id, title):
+    return {
+        "id": item_id,
+        "type": "lost",
+        "user_id": "11111111-1111-1111-1111-111111111111",
+        "title": title,
+        "description": "Black leather wallet with a student card",
+        "category": "accessories",
+        "location": "Student Union",
+        "images": [],
+        "status": "active",
+        "is_active": True,
+        "created_at": "2024-05-01T10:00:00+00:00",
+        "updated_at": "2024-05-01T10:00:00+00:00"
+    }
+
+@pytest.fixture
+def fresh_match_index(monkeypatch):
+    monkeypatch.setattr(server, "match_index", MatchIndex())
+    monkeypatch.setattr(server, "match_state", {"ready": False, "watermarks": {}, "reloaded_at": 0.0, "task": None, "rebuild_removals": None})
+
+@pytest.mark.asyncio
+async def test_delete_during_rebuild_is_replayed_onto_the_new_index(supabase, items_source, fresh_match_index):
+    items_source("unified")
+    
+    def scan_items(request):
+        # An admin deletes the item after the scan has already read it
+        server.unindex_item(DELETED_ID)
+        return httpx.Response(200, json=[item_row(KEPT_ID, "Black wallet"), item_row(DELETED_ID, "Black wallet too")])
+    supabase.on("GET", "/rest/v1/items", scan_items)
+    
+    await server.sync_match_index(rebuild=True)
+    
+    assert server.match_index.get(KEPT_ID) is not None
+    assert server.match_index.get(DELETED_ID) is None
+    assert server.match_state["rebuild_removals"] is None
+
+@pytest.mark.asyncio
+async def test_failed_rebuild_stops_collecting_deletes(supabase, items_source, fresh_match_index):
+    items_source("unified")
+    supabase.on("GET", "/rest/v1/items", lambda request: httpx.Response(500, json={"message": "unavailable"}))
+    
+    with pytest.raises(Exception):
+        await server.sync_match_index(rebuild=True)
+    
+    assert server.match_state["rebuild_removals"] is None
+    assert not server.match_state["ready"]
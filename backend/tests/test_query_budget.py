@@ -0,0 +1,97 @@
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from query_budget import CountingTransport, QueryBudgetMiddleware, query_budget
+from reference_data import reference_data
+
+def budget_app(budget):
+    """An app with one endpoint that makes ?calls=n backend calls under the given budget"""
+    backend = httpx.AsyncClient(transport=CountingTransport(httpx.MockTransport(lambda request: httpx.Response(200, json=[]))))
+    app = FastAPI()
+    app.add_middleware(QueryBudgetMiddleware, mode="enforce")
+    
+    @app.get("/work")
+    @query_budget(budget)
+    async def work(calls: int):
+        for _ in range(calls):
+            await backend.get("http://supabase.test/rest/v1/items")
+        return {"calls": calls}
+    
+    return app
+
+async def get_work(app, calls):
+    async with httpx.AsyncClient(app=app, base_url="http://api.test") as api:
+        return await api.get("/work", params={"calls": calls})
+
+@pytest.mark.asyncio
+async def test_within_budget_succeeds():
+    response = await get_work(budget_app(2), 2)
+    assert response.status_code == 200
+    assert response.json() == {"calls": 2}
+    assert 'db;desc="2 calls"' in response.headers["server-timing"]
+
+@pytest.mark.asyncio
+async def test_over_budget_fails_in_enforce_mode():
+    response = await get_work(budget_app(2), 3)
+    assert response.status_code == 500
+    assert "made 3 backend calls (budget 2)" in response.json()["detail"]
+
+@pytest.mark.asyncio
+async def test_callable_budget_is_read_per_request():
+    limit = {"value": 1}
+    app = budget_app(lambda: limit["value"])
+    assert (await get_work(app, 2)).status_code == 500
+    limit["value"] = 2
+    assert (await get_work(app, 2)).status_code == 200
+
+def legacy_row(item_id, created_at):
+    return {
+        "id": item_id,
+        "user_id": "11111111-1111-1111-1111-111111111111",
+        "title": "Black laptop",
+        "description": "Left in the library",
+        "status": "ACTIVE",
+        "urgency": "HIGH",
+        "created_at": created_at,
+        "updated_at": created_at,
+        "categories": {"name": "Electronics"},
+        "locations": {"name": "Main Library"},
+        "profiles": {"first_name": "Sam", "last_name": "Lee", "email": "sam@example.com"}
+    }
+
+def fake_legacy_items(supabase):
+    supabase.on("GET", "/rest/v1/categories", [{"id": "cat-electronics", "name": "Electronics"}])
+    supabase.on("GET", "/rest/v1/locations", [{"id": "loc-library", "name": "Main Library"}])
+    supabase.on("GET", "/rest/v1/lost_items", [legacy_row("22222222-2222-2222-2222-222222222222", "2024-05-01T10:00:00+00:00")])
+    supabase.on("GET", "/rest/v1/found_items", [])
+
+@pytest.mark.asyncio
+async def test_legacy_items_stay_within_budget_when_reference_data_is_stale(supabase, items_source, client):
+    items_source("legacy")
+    fake_legacy_items(supabase)
+    await reference_data.load()
+    reference_data.invalidate()
+    
+    response = await client.get("/api/items", params={"category": "electronics"})
+    
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()["items"]] == ["22222222-2222-2222-2222-222222222222"]
+    assert 'db;desc="2 calls"' in response.headers["server-timing"]
+    assert "category_id=eq.cat-electronics" in str(supabase.calls("GET", "/rest/v1/lost_items")[0].url)
+    
+    # The reload ran outside the request and refreshed the maps
+    await reference_data._reload
+    assert len(supabase.calls("GET", "/rest/v1/categories")) == 2
+    assert not reference_data.stale
+
+@pytest.mark.asyncio
+async def test_legacy_items_stay_within_budget_on_a_cold_reference_cache(supabase, items_source, client):
+    items_source("legacy")
+    fake_legacy_items(supabase)
+    
+    response = await client.get("/api/items", params={"category": "electronics"})
+    
+    assert response.status_code == 200
+    assert 'db;desc="2 calls"' in response.headers["server-timing"]
+    assert len(supabase.calls("GET", "/rest/v1/categories")) == 1
@@ -0,0 +1,83 @@
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+from conftest import make_token
+
+USER_ID = "33333333-3333-3333-3333-333333333333"
+EMAIL = "jordan.case@umt.edu"
+
+def fake_auth_and_profiles(supabase):
+    """Signup returns a session; provision_profile writes the row that GET profiles reads"""
+    profiles = {}
+    
+    def signup(request):
+        return httpx.Response(200, json={
+            "access_token": make_token(USER_ID, EMAIL),
+            "token_type": "bearer",
+            "user": {"id": USER_ID, "email": EMAIL}
+        })
+    
+    def provision_profile(request):
+        params = json.loads(request.content)
+        profiles[params["p_user_id"]] = {
+            "id": params["p_user_id"],
+            "email": params["p_email"],
+            "first_name": params["p_first_name"],
+            "last_name": params["p_last_name"],
+            "user_type": "STUDENT",
+            "account_status": "ACTIVE"
+        }
+        return httpx.Response(200, json=None)
+    
+    def get_profiles(request):
+        user_id = request.url.params["id"].removeprefix("eq.")
+        rows = [profiles[user_id]] if user_id in profiles else []
+        return httpx.Response(200, json=rows)
+    
+    supabase.on("POST", "/auth/v1/signup", signup)
+    supabase.on("POST", "/rest/v1/rpc/provision_profile", provision_profile)
+    supabase.on("GET", "/rest/v1/profiles", get_profiles)
+    return profiles
+
+@pytest.mark.asyncio
+async def test_profile_exists_as_soon_as_register_returns(supabase, client, monkeypatch):
+    fake_auth_and_profiles(supabase)
+    
+    # Registration must not wait for the profile to appear
+    def no_waiting(*args, **kwargs):
+        raise AssertionError("register should not sleep")
+    monkeypatch.setattr(time, "sleep", no_waiting)
+    monkeypatch.setattr(asyncio, "sleep", no_waiting)
+    
+    response = await client.post("/api/auth/register", json={
+        "email": EMAIL,
+        "password": "correct-horse-battery",
+        "full_name": "Jordan Case"
+    })
+    
+    assert response.status_code == 200
+    assert response.json()["user_id"] == USER_ID
+    assert response.json()["requires_confirmation"] is False
+    assert len(supabase.calls("POST", "/rest/v1/rpc/provision_profile")) == 1
+    
+    me = await client.get("/api/auth/me", headers={"Authorization": f"Bearer {make_token(USER_ID, EMAIL)}"})
+    
+    assert me.status_code == 200
+    assert me.json()["first_name"] == "Jordan"
+    assert me.json()["last_name"] == "Case"
+    assert len(supabase.calls("GET", "/rest/v1/profiles")) == 1
+
+@pytest.mark.asyncio
+async def test_register_rejects_non_university_email(supabase, client):
+    response = await client.post("/api/auth/register", json={
+        "email": "jordan@example.com",
+        "password": "correct-horse-battery",
+        "full_name": "Jordan Case"
+    })
+    
+    assert response.status_code == 400
+    assert supabase.requests == []
@@ -5,24 +5,39 @@ set -e
 cd /backend || { echo "Backend directory not found"; exit 1; }
 
 echo "Starting FastAPI backend"
-# Start Uvicorn with proper host binding
-uvicorn server:app --host 0.0.0.0 --port 8001 &
+# Gunicorn supervises the uvicorn workers (count, recycling: see gunicorn.conf.py)
+# nginx serves local uploads via sendfile (see location /_uploads/ in nginx.conf)
+export UPLOADS_ACCEL_REDIRECT_PREFIX=/_uploads/
+gunicorn server:app --config gunicorn.conf.py &
 BACKEND_PID=$!
 
-echo "Waiting for backend to start..."
-sleep 30
-
-if ! kill -0 $BACKEND_PID 2>/dev/null; then
-    echo "Backend failed to start at initialization, exiting"
-    exit 1
-fi
+# Wait until a worker reports ready instead of sleeping a fixed time
+READY_TIMEOUT=${READY_TIMEOUT:-60}
+echo "Waiting up to ${READY_TIMEOUT}s for backend readiness..."
+waited=0
+until wget -q -O /dev/null http://127.0.0.1:8001/api/ready 2>/dev/null; do
+    if ! kill -0 $BACKEND_PID 2>/dev/null; then
+        echo "Backend failed to start at initialization, exiting"
+        exit 1
+    fi
+    if [ "$waited" -ge "$READY_TIMEOUT" ]; then
+        echo "Backend not ready after ${READY_TIMEOUT}s, exiting"
+        kill $BACKEND_PID
+        exit 1
+    fi
+    sleep 1
+    waited=$((waited + 1))
+done
+echo "Backend ready after ${waited}s"
 
 # Start Nginx
 nginx -g 'daemon off;' &
 NGINX_PID=$!
 
-# Handle termination signals
-trap 'kill $BACKEND_PID $NGINX_PID; exit 0' SIGTERM SIGINT
+# SIGTERM/SIGINT: let nginx and the workers finish in-flight requests.
+# SIGHUP: replace the API workers one by one (e.g. after a config change).
+trap 'kill -QUIT $NGINX_PID; kill -TERM $BACKEND_PID; wait $BACKEND_PID; exit 0' TERM INT
+trap 'kill -HUP $BACKEND_PID' HUP
 
 # Check if processes are still running
 while kill -0 $BACKEND_PID 2>/dev/null && kill -0 $NGINX_PID 2>/dev/null; do
@@ -119,7 +119,7 @@ const BrowseLostPage = () => {
       </div>
       
       <ImageWithFallback
-        src={item.image}
+        src={item.thumbnail || item.image}
         alt={item.title}
         className="w-full h-48 object-cover rounded-xl mb-4"
       />
@@ -157,7 +157,7 @@ const BrowseLostPage = () => {
     >
       <div className="flex items-start space-x-6">
         <ImageWithFallback
-          src={item.image}
+          src={item.thumbnail || item.image}
           alt={item.title}
           className="w-24 h-24 object-cover rounded-xl"
         />
@@ -39,6 +39,22 @@ const ChatPage = () => {
     scrollToBottom();
   }, [messages]);
 
+  // New messages arrive as pushes instead of reloading the whole conversation
+  useEffect(() => {
+    const unsubscribe = messagesAPI.subscribeToConversation(claimRequestId, (message) => {
+      setMessages(prev => prev.some(m => m.id === message.id) ? prev : [...prev, message]);
+      if (message.sender_id !== user?.id) {
+        messagesAPI.markConversationRead(claimRequestId).catch(console.error);
+      }
+    }, () => {
+      // Reconnected: fill in anything sent while the connection was down
+      messagesAPI.getConversation(claimRequestId)
+        .then(response => setMessages(response.messages || []))
+        .catch(console.error);
+    });
+    return unsubscribe;
+  }, [claimRequestId, user?.id]);
+
   const fetchConversation = async () => {
     try {
       setLoading(true);
@@ -68,7 +84,8 @@ const ChatPage = () => {
     try {
       setSending(true);
       const response = await messagesAPI.sendMessage(claimRequestId, newMessage.trim());
-      setMessages(prev => [...prev, response]);
+      // The push for our own message may have arrived first
+      setMessages(prev => prev.some(m => m.id === response.id) ? prev : [...prev, response]);
       setNewMessage('');
     } catch (err) {
       console.error('Error sending message:', err);
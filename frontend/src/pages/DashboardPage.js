@@ -207,7 +207,7 @@ const DashboardPage = () => {
                               </span>
                             </div>
                             <ImageWithFallback
-                              src={item.image}
+                              src={item.thumbnail || item.image}
                               alt={item.title}
                               className="w-full h-32 object-cover rounded-lg mb-4"
                             />
@@ -260,7 +260,7 @@ const DashboardPage = () => {
                               </div>
                             </div>
                             <ImageWithFallback
-                              src={item.image}
+                              src={item.thumbnail || item.image}
                               alt={item.title}
                               className="w-full h-32 object-cover rounded-lg mb-4"
                             />
@@ -327,7 +327,7 @@ const DashboardPage = () => {
                         <div key={request.id} className="card p-6">
                           <div className="flex items-start space-x-4">
                             <ImageWithFallback
-                              src={item?.image}
+                              src={item?.thumbnail || item?.image}
                               alt={item?.title}
                               className="w-20 h-20 object-cover rounded-lg"
                             />
@@ -154,6 +154,9 @@ export const claimsAPI = {
 };
 
 // Messaging API functions
+// Reconnect attempts after a live chat socket drops, before switching to SSE
+const SOCKET_MAX_RETRIES = 5;
+
 export const messagesAPI = {
   getConversations: async () => {
     const response = await api.get('/conversations');
@@ -177,6 +180,74 @@ export const messagesAPI = {
     const response = await api.put(`/conversations/${claimRequestId}/read`);
     return response.data;
   },
+
+  // Push new messages of a conversation to onMessage. Uses a WebSocket and falls
+  // back to Server-Sent Events if the socket cannot be opened. Returns a cleanup function.
+  subscribeToConversation: (claimRequestId, onMessage, onReconnect) => {
+    const token = encodeURIComponent(authToken || '');
+    const path = `/conversations/${claimRequestId}`;
+    let socket = null;
+    let source = null;
+    let closed = false;
+    let connectedBefore = false;
+    let retries = 0;
+    let retryTimer = null;
+
+    // Messages sent while disconnected were never pushed; let the caller refetch once
+    const resync = () => { if (onReconnect) onReconnect(); };
+
+    const openEventSource = () => {
+      if (closed || source || typeof EventSource === 'undefined') return;
+      source = new EventSource(`${API_BASE_URL}${path}/events?token=${token}`);
+      let sourceOpened = false;
+      // EventSource reconnects by itself; refetch after each reconnect or after replacing a dropped socket
+      source.addEventListener('open', () => {
+        if (sourceOpened || connectedBefore) resync();
+        sourceOpened = true;
+      });
+      source.addEventListener('message', (event) => onMessage(JSON.parse(event.data)));
+    };
+
+    const openSocket = () => {
+      retryTimer = null;
+      if (closed) return;
+      socket = new WebSocket(`${API_BASE_URL.replace(/^http/, 'ws')}${path}/ws?token=${token}`);
+      socket.onopen = () => {
+        if (connectedBefore) resync();
+        connectedBefore = true;
+        retries = 0;
+      };
+      socket.onmessage = (event) => {
+        const payload = JSON.parse(event.data);
+        if (payload.type === 'message') onMessage(payload.data);
+      };
+      socket.onclose = () => {
+        socket = null;
+        if (closed) return;
+        // Never connected (proxy without upgrade support, blocked port, ...): use SSE
+        if (!connectedBefore || retries >= SOCKET_MAX_RETRIES) {
+          openEventSource();
+          return;
+        }
+        // Dropped (worker restart, deploy, network blip): reconnect with backoff
+        retryTimer = setTimeout(openSocket, Math.min(1000 * 2 ** retries, 30000));
+        retries += 1;
+      };
+    };
+
+    if (typeof WebSocket !== 'undefined') {
+      openSocket();
+    } else {
+      openEventSource();
+    }
+
+    return () => {
+      closed = true;
+      if (retryTimer) clearTimeout(retryTimer);
+      if (socket) socket.close();
+      if (source) source.close();
+    };
+  },
 };
 
 // Health check